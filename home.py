@@ -4,6 +4,7 @@
 
 from interpolation import *
 from linear_systems import *
+from nonlinear_systems import *
 from single_variable import *
 from utils.graph import show_graph
 
@@ -81,7 +82,7 @@ def show_home():
 
 st.sidebar.markdown(
     """Web app to run and compare several numerical methods that solve equations
-in one variable and linear systems of equations, as well as doing interpolation.
+in one variable and systems of equations, as well as doing interpolation.
 
 Course project for «Análisis numérico» (ST0256) taught @eafit by Julián Rendón.
 """
@@ -93,6 +94,8 @@ def show_home():
     st.session_state.page = "roots"
 if st.sidebar.button("Linear systems of equations"):
     st.session_state.page = "systems"
+if st.sidebar.button("Nonlinear systems of equations"):
+    st.session_state.page = "nonlinear"
 if st.sidebar.button("Interpolation"):
     st.session_state.page = "interpolation"
 
@@ -118,6 +121,13 @@ def show_home():
         "False Position": show_false_position,
         "Fixed Point": show_fixed_point,
         "Multiple Roots": show_multiple_roots,
+        "Halley / Householder": show_householder,
+        "Brent": show_brent,
+        "All Roots": show_all_roots,
+        "Parameter Sweep": show_parameter_sweep,
+        "Newton Basins": show_newton_basins,
+        "Tabulated Data": show_tabulated_roots,
+        "Auto": show_auto,
     }
 
     root_method = st.selectbox(
@@ -134,6 +144,7 @@ def show_home():
         "Jacobi": show_Jacobi,
         "Gauss-Seidel": show_gauss_seidel,
         "SOR": show_SOR,
+        "Large Sparse Systems": show_sparse_systems,
     }
 
     system_method = st.selectbox(
@@ -143,6 +154,11 @@ def show_home():
 
     name_function_matching[system_method]()
 
+elif st.session_state.page == "nonlinear":
+    st.title("Nonlinear systems of equations")
+
+    show_newton_system()
+
 elif st.session_state.page == "interpolation":
     st.title("Interpolation")
 
@@ -0,0 +1,164 @@
+import bisect
+import math
+
+import numpy as np
+
+INTERPOLANTS = ("Linear", "Cubic")
+
+
+class Interpolant:
+    """
+    Piecewise polynomial through tabulated points, evaluated numerically.
+
+    On [x_i, x_{i+1}] its value is sum_k coefficients[i, k] (x - x_i)^k.
+    The piece that holds x is found by binary search (`np.searchsorted`),
+    so an evaluation costs O(log n) for n points, with no symbolic formula
+    involved. Outside [x_0, x_n] the data say nothing, and the value is NaN.
+
+    Calls accept a number or a NumPy array, like a lambdified function.
+    """
+
+    def __init__(self, knots, coefficients):
+        self.knots = np.asarray(knots, dtype=float)
+        self.coefficients = np.asarray(coefficients, dtype=float)
+        degree = self.coefficients.shape[1] - 1
+        # Coefficients of each derivative, lowest power first, so that
+        # derivatives cost the same Horner pass as values.
+        self._derivatives = [self.coefficients]
+        for _ in range(degree):
+            previous = self._derivatives[-1]
+            self._derivatives.append(previous[:, 1:] * np.arange(1, len(previous[0])))
+        # Solvers evaluate one point at a time, where NumPy's per-call
+        # overhead dominates; plain lists serve that case.
+        self._knot_list = self.knots.tolist()
+        self._derivative_lists = [d.tolist() for d in self._derivatives]
+
+    def __call__(self, x):
+        return self.derivatives(x, orders=(0,))[0]
+
+    def derivative(self, x):
+        return self.derivatives(x, orders=(1,))[0]
+
+    def derivatives(self, x, orders=(0, 1, 2)):
+        """Return [f^(n)(x) for n in orders], from a single search for the piece."""
+        if np.ndim(x) == 0:
+            return self._scalar_derivatives(float(x), orders)
+        x_array = np.asarray(x, dtype=float)
+        piece = np.clip(
+            np.searchsorted(self.knots, x_array, side="right") - 1,
+            0,
+            len(self.knots) - 2,
+        )
+        t = x_array - self.knots[piece]
+        outside = (x_array < self.knots[0]) | (x_array > self.knots[-1])
+
+        values = []
+        for order in orders:
+            if order < len(self._derivatives):
+                coefficients = self._derivatives[order][piece]
+                value = np.zeros_like(t)
+                for k in range(coefficients.shape[-1] - 1, -1, -1):
+                    value = value * t + coefficients[..., k]
+            else:
+                value = np.zeros_like(t)
+            value = np.where(outside, np.nan, value)
+            values.append(value)
+        return values
+
+    def _scalar_derivatives(self, x, orders):
+        knots = self._knot_list
+        if not knots[0] <= x <= knots[-1]:
+            return [math.nan] * len(orders)
+        piece = min(bisect.bisect_right(knots, x) - 1, len(knots) - 2)
+        t = x - knots[piece]
+
+        values = []
+        for order in orders:
+            value = 0.0
+            if order < len(self._derivative_lists):
+                for coefficient in reversed(self._derivative_lists[order][piece]):
+                    value = value * t + coefficient
+            values.append(value)
+        return values
+
+
+def linear_interpolant(x, y) -> Interpolant:
+    """Piecewise linear interpolant of the points (x_i, y_i), x sorted."""
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    slopes = np.diff(y) / np.diff(x)
+    return Interpolant(x, np.column_stack([y[:-1], slopes]))
+
+
+def cubic_interpolant(x, y) -> Interpolant:
+    """
+    Natural cubic spline of the points (x_i, y_i), x sorted.
+
+    The second derivatives M_i at the points solve a tridiagonal system
+    with M_0 = M_n = 0, the same conditions as `cubic_spline_interpolation`,
+    in O(n) with the Thomas algorithm.
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    h = np.diff(x)
+    slopes = np.diff(y) / h
+    n = len(x) - 1
+
+    M = np.zeros(n + 1)
+    if n > 1:
+        lower = h[1:-1]
+        diagonal = 2 * (h[:-1] + h[1:])
+        upper = h[1:-1]
+        rhs = 6 * np.diff(slopes)
+
+        # Forward elimination, then back substitution.
+        for i in range(1, n - 1):
+            factor = lower[i - 1] / diagonal[i - 1]
+            diagonal[i] -= factor * upper[i - 1]
+            rhs[i] -= factor * rhs[i - 1]
+        interior = np.zeros(n - 1)
+        interior[-1] = rhs[-1] / diagonal[-1]
+        for i in range(n - 3, -1, -1):
+            interior[i] = (rhs[i] - upper[i] * interior[i + 1]) / diagonal[i]
+        M[1:-1] = interior
+
+    coefficients = np.column_stack(
+        [
+            y[:-1],
+            slopes - h * (2 * M[:-1] + M[1:]) / 6,
+            M[:-1] / 2,
+            (M[1:] - M[:-1]) / (6 * h),
+        ]
+    )
+    return Interpolant(x, coefficients)
+
+
+def build_interpolant(x, y, kind="Cubic") -> Interpolant:
+    """
+    Interpolant of tabulated data, with its points in any order.
+
+    Parameters:
+        x, y (array_like): Coordinates of the points.
+        kind (str): One of `INTERPOLANTS`.
+
+    Raises:
+        ValueError: If there are fewer than two points, missing values or
+        repeated x values.
+    """
+    x, y = np.asarray(x, dtype=float).ravel(), np.asarray(y, dtype=float).ravel()
+    if len(x) != len(y):
+        raise ValueError("x and y must have the same number of values.")
+    if len(x) < 2:
+        raise ValueError("At least two points are needed.")
+    if not np.isfinite(x).all() or not np.isfinite(y).all():
+        raise ValueError("The data have missing or infinite values.")
+    order = np.argsort(x, kind="stable")
+    x, y = x[order], y[order]
+    if np.any(np.diff(x) == 0):
+        raise ValueError("The x values must be distinct.")
+
+    match kind:
+        case "Linear":
+            return linear_interpolant(x, y)
+        case "Cubic":
+            return cubic_interpolant(x, y)
+        case _:
+            raise ValueError("Not a valid interpolant.")
@@ -1,3 +1,4 @@
 from .gauss_seidel import show_gauss_seidel
 from .jacobi import show_Jacobi
 from .sor import show_SOR
+from .sparse_iterative import show_sparse_systems
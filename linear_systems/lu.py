@@ -0,0 +1,59 @@
+import numpy as np
+
+
+def lu_factor(A):
+    """
+    LU factorization with partial pivoting, PA = LU.
+
+    Parameters:
+    A : numpy array
+        A square matrix.
+
+    Returns:
+    LU : numpy array
+        L below the diagonal (its unit diagonal is implicit) and U on and
+        above it, packed in one matrix.
+    perm : numpy array
+        The row permutation P, as the order of the rows of A.
+
+    Raises:
+    numpy.linalg.LinAlgError: If A is singular to working precision.
+    """
+    LU = np.array(A, dtype=float)
+    n = LU.shape[0]
+    perm = np.arange(n)
+    threshold = n * np.finfo(float).eps * np.abs(LU).max(initial=0)
+
+    for k in range(n):
+        # Pivot on the largest entry of the column, for stability.
+        p = k + np.argmax(np.abs(LU[k:, k]))
+        if abs(LU[p, k]) <= threshold:
+            raise np.linalg.LinAlgError("Matrix is singular.")
+        if p != k:
+            LU[[k, p]] = LU[[p, k]]
+            perm[[k, p]] = perm[[p, k]]
+
+        LU[k + 1 :, k] /= LU[k, k]
+        LU[k + 1 :, k + 1 :] -= np.outer(LU[k + 1 :, k], LU[k, k + 1 :])
+
+    return LU, perm
+
+
+def lu_solve(factorization, b):
+    """
+    Solve Ax = b given `factorization` = lu_factor(A).
+
+    Costs O(n^2) per right-hand side, so one factorization serves many
+    solves. `b` may be a vector or a matrix with one column per
+    right-hand side.
+    """
+    LU, perm = factorization
+    y = np.array(b, dtype=float)[perm]
+    n = LU.shape[0]
+
+    # Forward substitution with L, then back substitution with U.
+    for i in range(1, n):
+        y[i] -= LU[i, :i] @ y[:i]
+    for i in reversed(range(n)):
+        y[i] = (y[i] - LU[i, i + 1 :] @ y[i + 1 :]) / LU[i, i]
+    return y
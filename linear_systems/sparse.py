@@ -0,0 +1,156 @@
+import numpy as np
+
+
+class CSRMatrix:
+    """
+    Sparse matrix in compressed sparse row (CSR) form, backed by NumPy arrays.
+
+    The nonzeros of row i are `data[indptr[i]:indptr[i + 1]]`, in the
+    columns `indices[indptr[i]:indptr[i + 1]]`, sorted by column. Storage
+    is O(nnz + n) for nnz nonzeros and n rows, and a product with a vector
+    costs O(nnz), so systems far too large for a dense n x n array fit.
+    """
+
+    def __init__(self, data, indices, indptr, shape):
+        self.data = np.asarray(data, dtype=float)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.shape = tuple(int(size) for size in shape)
+        if len(self.indptr) != self.shape[0] + 1:
+            raise ValueError("indptr must have one entry per row, plus one.")
+        if len(self.data) != len(self.indices) or self.indptr[-1] != len(self.data):
+            raise ValueError("data, indices and indptr do not match.")
+        # Row of each stored entry, for vectorized products and splittings.
+        self._rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    @classmethod
+    def from_coo(cls, rows, cols, values, shape=None):
+        """
+        Build a CSR matrix from (row, column, value) triplets, 0-based.
+
+        Triplets may come in any order; repeated positions are summed and
+        explicit zeros dropped. Without `shape`, the matrix is just large
+        enough to hold every triplet.
+        """
+        rows = np.asarray(rows, dtype=np.int64).ravel()
+        cols = np.asarray(cols, dtype=np.int64).ravel()
+        values = np.asarray(values, dtype=float).ravel()
+        if not len(rows) == len(cols) == len(values):
+            raise ValueError("rows, cols and values must have the same length.")
+        if len(rows) and (rows.min() < 0 or cols.min() < 0):
+            raise ValueError("Row and column indices must not be negative.")
+        if shape is None:
+            shape = (
+                int(rows.max(initial=-1)) + 1,
+                int(cols.max(initial=-1)) + 1,
+            )
+        if len(rows) and (rows.max() >= shape[0] or cols.max() >= shape[1]):
+            raise ValueError("A triplet lies outside the shape of the matrix.")
+
+        order = np.lexsort((cols, rows))
+        rows, cols, values = rows[order], cols[order], values[order]
+        if len(rows):
+            # Sum runs of equal (row, column) positions.
+            starts = np.flatnonzero(
+                np.r_[True, (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])]
+            )
+            rows, cols = rows[starts], cols[starts]
+            values = np.add.reduceat(values, starts)
+        keep = values != 0
+        rows, cols, values = rows[keep], cols[keep], values[keep]
+
+        indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=shape[0]), out=indptr[1:])
+        return cls(values, cols, indptr, shape)
+
+    @classmethod
+    def from_dense(cls, A):
+        A = np.asarray(A, dtype=float)
+        rows, cols = np.nonzero(A)
+        return cls.from_coo(rows, cols, A[rows, cols], A.shape)
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def to_dense(self):
+        A = np.zeros(self.shape)
+        A[self._rows, self.indices] = self.data
+        return A
+
+    def __matmul__(self, x):
+        x = np.asarray(x, dtype=float)
+        if x.shape != (self.shape[1],):
+            raise ValueError("The vector does not match the columns of the matrix.")
+        return np.bincount(
+            self._rows, weights=self.data * x[self.indices], minlength=self.shape[0]
+        )
+
+    def diagonal(self):
+        on_diagonal = self.indices == self._rows
+        d = np.zeros(min(self.shape))
+        d[self._rows[on_diagonal]] = self.data[on_diagonal]
+        return d
+
+    def split(self):
+        """
+        Return (L, d, U) with A = L + diag(d) + U, where L and U are the
+        strictly lower and strictly upper triangular parts, as CSR matrices.
+        """
+        return (
+            self._select(self.indices < self._rows),
+            self.diagonal(),
+            self._select(self.indices > self._rows),
+        )
+
+    def is_diagonally_dominant(self):
+        """Whether |a_ii| > sum_{j != i} |a_ij| for every row, in O(nnz)."""
+        off_diagonal = self.indices != self._rows
+        off_sums = np.bincount(
+            self._rows[off_diagonal],
+            weights=np.abs(self.data[off_diagonal]),
+            minlength=self.shape[0],
+        )
+        return bool(np.all(np.abs(self.diagonal()) > off_sums))
+
+    def _select(self, mask):
+        indptr = np.zeros(self.shape[0] + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(self._rows[mask], minlength=self.shape[0]), out=indptr[1:]
+        )
+        return CSRMatrix(self.data[mask], self.indices[mask], indptr, self.shape)
+
+
+def tridiagonal_matrix(n, diagonal=4.0, off_diagonal=-1.0):
+    """n x n matrix with `diagonal` on its diagonal and `off_diagonal` beside it."""
+    i = np.arange(n)
+    rows = np.concatenate([i, i[1:], i[:-1]])
+    cols = np.concatenate([i, i[:-1], i[1:]])
+    values = np.concatenate([np.full(n, diagonal), np.full(2 * (n - 1), off_diagonal)])
+    return CSRMatrix.from_coo(rows, cols, values, (n, n))
+
+
+def five_point_matrix(m, diagonal=4.0):
+    """
+    Five-point stencil on an m x m grid, an (m^2) x (m^2) matrix.
+
+    Each unknown couples with -1 to its neighbours on the grid. With
+    `diagonal` = 4 it is the discrete Laplacian of Poisson's equation;
+    larger values make it strictly diagonally dominant.
+    """
+    n = m * m
+    k = np.arange(n)
+    row, col = np.divmod(k, m)
+    rows, cols = [k], [k]
+    for neighbour, inside in (
+        (k - 1, col > 0),
+        (k + 1, col < m - 1),
+        (k - m, row > 0),
+        (k + m, row < m - 1),
+    ):
+        rows.append(k[inside])
+        cols.append(neighbour[inside])
+    rows, cols = np.concatenate(rows), np.concatenate(cols)
+    values = np.full(len(rows), -1.0)
+    values[:n] = diagonal
+    return CSRMatrix.from_coo(rows, cols, values, (n, n))
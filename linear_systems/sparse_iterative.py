@@ -0,0 +1,328 @@
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objs as go
+import streamlit as st
+
+from utils.interface_blocks import calculate_tolerance
+
+from .sparse import CSRMatrix, five_point_matrix, tridiagonal_matrix
+from .utils import calculate_error
+
+SPARSE_METHODS = ("Jacobi", "Gauss-Seidel", "SOR")
+SPARSE_EXAMPLES = ("Tridiagonal", "Five-point grid", "CSV file")
+
+# Rough cost of one iteration per nonzero: Jacobi is vectorized, while the
+# row pass of Gauss-Seidel and SOR runs in Python.
+SECONDS_PER_NONZERO = {"Jacobi": 1e-8, "Gauss-Seidel": 3e-7, "SOR": 3e-7}
+SLOW_SOLVE_SECONDS = 10
+MAX_SOLVE_SECONDS = 300
+
+
+@dataclass
+class SparseMethodOutput:
+    x: Any
+    table: Any
+    err: Any
+
+
+def sparse_jacobi(A, b, X_i, tol, niter, norm=2, error_type="Significant Figures"):
+    """
+    Jacobi iteration for Ax = b with A a `CSRMatrix`.
+
+    Each sweep x <- x + D^{-1} (b - Ax) is one sparse product, O(nnz). Only
+    the current iterate is kept, so memory is O(nnz + n) however many
+    iterations run.
+
+    Parameters:
+    A : CSRMatrix
+        The matrix A, square.
+    b : numpy array
+        The vector b.
+    X_i : numpy array
+        The initial guess for X.
+    tol : float
+        The tolerance for stopping criteria (convergence).
+    niter : int
+        The maximum number of iterations.
+    norm : int or str, optional (default=2)
+        The norm used for the error (1, 2, or 'inf').
+    error_type : str, optional
+        "Significant Figures" or "Correct Decimals", as in `calculate_error`.
+
+    Returns:
+    SparseMethodOutput
+        The last iterate, a table of the error per iteration and an error
+        message, which is None on convergence.
+    """
+    d = A.diagonal()
+    if np.any(d == 0):
+        return _zero_diagonal(d)
+
+    X = np.array(X_i, dtype=float)
+    errores = []
+    for _ in range(niter):
+        X_L = X
+        X = X_L + (b - A @ X_L) / d
+        errores.append(calculate_error(X, X_L, norm, error_type))
+        if errores[-1] < tol:
+            return SparseMethodOutput(X, _error_table(errores), None)
+
+    err = f"Jacobi method did not converge after {niter} iterations."
+    return SparseMethodOutput(X, _error_table(errores), err)
+
+
+def sparse_sor(A, b, X_i, tol, niter, omega, norm=2, error_type="Significant Figures"):
+    """
+    Successive Over-Relaxation for Ax = b with A a `CSRMatrix`.
+
+    With A = L + D + U, a sweep first forms b - Ux from the previous
+    iterate as one sparse product, then runs down the rows, each using the
+    new values of the unknowns before it through its entries of L. Both
+    steps touch every nonzero once, so a sweep is O(nnz), and T = (D -
+    omega L)^{-1}(...) is never formed. The row pass is sequential by
+    nature and runs on Python lists, which beat NumPy indexing for one
+    element at a time. Parameters are those of `sparse_jacobi`, plus the
+    relaxation factor `omega`, which must lie in (0, 2): outside it SOR
+    diverges, and with omega = 0 it does not move.
+    """
+    if not 0 < omega < 2:
+        return SparseMethodOutput(
+            None, None, "The relaxation factor ω must lie between 0 and 2."
+        )
+    return _successive_sweeps(A, b, X_i, tol, niter, omega, norm, error_type, "SOR")
+
+
+def sparse_gauss_seidel(
+    A, b, X_i, tol, niter, norm=2, error_type="Significant Figures"
+):
+    """Gauss-Seidel for Ax = b with A a `CSRMatrix`: `sparse_sor` with omega = 1."""
+    return _successive_sweeps(
+        A, b, X_i, tol, niter, 1.0, norm, error_type, "Gauss-Seidel"
+    )
+
+
+def _successive_sweeps(A, b, X_i, tol, niter, omega, norm, error_type, name):
+    L, d, U = A.split()
+    if np.any(d == 0):
+        return _zero_diagonal(d)
+
+    indptr, indices, data = L.indptr.tolist(), L.indices.tolist(), L.data.tolist()
+    inverse_d = (1 / d).tolist()
+    n = len(d)
+
+    X = np.array(X_i, dtype=float)
+    errores = []
+    for _ in range(niter):
+        X_L = X
+        rhs = (b - U @ X_L).tolist()
+        x = X_L.tolist()
+        for i in range(n):
+            s = rhs[i]
+            for k in range(indptr[i], indptr[i + 1]):
+                s -= data[k] * x[indices[k]]
+            x[i] += omega * (s * inverse_d[i] - x[i])
+        X = np.array(x)
+
+        errores.append(calculate_error(X, X_L, norm, error_type))
+        if errores[-1] < tol:
+            return SparseMethodOutput(X, _error_table(errores), None)
+
+    err = f"{name} method did not converge after {niter} iterations."
+    return SparseMethodOutput(X, _error_table(errores), err)
+
+
+def _zero_diagonal(d):
+    row = int(np.flatnonzero(d == 0)[0]) + 1
+    err = f"Matrix A has a zero on its diagonal (row {row}), so the method cannot be applied."
+    return SparseMethodOutput(None, None, err)
+
+
+def _error_table(errores):
+    return pd.DataFrame(
+        {"Error": errores}, index=pd.RangeIndex(1, len(errores) + 1, name="Iteration")
+    )
+
+
+def read_triplets(uploaded_file):
+    """Read a CSRMatrix from the (row, column, value) columns of a CSV file."""
+    data = pd.read_csv(uploaded_file).select_dtypes("number").dropna()
+    if data.shape[1] < 3:
+        raise ValueError("The file needs three numeric columns: row, column and value.")
+    rows, cols = data.iloc[:, 0].to_numpy(), data.iloc[:, 1].to_numpy()
+    if np.any(rows != np.round(rows)) or np.any(cols != np.round(cols)):
+        raise ValueError("Row and column indices must be whole numbers.")
+    if len(rows) and min(rows.min(), cols.min()) < 1:
+        raise ValueError("Rows and columns are counted from 1.")
+    size = int(max(rows.max(initial=0), cols.max(initial=0)))
+    return CSRMatrix.from_coo(
+        rows - 1, cols - 1, data.iloc[:, 2].to_numpy(), (size, size)
+    )
+
+
+def show_sparse_systems():
+    st.header("Large Sparse Systems")
+    st.write(
+        "The matrix is stored in compressed sparse row (CSR) form, which keeps only its nonzeros, and each iteration costs work proportional to their number. The right-hand side is $b = A\\vec{1}$, so the exact solution is a vector of ones."
+    )
+
+    example = st.radio("Matrix", SPARSE_EXAMPLES, horizontal=True)
+    if example == "CSV file":
+        uploaded_file = st.file_uploader(
+            "CSV file",
+            type="csv",
+            help="One nonzero per line: row and column, counted from 1, and value. Repeated positions are added up.",
+        )
+        if uploaded_file is None:
+            st.info("Upload a file to continue.")
+            return
+        matrix_key = (uploaded_file.name, uploaded_file.size)
+        try:
+            A = read_triplets(uploaded_file)
+        except (ValueError, pd.errors.ParserError) as e:
+            st.error(f"**Error:** {e}")
+            return
+    else:
+        col1, col2 = st.columns(2)
+        if example == "Tridiagonal":
+            n = col1.number_input(
+                "Number of unknowns (n)",
+                min_value=2,
+                max_value=1_000_000,
+                value=100_000,
+                step=1000,
+            )
+        else:
+            m = col1.number_input(
+                "Grid side (m)",
+                min_value=2,
+                max_value=1000,
+                value=300,
+                step=10,
+                help="The grid has m x m unknowns.",
+            )
+        diagonal = col2.number_input(
+            "Diagonal entry",
+            value=4.0 if example == "Tridiagonal" else 5.0,
+            step=0.5,
+            help="Off-diagonal entries are -1. The larger the diagonal, the faster the methods converge. At 2 or less for the tridiagonal matrix, or 4 or less for the grid, the matrix is not strictly diagonally dominant, and they may take very many iterations or not converge at all.",
+        )
+        if example == "Tridiagonal":
+            A = tridiagonal_matrix(int(n), diagonal)
+            matrix_key = (example, n, diagonal)
+        else:
+            A = five_point_matrix(int(m), diagonal)
+            matrix_key = (example, m, diagonal)
+
+    if A.shape[0] < 1:
+        st.error("**Error:** The matrix is empty.")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Unknowns", f"{A.shape[0]:,}")
+    col2.metric("Nonzeros", f"{A.nnz:,}")
+    col3.metric("Dense storage avoided", f"{1 - A.nnz / A.shape[0] ** 2:.4%}")
+
+    if A.is_diagonally_dominant():
+        st.write(
+            "$A$ is strictly diagonally dominant, so Jacobi and Gauss-Seidel are guaranteed to converge."
+        )
+    else:
+        st.warning(
+            "$A$ is not strictly diagonally dominant, so convergence is _not_ guaranteed, and it may take many iterations."
+        )
+
+    col1, col2 = st.columns(2)
+    method = col1.selectbox("Method", SPARSE_METHODS)
+    norm_value = col2.selectbox("Norm", (2, 1, "inf"))
+    omega = None
+    if method == "SOR":
+        omega = st.number_input(
+            "Relaxation Factor (ω):",
+            min_value=0.05,
+            max_value=1.95,
+            step=0.05,
+            value=1.0,
+            help="SOR can only converge for 0 < ω < 2.",
+        )
+
+    tol, niter, tolerance_type = calculate_tolerance()
+    st.write("Calculated Tolerance: ", tol)
+
+    # Each iteration touches every nonzero, so niter x nnz bounds the work.
+    seconds = niter * A.nnz * SECONDS_PER_NONZERO[method]
+    if seconds > MAX_SOLVE_SECONDS:
+        st.error(
+            f"**Error:** {niter} iterations could take up to {seconds:,.0f} s on this matrix. Lower the number of iterations so that it stays under {MAX_SOLVE_SECONDS} s."
+        )
+        return
+    if seconds > SLOW_SOLVE_SECONDS:
+        st.warning(
+            f"If the method does not converge early, {niter} iterations could take up to {seconds:,.0f} s."
+        )
+
+    b = A @ np.ones(A.shape[1])
+    # Solving can take a while, so it runs on request, not on every rerun,
+    # and the last solution is kept for as long as its inputs stay the same.
+    inputs = (matrix_key, method, omega, norm_value, tol, niter, tolerance_type)
+    if st.button("Solve", type="primary"):
+        x_0 = np.zeros(A.shape[0])
+        with st.spinner("Solving..."):
+            match method:
+                case "Jacobi":
+                    output = sparse_jacobi(
+                        A, b, x_0, tol, niter, norm_value, tolerance_type
+                    )
+                case "Gauss-Seidel":
+                    output = sparse_gauss_seidel(
+                        A, b, x_0, tol, niter, norm_value, tolerance_type
+                    )
+                case "SOR":
+                    output = sparse_sor(
+                        A, b, x_0, tol, niter, omega, norm_value, tolerance_type
+                    )
+        st.session_state["sparse_solution"] = (inputs, output)
+
+    solved_inputs, output = st.session_state.get("sparse_solution", (None, None))
+    if solved_inputs != inputs:
+        st.info("Press Solve to run the method.")
+        return
+
+    st.divider()
+    st.header("Result")
+    if output.x is None:
+        st.error(output.err)
+        return
+    if output.err:
+        st.error(output.err)
+    else:
+        st.success(":material/check: Method has converged to a solution.")
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Iterations", len(output.table))
+    col2.metric(
+        "Residual $\\|b - Ax\\|_\\infty$", f"{np.max(np.abs(b - A @ output.x)):.3e}"
+    )
+    col3.metric("Distance to the solution", f"{np.max(np.abs(output.x - 1)):.3e}")
+
+    st.subheader("First unknowns")
+    st.dataframe(
+        pd.DataFrame(
+            {"x": output.x[:10]}, index=[f"X_{i+1}" for i in range(min(10, A.shape[0]))]
+        ),
+        use_container_width=True,
+    )
+
+    st.subheader("Convergence")
+    fig = go.Figure(
+        go.Scatter(x=output.table.index, y=output.table["Error"], mode="lines+markers")
+    )
+    fig.update_layout(
+        xaxis_title="Iteration",
+        yaxis_title="Error",
+        yaxis_type="log",
+        margin=dict(l=0, r=0, t=40, b=0),
+    )
+    st.plotly_chart(fig)
@@ -0,0 +1 @@
+from .newton import show_newton_system
@@ -0,0 +1,258 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+import sympy as sp
+
+from linear_systems.lu import lu_factor, lu_solve
+from linear_systems.utils import calculate_error
+from single_variable.common import Evaluator, Result, Table
+from utils.general import nm_diff, nm_lambdify, nm_sympify
+from utils.interface_blocks import calculate_tolerance, norm
+from utils.sandbox import SandboxError, parse_symbols
+
+# How each step gets its linear system:
+# - "Newton": evaluate and factor the Jacobian at every iterate.
+# - "Chord": factor the Jacobian at x_0 once and reuse it for every step.
+# - "Broyden": start from the inverse of the Jacobian at x_0 and correct
+#   it with a rank-one update after each step, without new Jacobians.
+NEWTON_MODES = ("Newton", "Chord", "Broyden")
+
+
+@dataclass
+class SystemResult(Result):
+    n_jacobians: int = 0
+    n_factorizations: int = 0
+
+
+def compile_system(equations, symbols):
+    """
+    Compile F and its Jacobian into NumPy functions of the unknowns.
+
+    The Jacobian is built symbolically once, entry by entry with `nm_diff`,
+    and lambdified as a whole: the returned `jacobian(*x)` gives the n × n
+    array in one call. Returns (function, jacobian, Jacobian matrix).
+    """
+    equations = [nm_sympify(equation) for equation in equations]
+    matrix = sp.Matrix(
+        [[nm_diff(equation, symbol) for symbol in symbols] for equation in equations]
+    )
+    function = nm_lambdify(sp.Matrix(equations), symbols, backend="numpy")
+    jacobian = nm_lambdify(matrix, symbols, backend="numpy")
+    return function, jacobian, matrix
+
+
+def newton_system(
+    function,
+    jacobian,
+    x_0,
+    tol,
+    niter,
+    mode="Newton",
+    norm=2,
+    tolerance_type="Correct Decimals",
+    trace="full",
+) -> SystemResult:
+    """
+    Solve F(x) = 0 for x in R^n with Newton's method or a variant of it.
+
+    Parameters:
+        function (callable): F(*x), returning the n values of F.
+        jacobian (callable): J(*x), returning the n × n Jacobian of F.
+        x_0 (array_like): Initial guess.
+        tol (float): Tolerance for the stopping criterion.
+        niter (int): Maximum number of iterations.
+        mode (str): One of `NEWTON_MODES`.
+        norm (int or str): Norm of the error: 1, 2 or "inf".
+        tolerance_type (str): "Correct Decimals" or "Significant Figures".
+
+    Returns:
+        SystemResult: Its table holds the iterates, ||F(x)|| and the error.
+        It also counts the Jacobians evaluated and the LU factorizations.
+    """
+    if mode not in NEWTON_MODES:
+        raise ValueError("Not a valid Newton mode.")
+    result = SystemResult()
+    x = np.asarray(x_0, dtype=float).ravel()
+    n = len(x)
+    table = Table(
+        columns=[f"x_{i + 1}" for i in range(n)] + ["|F(x)|", "error"], trace=trace
+    )
+    f = Evaluator(lambda x: np.asarray(function(*x), dtype=float).ravel())
+    J = Evaluator(lambda x: np.asarray(jacobian(*x), dtype=float).reshape(n, n))
+    order = np.inf if norm == "inf" else norm
+
+    f_x = f(x)
+    table.add_row(*x, np.linalg.norm(f_x, order), None)
+
+    error = np.inf
+    iterations = 0
+    try:
+        if mode != "Newton":
+            factorization = lu_factor(J(x))
+            result.n_factorizations += 1
+        if mode == "Broyden":
+            inverse = lu_solve(factorization, np.eye(n))
+
+        while iterations < niter and error > tol:
+            match mode:
+                case "Newton":
+                    factorization = lu_factor(J(x))
+                    result.n_factorizations += 1
+                    step = -lu_solve(factorization, f_x)
+                case "Chord":
+                    step = -lu_solve(factorization, f_x)
+                case "Broyden":
+                    step = -inverse @ f_x
+
+            iterations += 1
+            x_prev, f_prev = x, f_x
+            x = x + step
+            f_x = f(x)
+            if mode == "Broyden":
+                inverse = _broyden_update(inverse, step, f_x - f_prev)
+
+            error = calculate_error(x, x_prev, norm, tolerance_type)
+            table.add_row(*x, np.linalg.norm(f_x, order), error)
+            if not np.all(np.isfinite(x)):
+                break
+    except np.linalg.LinAlgError:
+        result.error_message = "**Error:** The Jacobian is singular."
+
+    result.table = table.as_dataframe()
+    result.n_evaluations = f.count
+    result.n_jacobians = J.count
+    if result.error_message:
+        return result
+    if error < tol:
+        result.set_success_status()
+        return result
+    result.error_message = "**Error:** Took too many iterations."
+    return result
+
+
+def _broyden_update(inverse, step, change):
+    """
+    Update the approximate inverse Jacobian after a step, in O(n^2).
+
+    Broyden's ("good") update of the Jacobian, applied to its inverse with
+    the Sherman–Morrison formula, so no factorization is needed.
+    """
+    h_change = inverse @ change
+    denominator = step @ h_change
+    if denominator == 0:
+        return inverse
+    return inverse + np.outer(step - h_change, step @ inverse) / denominator
+
+
+def show_newton_system():
+    st.header("Newton's Method for Nonlinear Systems")
+
+    col1, col2 = st.columns([1, 2])
+    variables_input = col1.text_input(
+        "Unknowns",
+        value="x y",
+        help="Names of the unknowns, separated by spaces or commas.",
+    )
+    equations_input = col2.text_area(
+        "Equations $F(x) = 0$",
+        value="x**2 + y**2 - 4\nx*y - 1",
+        help="One equation per line, each written as an expression equal to zero.",
+    )
+
+    try:
+        symbols = parse_symbols(variables_input)
+    except SandboxError as e:
+        st.error(f"**Error:** {e}")
+        return
+    equations = [line for line in equations_input.splitlines() if line.strip()]
+    if not symbols or len(equations) != len(symbols):
+        st.error("**Error:** Enter as many equations as unknowns.")
+        return
+
+    # Distinct starting values: a symmetric start often has a singular Jacobian.
+    x_0 = st.data_editor(
+        pd.DataFrame(
+            {"x_0": np.arange(1.0, len(symbols) + 1)}, index=[str(s) for s in symbols]
+        ),
+        use_container_width=True,
+    )["x_0"].to_numpy()
+
+    col3, col4 = st.columns(2)
+    with col3:
+        mode = st.radio(
+            "Mode",
+            NEWTON_MODES,
+            horizontal=True,
+            help="Newton evaluates and factors the Jacobian at every step. Chord reuses the Jacobian at $x_0$. Broyden corrects the inverse Jacobian with a rank-one update after each step.",
+        )
+    with col4:
+        norm_value = norm()
+
+    tol, niter, tolerance_type = calculate_tolerance()
+    st.markdown(f"**Calculated Tolerance:** {tol:.10f}")
+
+    try:
+        function, jacobian, matrix = compile_system(equations, symbols)
+    except SandboxError as e:
+        st.error(f"**Error:** {e}")
+        return
+    st.subheader("System")
+    st.latex("F = " + sp.latex(sp.Matrix([nm_sympify(e) for e in equations])) + " = 0")
+    st.subheader("Jacobian")
+    st.latex("J = " + sp.latex(matrix))
+
+    result = newton_system(
+        function, jacobian, x_0, tol, niter, mode, norm_value, tolerance_type
+    )
+
+    st.divider()
+
+    st.header("Result")
+    if result.has_failed():
+        st.error(result.error_message)
+    else:
+        st.success(":material/check: Method has converged to a solution.")
+        x = sp.Matrix(result.table.iloc[-1][: len(symbols)].to_numpy())
+        st.latex("\\vec{x} = " + sp.latex(x))
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Evaluations of $F$", result.n_evaluations)
+    col2.metric("Jacobians", result.n_jacobians)
+    col3.metric("LU factorizations", result.n_factorizations)
+
+    st.subheader("Table")
+    st.dataframe(result.table, use_container_width=True)
+
+    st.divider()
+
+    st.subheader("Comparison of modes")
+    rows = []
+    for other in NEWTON_MODES:
+        output = newton_system(
+            function, jacobian, x_0, tol, niter, other, norm_value, tolerance_type
+        )
+        rows.append(
+            (
+                other,
+                "Yes" if not output.has_failed() else "No",
+                len(output.table) - 1,
+                output.n_evaluations,
+                output.n_jacobians,
+                output.n_factorizations,
+            )
+        )
+    st.table(
+        pd.DataFrame(
+            rows,
+            columns=[
+                "Mode",
+                "Converged",
+                "Iterations",
+                "Evaluations of F",
+                "Jacobians",
+                "LU factorizations",
+            ],
+        )
+    )
@@ -1,6 +1,13 @@
+from .all_roots import show_all_roots
+from .auto import show_auto
+from .basins import show_newton_basins
 from .bisection import show_bisection
+from .brent import show_brent
 from .false_position import show_false_position
 from .fixed_point import show_fixed_point
+from .householder import show_householder
 from .multiple_roots import show_multiple_roots
 from .newton_raphson import show_newton
 from .secant import show_secant
+from .sweep import show_parameter_sweep
+from .tabulated import show_tabulated_roots
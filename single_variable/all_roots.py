@@ -0,0 +1,250 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+import sympy as sp
+
+from utils.general import nm_diff, nm_lambdify, nm_lambdify_derivatives, nm_sympify
+from utils.interface_blocks import calculate_tolerance, graph, ui_input_function
+
+from .common import Result, evaluate_array
+
+REFINERS = ("Bisection", "False position", "Newton-Raphson")
+
+# Below this many candidates, starting a process pool costs more than it saves.
+MIN_PARALLEL_CANDIDATES = 16
+
+
+def find_all_roots(
+    function_input,
+    a,
+    b,
+    niter,
+    tol,
+    tolerance_type,
+    refiner="Bisection",
+    n_samples=2000,
+    max_workers=None,
+    symbol=sp.symbols("x"),
+) -> Result:
+    """
+    Find every root of a function in the interval [a, b].
+
+    The function is sampled on a uniform grid in one vectorized call. Each
+    sign change between neighbouring samples becomes a bracket, and each
+    local minimum of |f| without a sign change becomes a candidate for a
+    root of even multiplicity. Brackets are refined with `refiner`; touching
+    candidates with the multiple roots method. Refinement runs in a process
+    pool when there are enough candidates.
+
+    Parameters:
+        function_input (str): Function in terms of `symbol`.
+        a, b (float): Endpoints of the search interval.
+        niter (int): Maximum number of iterations per refinement.
+        tol (float): Tolerance for each refinement.
+        tolerance_type (str): "Correct Decimals" or "Significant Figures".
+        refiner (str): One of `REFINERS`, used on sign-change brackets.
+        n_samples (int): Number of grid intervals in [a, b].
+        max_workers (int, optional): Process pool size; 1 refines serially.
+        symbol (sympy.Symbol, optional): Variable of the function.
+
+    Returns:
+        Result: Its table holds one row per root, sorted by x.
+    """
+    result = Result()
+
+    if b <= a:
+        result.error_message = "Invalid Arguments, b must be greater than a."
+        return result
+    if refiner not in REFINERS:
+        raise ValueError("Not a valid refiner.")
+
+    function = nm_lambdify(function_input, symbol)
+    x = np.linspace(a, b, n_samples + 1)
+    with np.errstate(all="ignore"):
+        y = evaluate_array(function, x)
+    finite = np.isfinite(y)
+
+    tasks = []
+    # Samples that are exact roots.
+    for i in np.flatnonzero(y == 0):
+        tasks.append(("Exact", x[i], x[i]))
+
+    # Sign changes between finite neighbours.
+    sign_change = (y[:-1] * y[1:] < 0) & finite[:-1] & finite[1:]
+    for i in np.flatnonzero(sign_change):
+        tasks.append((refiner, x[i], x[i + 1]))
+
+    # Local minima of |f| with no sign change around them.
+    abs_y = np.where(finite, np.abs(y), np.inf)
+    minimum = (abs_y[1:-1] < abs_y[:-2]) & (abs_y[1:-1] < abs_y[2:])
+    minimum &= (y[:-2] * y[1:-1] > 0) & (y[1:-1] * y[2:] > 0)
+    for i in np.flatnonzero(minimum) + 1:
+        tasks.append(("Touching", x[i - 1], x[i + 1]))
+
+    tasks = [
+        (method, left, right, str(function_input), symbol, niter, tol, tolerance_type)
+        for method, left, right in tasks
+    ]
+    if max_workers != 1 and len(tasks) >= MIN_PARALLEL_CANDIDATES:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            rows = list(executor.map(_refine, tasks, chunksize=4))
+    else:
+        rows = [_refine(task) for task in tasks]
+
+    rows = _merge_duplicates([row for row in rows if row is not None], tol)
+    result.table = pd.DataFrame(
+        rows, columns=["x", "f_x", "error", "n_iter", "n_evaluations", "kind"]
+    )
+    result.n_evaluations = len(x) + int(result.table["n_evaluations"].sum())
+    if result.table.empty:
+        result.error_message = "No roots found in the interval."
+        return result
+    result.set_success_status()
+    return result
+
+
+def _refine(task):
+    """Refine one candidate. Runs in worker processes, so it only gets picklable data."""
+    from single_variable.bisection import bisection
+    from single_variable.false_position import false_position
+    from single_variable.multiple_roots import multiple_roots
+    from single_variable.newton_raphson import newton
+
+    method, left, right, function_input, symbol, niter, tol, tolerance_type = task
+    function = nm_lambdify(function_input, symbol)
+
+    match method:
+        case "Exact":
+            return (left, function(left), 0.0, 0, 1, "exact")
+        case "Bisection":
+            output = bisection(
+                left, right, niter, tol, tolerance_type, function, trace="none"
+            )
+        case "False position":
+            output = false_position(
+                left, right, niter, tol, tolerance_type, function, trace="none"
+            )
+        case "Newton-Raphson":
+            derivative = nm_lambdify(nm_diff(function_input, symbol), symbol)
+            output = newton(
+                (left + right) / 2,
+                niter,
+                tol,
+                tolerance_type,
+                function,
+                derivative,
+                trace="none",
+            )
+        case "Touching":
+            output = multiple_roots(
+                (left + right) / 2,
+                niter,
+                tol,
+                function,
+                None,
+                None,
+                tolerance_type,
+                derivatives=nm_lambdify_derivatives(function_input, symbol),
+                trace="none",
+            )
+
+    if output.has_failed() or output.table.empty:
+        return None
+
+    last = output.table.iloc[-1]
+    root = float(last["x"])
+    if not left <= root <= right:
+        return None
+    kind = "touching" if method == "Touching" else "sign change"
+
+    # A sign change across a pole refines to the pole, not to a root.
+    f_left, f_right = abs(function(left)), abs(function(right))
+    if kind == "sign change" and abs(last["f_x"]) > max(f_left, f_right):
+        return None
+    if kind == "touching" and not abs(last["f_x"]) <= max(tol, 1e-12):
+        return None
+
+    n_iter = int(output.table.index[-1])
+    return (root, last["f_x"], last["error"], n_iter, output.n_evaluations, kind)
+
+
+def _merge_duplicates(rows, tol):
+    rows = sorted(rows, key=lambda row: row[0])
+    merged = []
+    for row in rows:
+        if merged and abs(row[0] - merged[-1][0]) <= 10 * tol:
+            if abs(row[1]) < abs(merged[-1][1]):
+                merged[-1] = row
+            continue
+        merged.append(row)
+    return merged
+
+
+def show_all_roots():
+    st.header("All Roots in an Interval")
+
+    function_input = ui_input_function(placeholder_function="sin(x)")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        a = st.number_input(
+            "Initial point of search interval (a)",
+            format="%.4f",
+            value=-10.0,
+            step=0.0001,
+        )
+    with col2:
+        b = st.number_input(
+            "End point of search interval (b)",
+            format="%.4f",
+            value=10.0,
+            step=0.0001,
+        )
+
+    col3, col4 = st.columns(2)
+    with col3:
+        refiner = st.selectbox(
+            "Refinement method",
+            REFINERS,
+            help="Method used to refine each bracket where the function changes sign.",
+        )
+    with col4:
+        n_samples = st.number_input(
+            "Number of grid intervals",
+            value=2000,
+            min_value=10,
+            step=100,
+            help="The function is sampled on this many intervals to locate sign changes. Roots closer together than one interval may be missed.",
+        )
+
+    tol, niter, tolerance_type = calculate_tolerance()
+    st.markdown(f"**Calculated Tolerance:** {tol:.10f}")
+
+    x = sp.symbols("x")
+    function_sp = nm_sympify(function_input)
+    st.subheader("Function")
+    st.latex(f"f({x}) = {sp.latex(function_sp)}")
+
+    result = find_all_roots(
+        function_input, a, b, niter, tol, tolerance_type, refiner, int(n_samples)
+    )
+
+    st.divider()
+
+    st.header("Result")
+    if result.has_failed():
+        st.warning(result.error_message)
+    else:
+        st.success(f":material/check: Found {len(result.table)} root(s).")
+        st.subheader("Table")
+        st.table(
+            result.table.style.format(
+                {"x": "{:.15e}", "f_x": "{:.15e}", "error": "{:.15e}"}
+            )
+        )
+
+    st.divider()
+
+    graph(function_input, a, b)
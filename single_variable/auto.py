@@ -0,0 +1,395 @@
+import math
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+import sympy as sp
+
+from utils.general import nm_lambdify, nm_lambdify_derivatives, nm_sympify
+from utils.interface_blocks import calculate_tolerance, graph, ui_input_function
+from utils.polynomial import polynomial_form
+from utils.sandbox import run_sandboxed
+
+from .brent import brent
+from .common import Evaluator, Result, ResultStatus, count_evaluations
+from .householder import householder
+from .multiple_roots import multiple_roots
+from .polynomial import polynomial_roots
+from .precision import format_value
+from .secant import secant
+
+# Ostrowski's efficiency index p^(1/cost) of a method of order p: Newton
+# (order 2, one evaluation of f and f') beats the secant method and Brent
+# (order about the golden ratio, one evaluation of f) only while f' adds
+# less than this fraction to the cost of f.
+GOLDEN_RATIO = (1 + math.sqrt(5)) / 2
+NEWTON_BREAK_EVEN = math.log(2) / math.log(GOLDEN_RATIO) - 1
+
+# Sign-change search around x_0: half-widths start at BRACKET_START times
+# max(1, |x_0|) and grow by BRACKET_GROWTH, at most BRACKET_STEPS times.
+BRACKET_START = 1e-2
+BRACKET_GROWTH = 2.0
+BRACKET_STEPS = 16
+
+# Newton steps taken from x_0 before estimating the multiplicity. Newton
+# homes in on a simple root fast and on a multiple one at a steady rate,
+# so a few steps get close enough for the estimate to settle.
+PROBE_STEPS = 6
+
+
+@dataclass
+class AutoResult(Result):
+    """
+    Result of the method the planner settled on.
+
+    `method` names the method whose result this is. `decisions` lists
+    (step, finding) pairs: the checks made, the plan drawn from them and
+    the outcome of every method tried. `n_evaluations` counts the calls of
+    the checks and of every attempt.
+    """
+
+    method: str = ""
+    decisions: list = field(default_factory=list)
+
+    def decisions_dataframe(self):
+        return pd.DataFrame(self.decisions, columns=["Step", "Finding"])
+
+
+def auto_solve(
+    function_input,
+    x_0,
+    niter,
+    tol,
+    tolerance_type,
+    a=None,
+    b=None,
+    symbol=sp.symbols("x"),
+) -> AutoResult:
+    """
+    Pick a root-finding method for f from cheap checks and run it.
+
+    The checks are whether f is a polynomial, whether f changes sign on
+    [a, b] (or, without an interval, on one found around x_0), how much f'
+    adds to the cost of f when both are compiled together, and the
+    multiplicity of the root near x_0. From them the candidates are
+    ordered by expected speed:
+
+    1. Polynomial roots: all roots at once, the real one nearest x_0 kept.
+    2. Multiple roots: a multiplicity of 2 or more slows the others down to
+       linear convergence.
+    3. Newton–Raphson, while f' is cheap enough to beat the methods of
+       order 1.618.
+    4. Brent, on a sign-change bracket; it cannot fail to converge.
+    5. Secant, from x_0 and a point next to it.
+
+    They are tried in that order until one converges. Returns an
+    AutoResult recording which method succeeded and why it was chosen.
+    """
+    result = AutoResult()
+    decisions = result.decisions
+    expression = nm_sympify(function_input)
+    function = Evaluator(nm_lambdify(expression, symbol))
+    spent = []  # Evaluators of the checks.
+
+    coefficients, _ = polynomial_form(expression, symbol)
+    polynomial = coefficients is not None and len(np.trim_zeros(coefficients, "f")) > 1
+    decisions.append(
+        (
+            "Polynomial",
+            (
+                f"Yes, of degree {len(np.trim_zeros(coefficients, 'f')) - 1}."
+                if polynomial
+                else "No."
+            ),
+        )
+    )
+
+    if a is not None and b is not None:
+        bracket = (a, b) if function(a) * function(b) <= 0 else None
+        finding = (
+            f"f changes sign on [{a:g}, {b:g}]."
+            if bracket
+            else f"f does not change sign on [{a:g}, {b:g}]."
+        )
+    else:
+        bracket = find_bracket(function, x_0)
+        finding = (
+            f"Found [{bracket[0]:.6g}, {bracket[1]:.6g}] around x_0."
+            if bracket
+            else "None found around x_0."
+        )
+    decisions.append(("Sign-change bracket", finding))
+    spent.append(function)
+
+    try:
+        derivatives = Evaluator(
+            nm_lambdify_derivatives(expression, symbol, orders=(0, 1, 2))
+        )
+        newton_step = nm_lambdify_derivatives(expression, symbol, orders=(0, 1))
+        derivative_cost = _derivative_cost(expression, symbol)
+    except ValueError as e:
+        derivatives = newton_step = None
+        derivative_cost = math.inf
+        decisions.append(("Derivative", f"Not available: {e}"))
+    else:
+        spent.append(derivatives)
+        decisions.append(
+            (
+                "Derivative cost",
+                f"f' adds {derivative_cost:.0%} to the cost of f; Newton pays off below {NEWTON_BREAK_EVEN:.0%}.",
+            )
+        )
+
+    multiplicity = math.nan
+    if derivatives is not None:
+        multiplicity, x_probe = estimate_multiplicity(derivatives, x_0)
+        decisions.append(
+            (
+                "Multiplicity near x_0",
+                (
+                    f"About {multiplicity:.2f}, at x = {x_probe:.6g} after Newton steps from x_0."
+                    if math.isfinite(multiplicity)
+                    else "Unknown: f' vanishes or the probe diverged."
+                ),
+            )
+        )
+
+    candidates = []
+    if polynomial:
+        candidates.append(
+            (
+                "Polynomial roots",
+                "f is a polynomial: its companion matrix gives every root at once.",
+                lambda: _nearest_polynomial_root(
+                    coefficients, x_0, niter, tol, tolerance_type
+                ),
+            )
+        )
+    if multiplicity >= 1.5:
+        candidates.append(
+            (
+                "Multiple roots",
+                f"A root of multiplicity about {round(multiplicity)} makes Newton and the secant method converge only linearly.",
+                lambda: multiple_roots(
+                    x_0,
+                    niter,
+                    tol,
+                    None,
+                    None,
+                    None,
+                    tolerance_type,
+                    derivatives=derivatives.function,
+                ),
+            )
+        )
+    if newton_step is not None and derivative_cost < NEWTON_BREAK_EVEN:
+        candidates.append(
+            (
+                "Newton–Raphson",
+                "f' is cheap next to f, so quadratic convergence wins.",
+                lambda: householder(
+                    x_0, niter, tol, tolerance_type, newton_step, order=1
+                ),
+            )
+        )
+    if bracket is not None:
+        candidates.append(
+            (
+                "Brent",
+                "f changes sign on a bracket, so Brent's method converges for sure, superlinearly.",
+                lambda: brent(*bracket, niter, tol, tolerance_type, function.function),
+            )
+        )
+    candidates.append(
+        (
+            "Secant",
+            "Needs neither a bracket nor a derivative.",
+            lambda: secant(
+                x_0,
+                x_0 + BRACKET_START * max(1.0, abs(x_0)),
+                niter,
+                tol,
+                function.function,
+                tolerance_type,
+            ),
+        )
+    )
+    decisions.append(("Plan", " → ".join(name for name, _, _ in candidates)))
+
+    n_evaluations = count_evaluations(*spent)
+    for name, reason, run in candidates:
+        try:
+            attempt = run()
+        except (ArithmeticError, ValueError) as e:
+            attempt = Result(error_message=f"**Error:** {e}")
+        n_evaluations += attempt.n_evaluations
+        if attempt.has_failed():
+            message = attempt.error_message.removeprefix("**Error:**").strip()
+            decisions.append((name, f"{reason} Failed: {message}"))
+            continue
+        # Some methods report success when they run out of iterations.
+        last = attempt.table.iloc[-1]
+        if last["f_x"] != 0 and last["error"] > tol:
+            decisions.append((name, f"{reason} Stopped short of the tolerance."))
+            continue
+
+        decisions.append((name, f"{reason} Converged."))
+        result.method = name
+        result.table = attempt.table[["x", "f_x", "error"]]
+        result.set_success_status()
+        break
+    else:
+        result.error_message = "**Error:** No method converged."
+
+    result.n_evaluations = n_evaluations
+    return result
+
+
+def find_bracket(function, x_0):
+    """
+    Look for a sign change of f on intervals growing around x_0.
+
+    Returns the first bracket found, (lower, upper), or None. Values that
+    underflow to zero far from x_0 do not count as a sign change.
+    """
+    f_0 = function(x_0)
+    if f_0 == 0:
+        return x_0, x_0
+    width = BRACKET_START * max(1.0, abs(x_0))
+    lower = upper = x_0
+    f_lower = f_upper = f_0
+    for _ in range(BRACKET_STEPS):
+        with np.errstate(all="ignore"):
+            x, f_x = x_0 + width, function(x_0 + width)
+            if np.isfinite(f_x):
+                if f_x * f_upper < 0:
+                    return upper, x
+                upper, f_upper = x, f_x
+            x, f_x = x_0 - width, function(x_0 - width)
+            if np.isfinite(f_x):
+                if f_x * f_lower < 0:
+                    return x, lower
+                lower, f_lower = x, f_x
+        width *= BRACKET_GROWTH
+    return None
+
+
+def estimate_multiplicity(derivatives, x_0):
+    """
+    Estimate the multiplicity of the root that Newton's method heads for.
+
+    Near a root of multiplicity m, f f'' / f'^2 tends to (m - 1) / m, so m
+    is about 1 / (1 - f f'' / f'^2). A few Newton steps from x_0 bring the
+    estimate closer to the root first. `derivatives` maps x to f, f', f''.
+    Returns (m, the point of the estimate), with m NaN when f' vanishes or
+    the steps do not bring f closer to zero.
+    """
+    x = x_0
+    with np.errstate(all="ignore"):
+        for i in range(PROBE_STEPS + 1):
+            f_x, d_f_x, d2_f_x = derivatives(x)
+            if d_f_x == 0 or not np.isfinite([f_x, d_f_x, d2_f_x]).all():
+                return math.nan, x
+            if i == 0:
+                f_0 = f_x
+            if i == PROBE_STEPS or f_x == 0:
+                break
+            x = x - f_x / d_f_x
+
+        ratio = f_x * d2_f_x / d_f_x**2
+    if ratio >= 1 or abs(f_x) >= abs(f_0):
+        return math.nan, x
+    return 1 / (1 - ratio), x
+
+
+def _derivative_cost(expression, symbol):
+    # Extra operations to get f' along with f, when both are compiled
+    # together and share subexpressions, relative to f alone. Differentiating
+    # and searching for common subexpressions can take long on large input,
+    # so the count runs in the sandbox.
+    return run_sandboxed(_count_derivative_cost, expression, symbol)
+
+
+def _count_derivative_cost(expression, symbol):
+    f_cost = sp.count_ops(expression)
+    replacements, reduced = sp.cse([expression, sp.diff(expression, symbol)])
+    both_cost = sum(sp.count_ops(value) for _, value in replacements) + sum(
+        sp.count_ops(value) for value in reduced
+    )
+    return max(0, both_cost - f_cost) / max(1, f_cost)
+
+
+def _nearest_polynomial_root(coefficients, x_0, niter, tol, tolerance_type):
+    result, _ = polynomial_roots(coefficients, niter, tol, tolerance_type)
+    if result.has_failed():
+        return result
+    if result.table.empty:
+        result.status = ResultStatus.FAILURE
+        result.error_message = "The polynomial has no real roots."
+        return result
+    nearest = (result.table["x"] - x_0).abs().idxmin()
+    result.table = result.table.loc[[nearest]].reset_index(drop=True)
+    return result
+
+
+def show_auto():
+    st.header("Automatic Method Choice")
+
+    function_input = ui_input_function(placeholder_function="exp(x) - 2")
+
+    col1, col2 = st.columns(2)
+    x_0 = col1.number_input(
+        "Initial Point ($x_0$)",
+        format="%.4f",
+        value=1.0,
+        step=0.0001,
+        help="Initial guess for the root, and the centre of the search for a sign change.",
+    )
+    interval = col2.checkbox(
+        "Search interval",
+        help="Give an interval [a, b] where f changes sign instead of searching for one around $x_0$.",
+    )
+    a = b = None
+    if interval:
+        col3, col4 = st.columns(2)
+        a = col3.number_input("Initial point of search interval (a)", value=0.0)
+        b = col4.number_input("End point of search interval (b)", value=2.0)
+        if b <= a:
+            st.error("**Error:** a must be smaller than b.")
+            return
+
+    tol, niter, tolerance_type = calculate_tolerance()
+    st.markdown(f"**Calculated Tolerance:** {tol:.10f}")
+
+    x = sp.symbols("x")
+    function_sp = nm_sympify(function_input)
+    st.subheader("Function")
+    st.latex(f"f({x}) = {sp.latex(function_sp)}")
+
+    result = auto_solve(function_sp, x_0, niter, tol, tolerance_type, a, b, x)
+
+    st.divider()
+
+    st.header("Result")
+    if result.has_failed():
+        st.error(result.error_message)
+    else:
+        last_x, f_x = result.table.iloc[-1][["x", "f_x"]]
+        st.success(f":material/check: Root found with {result.method}.")
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("$x$", format_value(last_x, 10))
+        col2.metric("$f(x)$", format_value(f_x, 10))
+        col3.metric("Evaluations, checks included", result.n_evaluations)
+
+    st.subheader("Decisions")
+    st.table(result.decisions_dataframe())
+
+    if not result.has_failed():
+        st.subheader("Table")
+        st.table(result.table.map(format_value))
+
+    st.divider()
+
+    graph(function_input)
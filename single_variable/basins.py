@@ -0,0 +1,309 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import plotly.graph_objs as go
+import streamlit as st
+import sympy as sp
+
+from utils.general import nm_lambdify_derivatives, nm_sympify
+from utils.interface_blocks import calculate_tolerance, ui_input_function
+
+from .common import ErrorType, calculate_error_array, determine_error_type
+
+# Starting points iterated together; bounds the memory of one chunk.
+CHUNK_SIZE = 1 << 15
+
+# Below this many starting points, starting a process pool costs more than it saves.
+MIN_PARALLEL_POINTS = 1 << 18
+
+
+@dataclass
+class BasinResult:
+    """
+    Outcome of Newton's method for every starting point of a grid.
+
+    `root_index` and `n_iter` have one entry per grid cell, with rows along
+    `y` (the imaginary part; a single row for real starting points) and
+    columns along `x`. `root_index` points into `roots`, or is -1 where the
+    iteration did not converge.
+    """
+
+    x: np.ndarray
+    y: np.ndarray
+    root_index: np.ndarray
+    n_iter: np.ndarray
+    roots: np.ndarray
+
+    def converged(self) -> np.ndarray:
+        return self.root_index >= 0
+
+
+def newton_basins(
+    function_input,
+    x_min,
+    x_max,
+    niter,
+    tol,
+    tolerance_type,
+    y_min=None,
+    y_max=None,
+    resolution=(300, 300),
+    chunk_size=CHUNK_SIZE,
+    max_workers=None,
+    symbol=sp.symbols("x"),
+) -> BasinResult:
+    """
+    Run Newton's method from every point of a grid and record where it goes.
+
+    With `y_min` and `y_max` the starting points are the complex numbers
+    x + iy of a `resolution` = (n_x, n_y) grid, which draws the Newton
+    fractal; without them they are n_x real points. All points of a chunk
+    of `chunk_size` iterate together in vectorized steps, so memory stays
+    bounded however fine the grid is. Large grids spread their chunks
+    over a process pool.
+
+    Parameters:
+        function_input (str): Function in terms of `symbol`.
+        x_min, x_max (float): Range of the real part of the starting points.
+        niter (int): Maximum number of iterations per starting point.
+        tol (float): Tolerance for the stopping criterion.
+        tolerance_type (str): "Correct Decimals" or "Significant Figures".
+        y_min, y_max (float, optional): Range of the imaginary part.
+        resolution (tuple): Number of grid points along x and y.
+        chunk_size (int): Starting points iterated together.
+        max_workers (int, optional): Process pool size; 1 runs serially.
+        symbol (sympy.Symbol, optional): Variable of the function.
+
+    Returns:
+        BasinResult: Root index and iteration count per grid cell.
+    """
+    n_x, n_y = resolution
+    x = np.linspace(x_min, x_max, n_x)
+    if y_min is None or y_max is None:
+        y = np.zeros(1)
+        z_0 = x.astype(complex)[np.newaxis, :]
+        complex_plane = False
+    else:
+        y = np.linspace(y_min, y_max, n_y)
+        z_0 = x[np.newaxis, :] + 1j * y[:, np.newaxis]
+        complex_plane = True
+
+    points = z_0.ravel()
+    tasks = [
+        (
+            str(function_input),
+            symbol,
+            points[start : start + chunk_size],
+            complex_plane,
+            niter,
+            tol,
+            tolerance_type,
+        )
+        for start in range(0, len(points), chunk_size)
+    ]
+    if max_workers != 1 and len(tasks) > 1 and len(points) >= MIN_PARALLEL_POINTS:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            chunks = list(executor.map(_newton_chunk, tasks))
+    else:
+        chunks = [_newton_chunk(task) for task in tasks]
+
+    z = np.concatenate([chunk[0] for chunk in chunks])
+    n_iter = np.concatenate([chunk[1] for chunk in chunks])
+    converged = np.concatenate([chunk[2] for chunk in chunks])
+
+    roots, root_index = _identify_roots(z, converged, tol, tolerance_type)
+    return BasinResult(
+        x=x,
+        y=y,
+        root_index=root_index.reshape(z_0.shape),
+        n_iter=n_iter.reshape(z_0.shape),
+        roots=roots,
+    )
+
+
+def _newton_chunk(task):
+    """
+    Iterate Newton's method on one chunk of starting points.
+
+    Runs in worker processes, so it only gets picklable data. Points leave
+    the active set once they converge or their iterate stops being finite.
+    """
+    function_input, symbol, z, complex_plane, niter, tol, tolerance_type = task
+    error_type = determine_error_type(tolerance_type)
+    derivatives = nm_lambdify_derivatives(function_input, symbol, orders=(0, 1))
+    if not complex_plane:
+        z = z.real
+
+    z = z.copy()
+    n_iter = np.zeros(len(z), dtype=int)
+    converged = np.zeros(len(z), dtype=bool)
+    active = np.ones(len(z), dtype=bool)
+
+    i = 0
+    while i < niter and active.any():
+        idx = np.flatnonzero(active)
+        with np.errstate(all="ignore"):
+            f_z, df_z = (
+                np.broadcast_to(value, idx.shape) for value in derivatives(z[idx])
+            )
+            z_next = z[idx] - f_z / df_z
+            error = calculate_error_array(z_next, z[idx], error_type)
+
+        i += 1
+        z[idx] = z_next
+        n_iter[idx] = i
+
+        done = error <= tol
+        diverged = ~np.isfinite(z_next)
+        converged[idx[done]] = True
+        active[idx[done | diverged]] = False
+
+    return z.astype(complex), n_iter, converged
+
+
+def _identify_roots(z, converged, tol, tolerance_type):
+    """
+    Group the limits of the converged points into distinct roots.
+
+    Limits closer than a few times the tolerance are the same root. Roots
+    are sorted by real then imaginary part, so colours are stable between
+    runs. Returns the roots and, per point, the index of its root or -1.
+    """
+    root_index = np.full(len(z), -1)
+    if not converged.any():
+        return np.empty(0, dtype=complex), root_index
+
+    limits = z[converged]
+    radius = 10 * tol
+    if determine_error_type(tolerance_type) == ErrorType.RELATIVE:
+        radius *= max(1.0, np.abs(limits).max())
+
+    # Snap the limits to a grid of cells of that size, then merge the cells
+    # of one root that the snapping split.
+    cells = np.round(limits.real / radius) + 1j * np.round(limits.imag / radius)
+    cells, cell_index = np.unique(cells, return_inverse=True)
+    counts = np.bincount(cell_index)
+    centres = (
+        np.bincount(cell_index, weights=limits.real)
+        + 1j * np.bincount(cell_index, weights=limits.imag)
+    ) / counts
+
+    roots = []
+    cell_root = np.empty(len(cells), dtype=int)
+    for k, centre in enumerate(centres):
+        for j, root in enumerate(roots):
+            if abs(centre - root) <= 2 * radius:
+                cell_root[k] = j
+                break
+        else:
+            cell_root[k] = len(roots)
+            roots.append(centre)
+
+    roots = np.array(roots)
+    order = np.lexsort((roots.imag, roots.real))
+    rank = np.empty(len(roots), dtype=int)
+    rank[order] = np.arange(len(roots))
+    root_index[converged] = rank[cell_root[cell_index]]
+    return roots[order], root_index
+
+
+def show_newton_basins():
+    st.header("Newton Basins of Attraction")
+
+    function_input = ui_input_function(placeholder_function="x**3 - 1")
+
+    complex_plane = st.checkbox(
+        "Complex starting points",
+        value=True,
+        help="Start from x + iy on a grid of the complex plane, which draws the Newton fractal, instead of from real points only.",
+    )
+
+    col1, col2, col3 = st.columns(3)
+    x_min = col1.number_input("Smallest real part", value=-2.0, format="%.4f")
+    x_max = col2.number_input("Largest real part", value=2.0, format="%.4f")
+    n_x = col3.number_input(
+        "Points along the real axis", value=300, min_value=2, step=50
+    )
+    y_min = y_max = None
+    n_y = 1
+    if complex_plane:
+        col4, col5, col6 = st.columns(3)
+        y_min = col4.number_input("Smallest imaginary part", value=-2.0, format="%.4f")
+        y_max = col5.number_input("Largest imaginary part", value=2.0, format="%.4f")
+        n_y = col6.number_input(
+            "Points along the imaginary axis", value=300, min_value=2, step=50
+        )
+
+    tol, niter, tolerance_type = calculate_tolerance()
+    st.markdown(f"**Calculated Tolerance:** {tol:.10f}")
+
+    if x_max <= x_min or (complex_plane and y_max <= y_min):
+        st.error("Each range must have its smallest value before its largest.")
+        return
+
+    x = sp.symbols("x")
+    function_sp = nm_sympify(function_input)
+    st.subheader("Function")
+    st.latex(f"f({x}) = {sp.latex(function_sp)}")
+
+    result = newton_basins(
+        function_input,
+        x_min,
+        x_max,
+        niter,
+        tol,
+        tolerance_type,
+        y_min,
+        y_max,
+        resolution=(int(n_x), int(n_y)),
+    )
+
+    st.divider()
+
+    st.header("Result")
+    converged = result.converged()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Roots reached", len(result.roots))
+    col2.metric("Converged starting points", f"{converged.mean():.1%}")
+    if converged.any():
+        col3.metric("Mean iterations", f"{result.n_iter[converged].mean():.2f}")
+
+    # Cells that did not converge are left blank.
+    root_index = np.where(converged, result.root_index, np.nan)
+    y_axis = dict(title="Im(x_0)") if complex_plane else dict(visible=False)
+    for title, z, colorbar in (
+        ("Root reached from each starting point", root_index, "Root"),
+        ("Iterations from each starting point", result.n_iter, "Iterations"),
+    ):
+        fig = go.Figure(
+            go.Heatmap(
+                x=result.x,
+                y=result.y,
+                z=z,
+                colorscale="Viridis",
+                colorbar=dict(title=colorbar),
+            )
+        )
+        fig.update_layout(
+            title=title,
+            xaxis_title="Re(x_0)" if complex_plane else "x_0",
+            yaxis=y_axis,
+            margin=dict(l=0, r=0, t=40, b=0),
+        )
+        if complex_plane:
+            fig.update_yaxes(scaleanchor="x")
+        st.plotly_chart(fig)
+
+    st.subheader("Roots")
+    st.dataframe(
+        {
+            "Root": np.arange(len(result.roots)),
+            "Re": result.roots.real,
+            "Im": result.roots.imag,
+            "Starting points": np.bincount(
+                result.root_index[converged], minlength=len(result.roots)
+            ),
+        },
+        use_container_width=True,
+    )
@@ -1,53 +1,151 @@
+import numpy as np
 import pandas as pd
 import streamlit as st
 import sympy as sp
 
-from utils.general import nm_lambdify
-from utils.interface_blocks import calculate_tolerance, graph, ui_input_function
-
-from .common import Result, Table, calculate_error, determine_error_type
+from utils.general import nm_lambdify, nm_sympify
+from utils.interface_blocks import (
+    calculate_tolerance,
+    graph,
+    ui_input_function,
+    ui_precision,
+)
+
+from .common import (
+    BatchResult,
+    Evaluator,
+    Result,
+    ResultStatus,
+    Table,
+    calculate_error,
+    calculate_error_array,
+    determine_error_type,
+    evaluate_array,
+)
+from .ladder import show_tolerance_ladder
+from .polynomial import show_polynomial_roots
+from .precision import format_value, precise_solve
 from .report import generate_report
 
 
-def bisection(a, b, niter, tol, tolerance_type, function) -> Result:
+def bisection(
+    a, b, niter, tol, tolerance_type, function, trace="full", ladder=None
+) -> Result:
     result = Result()
-    table = Table()
+    table = Table(trace=trace)
     error_type = determine_error_type(tolerance_type)
+    function = Evaluator(function)
 
     if b < a:
         result.error_message = "Invalid Arguments, b must be greater than a."
         return result
 
-    table.add_row(a, function(a), None)
+    f_a = function(a)
+    table.add_row(a, f_a, None)
     error = 100  # Arbitrary initial error
 
-    if function(a) * function(b) > 0:
+    if f_a * function(b) > 0:
         result.error_message = (
             "Invalid Arguments, the function does not change sign in the interval."
         )
+        result.n_evaluations = function.count
         return result
 
     mid = (a + b) / 2
+    f_mid = function(mid)
     i = 0
     while i < niter and error > tol:
-        if function(a) * function(mid) <= 0:
+        if f_a * f_mid <= 0:
             b = mid
         else:
             a = mid
+            f_a = f_mid
 
         i += 1
         prev_mid = mid
         mid = (a + b) / 2
+        f_mid = function(mid)
 
         error = calculate_error(mid, prev_mid, error_type)
-        table.add_row(mid, function(mid), error)
+        table.add_row(mid, f_mid, error)
+        if ladder is not None:
+            ladder.record(i, mid, error, function.count)
 
     df = table.as_dataframe()
     result.table = df
+    result.n_evaluations = function.count
     result.set_success_status()
     return result
 
 
+def bisection_batch(a, b, niter, tol, tolerance_type, function) -> BatchResult:
+    """
+    Run the bisection method on many brackets at once.
+
+    Every active bracket is halved in the same step, so `function` is called
+    once per iteration on the array of midpoints (it must accept NumPy
+    arrays, as `nm_lambdify` functions do). Brackets that converge, or that
+    are invalid to begin with, are masked out of later steps.
+
+    Parameters:
+        a (array_like): Left endpoints of the brackets.
+        b (array_like): Right endpoints of the brackets.
+        niter (int): Maximum number of iterations per bracket.
+        tol (float): Tolerance for the stopping criterion.
+        tolerance_type (str): "Correct Decimals" or "Significant Figures".
+        function (callable): Vectorized function whose roots are sought.
+
+    Returns:
+        BatchResult: Per-bracket roots, iteration counts, errors and statuses.
+    """
+    error_type = determine_error_type(tolerance_type)
+    a, b = np.broadcast_arrays(
+        np.asarray(a, dtype=float).ravel(), np.asarray(b, dtype=float).ravel()
+    )
+    a = a.copy()
+    b = b.copy()
+
+    f_a = evaluate_array(function, a)
+    f_b = evaluate_array(function, b)
+
+    n_iter = np.zeros(a.shape, dtype=int)
+    error = np.full(a.shape, 100.0)  # Arbitrary initial error
+    status = np.full(a.shape, ResultStatus.FAILURE.value)
+
+    # Brackets with b < a or without a sign change never become active.
+    active = (a <= b) & (f_a * f_b <= 0)
+    mid = np.where(active, (a + b) / 2, np.nan)
+
+    i = 0
+    while i < niter and active.any():
+        idx = np.flatnonzero(active)
+        f_mid = evaluate_array(function, mid[idx])
+        i += 1
+        n_iter[idx] = i
+
+        # A midpoint that is an exact root is the answer; keep it as is.
+        exact = f_mid == 0
+        error[idx[exact]] = 0
+        status[idx[exact]] = ResultStatus.SUCCESS.value
+        active[idx[exact]] = False
+        idx, f_mid = idx[~exact], f_mid[~exact]
+
+        left = f_a[idx] * f_mid <= 0
+        b[idx] = np.where(left, mid[idx], b[idx])
+        a[idx] = np.where(left, a[idx], mid[idx])
+        f_a[idx] = np.where(left, f_a[idx], f_mid)
+
+        prev_mid = mid[idx]
+        mid[idx] = (a[idx] + b[idx]) / 2
+        error[idx] = calculate_error_array(mid[idx], prev_mid, error_type)
+
+        done = error[idx] <= tol
+        status[idx[done]] = ResultStatus.SUCCESS.value
+        active[idx[done]] = False
+
+    return BatchResult(x_sol=mid, n_iter=n_iter, err=error, status=status)
+
+
 def show_bisection():
     st.header("Bisection Method")
 
@@ -71,35 +169,39 @@ def show_bisection():
 
     tol, niter, tolerance_type = calculate_tolerance()
     st.markdown(f"**Calculated Tolerance:** {tol:.10f}")
+    precise = ui_precision()
 
     x = sp.symbols("x")
-    function_sp = sp.sympify(function_input)
-    first_derivative = sp.diff(function_sp, x)
-    second_derivative = sp.diff(first_derivative, x)
+    function_sp = nm_sympify(function_input)
 
     st.subheader("Function")
     st.latex(f"f({x}) = {sp.latex(function_sp)}")
 
     function = nm_lambdify(function_input, x)
 
-    result = bisection(a, b, niter, tol, tolerance_type, function)
+    if precise:
+        result = precise_solve(
+            "bisection", function_sp, x, tol, tolerance_type, niter, a=a, b=b
+        )
+    else:
+        result = bisection(a, b, niter, tol, tolerance_type, function)
 
     st.subheader("Results")
     if result.has_failed():
         st.error(result.error_message)
 
-    result_display = result.table.style.format("{:.15e}")
+    result_display = result.table.map(format_value)
 
     st.divider()
 
     st.header("Result")
     if not result.has_failed():
-        last_x = result.table.iloc[-1]["x"]
+        last_x, f_x = result.table.iloc[-1][["x", "f_x"]]
         st.success(":material/check: Root found.")
 
         col1, col2 = st.columns(2)
-        col1.metric("$x$", f"{last_x:.10e}")
-        col2.metric("$f(x)$", f"{function(last_x):.10e}")
+        col1.metric("$x$", format_value(last_x, 10))
+        col2.metric("$f(x)$", format_value(f_x, 10))
 
     st.subheader("Table")
     st.table(result_display)
@@ -109,12 +211,13 @@ def show_bisection():
     graph(function_input)
 
     st.divider()
-    generate_report(
-        niter,
-        function,
-        tol,
+    show_tolerance_ladder(
+        lambda tol, ladder: bisection(
+            a, b, niter, tol, tolerance_type, function, trace="none", ladder=ladder
+        ),
         tolerance_type,
-        x,
-        first_derivative,
-        second_derivative,
     )
+
+    show_polynomial_roots(function_sp, x, niter, tol, tolerance_type)
+
+    generate_report(niter, function_sp, tol, tolerance_type, x)
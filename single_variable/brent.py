@@ -0,0 +1,203 @@
+import sys
+
+import streamlit as st
+import sympy as sp
+
+from utils.general import nm_lambdify, nm_sympify
+from utils.interface_blocks import (
+    calculate_tolerance,
+    graph,
+    ui_input_function,
+    ui_precision,
+)
+
+from .common import (
+    ErrorType,
+    Evaluator,
+    Result,
+    Table,
+    calculate_error,
+    determine_error_type,
+)
+from .ladder import show_tolerance_ladder
+from .polynomial import show_polynomial_roots
+from .precision import format_value, precise_solve
+from .report import generate_report
+
+EPS = sys.float_info.epsilon
+
+
+def brent(
+    a, b, niter, tol, tolerance_type, function, trace="full", ladder=None
+) -> Result:
+    """
+    Brent–Dekker method.
+
+    Keeps a bracket [b, c] around the root like bisection does, but steps
+    with inverse quadratic interpolation or the secant method whenever
+    those steps stay well inside the bracket and shrink it fast enough.
+    Otherwise it falls back to bisection, so it never does worse than
+    bisection by more than a constant factor.
+
+    The error reported on each row is the width of the current bracket,
+    which bounds the distance from the best estimate to the root.
+    """
+    result = Result()
+    table = Table(trace=trace)
+    error_type = determine_error_type(tolerance_type)
+    function = Evaluator(function)
+
+    if b < a:
+        result.error_message = "Invalid Arguments, b must be greater than a."
+        return result
+
+    f_a = function(a)
+    f_b = function(b)
+    if f_a * f_b > 0:
+        result.error_message = (
+            "Invalid Arguments, the function does not change sign in the interval."
+        )
+        result.n_evaluations = function.count
+        return result
+
+    # Machine epsilon of the numbers in use: float64, or an mpmath context.
+    eps = getattr(getattr(b, "context", None), "eps", EPS)
+
+    # b is the best estimate, c the contrapoint and a the previous iterate.
+    c, f_c = b, f_b
+    d = e = b - a
+
+    i = 0
+    while True:
+        if f_b * f_c > 0:
+            c, f_c = a, f_a
+            d = e = b - a
+        if abs(f_c) < abs(f_b):
+            a, b, c = b, c, b
+            f_a, f_b, f_c = f_b, f_c, f_b
+
+        # A relative error is undefined at b = 0; fall back to the absolute one.
+        error = calculate_error(b, c, error_type if b != 0 else ErrorType.ABSOLUTE)
+        table.add_row(b, f_b, error if i > 0 else None)
+        if ladder is not None and i > 0:
+            ladder.record(i, b, 0 if f_b == 0 else error, function.count)
+        if error <= tol or f_b == 0 or i >= niter:
+            break
+
+        abs_tol = tol if error_type == ErrorType.ABSOLUTE else tol * abs(b)
+        tol_1 = 2 * eps * abs(b) + 0.5 * abs_tol
+        half = 0.5 * (c - b)
+
+        if abs(e) >= tol_1 and abs(f_a) > abs(f_b):
+            s = f_b / f_a
+            if a == c:
+                # Secant step.
+                p = 2 * half * s
+                q = 1 - s
+            else:
+                # Inverse quadratic interpolation.
+                q = f_a / f_c
+                r = f_b / f_c
+                p = s * (2 * half * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+
+            if 2 * p < min(3 * half * q - abs(tol_1 * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = half
+        else:
+            d = e = half
+
+        a, f_a = b, f_b
+        b += d if abs(d) > tol_1 else (tol_1 if half > 0 else -tol_1)
+        f_b = function(b)
+        i += 1
+
+    result.table = table.as_dataframe()
+    result.n_evaluations = function.count
+    if error <= tol or f_b == 0:
+        result.set_success_status()
+        return result
+    result.error_message = "**Error:** Took too many iterations."
+    return result
+
+
+def show_brent():
+    st.header("Brent's Method")
+
+    function_input = ui_input_function(placeholder_function="x**2 - 4")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        a = st.number_input(
+            "Initial point of search interval (a)",
+            format="%.4f",
+            value=0.1,
+            step=0.0001,
+        )
+    with col2:
+        b = st.number_input(
+            "End point of search interval (b)",
+            format="%.4f",
+            value=3.0,
+            step=0.0001,
+        )
+
+    tol, niter, tolerance_type = calculate_tolerance()
+    st.markdown(f"**Calculated Tolerance:** {tol:.10f}")
+    precise = ui_precision()
+
+    x = sp.symbols("x")
+    function_sp = nm_sympify(function_input)
+
+    st.subheader("Function")
+    st.latex(f"f({x}) = {sp.latex(function_sp)}")
+
+    function = nm_lambdify(function_sp, x)
+
+    if precise:
+        result = precise_solve(
+            "brent", function_sp, x, tol, tolerance_type, niter, a=a, b=b
+        )
+    else:
+        result = brent(a, b, niter, tol, tolerance_type, function)
+
+    st.subheader("Results")
+    if result.has_failed():
+        st.error(result.error_message)
+
+    result_display = result.table.map(format_value)
+
+    st.divider()
+
+    st.header("Result")
+    if not result.has_failed():
+        last_x, f_x = result.table.iloc[-1][["x", "f_x"]]
+        st.success(":material/check: Root found.")
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("$x$", format_value(last_x, 10))
+        col2.metric("$f(x)$", format_value(f_x, 10))
+        col3.metric("Function evaluations", result.n_evaluations)
+
+    st.subheader("Table")
+    st.table(result_display)
+
+    st.divider()
+
+    graph(function_input)
+
+    st.divider()
+    show_tolerance_ladder(
+        lambda tol, ladder: brent(
+            a, b, niter, tol, tolerance_type, function, trace="none", ladder=ladder
+        ),
+        tolerance_type,
+    )
+
+    show_polynomial_roots(function_sp, x, niter, tol, tolerance_type)
+
+    generate_report(niter, function_sp, tol, tolerance_type, x)
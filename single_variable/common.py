@@ -1,7 +1,11 @@
-from dataclasses import asdict, dataclass, field
+import copy
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 
@@ -15,6 +19,7 @@ class SingleVariableMethodOutput:
 class ResultStatus(Enum):
     SUCCESS = 0
     FAILURE = 1
+    TIMEOUT = 2
 
 
 class ErrorType(Enum):
@@ -32,13 +37,15 @@ class Result:
     status: ResultStatus = ResultStatus.FAILURE
     error_message: str = ""
     table: pd.DataFrame = field(default_factory=pd.DataFrame)
+    n_evaluations: int = 0
+    state: "SolverState | None" = None
 
     def set_success_status(self):
         self.status = ResultStatus.SUCCESS
 
     def has_failed(self) -> bool:
         match self.status:
-            case ResultStatus.FAILURE:
+            case ResultStatus.FAILURE | ResultStatus.TIMEOUT:
                 return True
             case ResultStatus.SUCCESS:
                 return False
@@ -47,18 +54,277 @@ def has_failed(self) -> bool:
 
 
 @dataclass
+class BatchResult:
+    """Per-bracket output of a vectorized run (one entry per bracket)."""
+
+    x_sol: np.ndarray
+    n_iter: np.ndarray
+    err: np.ndarray
+    status: np.ndarray
+
+    def converged(self) -> np.ndarray:
+        return self.status == ResultStatus.SUCCESS.value
+
+    def as_dataframe(self):
+        return pd.DataFrame(
+            {
+                "x": self.x_sol,
+                "n_iter": self.n_iter,
+                "error": self.err,
+                "status": [ResultStatus(s).name for s in self.status],
+            }
+        )
+
+
+class MethodTimeout(Exception):
+    """Raised when a method runs past its time budget."""
+
+
+class Evaluator:
+    """
+    Wrap a function so that solvers share one evaluation layer.
+
+    The last `memory` (x, f(x)) pairs are remembered, so asking again for a
+    recent point does not call the function. `count` holds the number of
+    calls that actually reached the wrapped function. If a `deadline` (a
+    `time.perf_counter()` value) is given, calls made after it raise
+    `MethodTimeout`, which stops the solver using the function. The check
+    also covers calls answered from memory, and the deadline of a wrapped
+    Evaluator, so a solver that wraps a limited function again, or keeps
+    asking for the same point, still stops.
+    """
+
+    def __init__(self, function, memory=4, deadline=None):
+        self.function = function
+        self.memory = memory
+        self.deadline = deadline
+        self.count = 0
+        self._recent = OrderedDict()
+        self._wrapped = function if isinstance(function, Evaluator) else None
+
+    def __call__(self, x):
+        if self.deadline is not None or self._wrapped is not None:
+            self._check_deadline()
+        try:
+            return self._recent[x]
+        except KeyError:
+            pass
+        except TypeError:  # Unhashable input, e.g. a NumPy array.
+            self.count += 1
+            return self.function(x)
+
+        value = self.function(x)
+        self.count += 1
+        self.remember(x, value)
+        return value
+
+    def remember(self, x, value):
+        """Store a value known from elsewhere, without calling the function."""
+        self._recent[x] = value
+        if len(self._recent) > self.memory:
+            self._recent.popitem(last=False)
+
+    def _check_deadline(self):
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise MethodTimeout()
+        if self._wrapped is not None:
+            self._wrapped._check_deadline()
+
+
+def count_evaluations(*evaluators):
+    return sum(evaluator.count for evaluator in evaluators)
+
+
+class ToleranceLadder:
+    """
+    Cost of several accuracy levels, recorded in a single run.
+
+    A solver given a ladder runs to `tightest` and passes every iterate to
+    `record`. The ladder keeps, per tolerance, the iteration, the number
+    of function evaluations and the iterate at which the error first met
+    it, so each level costs nothing beyond the run to the tightest one.
+    Solvers that stop at an exact root record an error of 0 for it, since
+    it meets every tolerance.
+    """
+
+    columns = ("tolerance", "n_iter", "n_evaluations", "x", "error")
+
+    def __init__(self, tolerances):
+        if not len(tolerances):
+            raise ValueError("The ladder needs at least one tolerance.")
+        self.tolerances = sorted(set(tolerances), reverse=True)
+        self._met = []
+
+    @property
+    def tightest(self):
+        return self.tolerances[-1]
+
+    def record(self, n_iter, x, error, n_evaluations):
+        # One iterate may meet several tolerances at once.
+        while (
+            len(self._met) < len(self.tolerances)
+            and error <= self.tolerances[len(self._met)]
+        ):
+            self._met.append(
+                (self.tolerances[len(self._met)], n_iter, n_evaluations, x, error)
+            )
+
+    def as_dataframe(self):
+        unmet = [
+            (tol, None, None, None, None) for tol in self.tolerances[len(self._met) :]
+        ]
+        return pd.DataFrame(self._met + unmet, columns=self.columns)
+
+
+class TraceMode(Enum):
+    FULL = 0
+    NONE = 1
+    LAST_K = 2
+    EVERY_M = 3
+
+
+def parse_trace(trace):
+    """
+    Parse a trace option into a (TraceMode, size) pair.
+
+    Accepted values are "full", "none", "last-k" and "every-m", where k and m
+    are positive integers (e.g. "last-10" or "every-50").
+    """
+    match trace.split("-"):
+        case ["full"]:
+            return TraceMode.FULL, None
+        case ["none"]:
+            return TraceMode.NONE, None
+        case ["last", k] if k.isdigit() and int(k) > 0:
+            return TraceMode.LAST_K, int(k)
+        case ["every", m] if m.isdigit() and int(m) > 0:
+            return TraceMode.EVERY_M, int(m)
+        case _:
+            raise ValueError("Not a valid trace mode.")
+
+
 class Table:
-    x: list[int] = field(default_factory=list)
-    f_x: list[float] = field(default_factory=list)
-    error: list[float] = field(default_factory=list)
+    """
+    Iteration history stored column-wise in a preallocated NumPy array.
+
+    The store doubles its capacity when full, so adding a row is amortised
+    O(1). The `trace` option limits what is kept: "full" keeps every row,
+    "last-k" the last k rows, "every-m" every m-th row, and "none" only the
+    last row. The last row is always kept, so callers can read the final
+    iterate from any trace.
+
+    Without a `dtype`, the store is float when the first row holds plain
+    numbers, and object otherwise, so that e.g. mpmath numbers keep their
+    precision.
+    """
+
+    def __init__(self, columns=("x", "f_x", "error"), trace="full", dtype=None):
+        self.columns = tuple(columns)
+        self.mode, self.size = parse_trace(trace)
+        self.dtype = dtype
+        self.n_rows = 0  # Rows added, whether kept or not.
+
+        match self.mode:
+            case TraceMode.LAST_K:
+                capacity = self.size
+            case TraceMode.NONE:
+                capacity = 1
+            case _:
+                capacity = 64
+        self._data = None  # Allocated on the first row, once the dtype is known.
+        self._index = np.empty(capacity, dtype=int)
+        self._stored = 0
+        self._last = None
+
+    def _allocate(self, row):
+        if self.dtype is None:
+            plain = all(isinstance(value, (int, float, np.number)) for value in row)
+            self.dtype = float if plain else object
+        self._data = np.empty((len(self._index), len(self.columns)), dtype=self.dtype)
+
+    def __len__(self):
+        return self.n_rows
 
-    def add_row(self, x, f_x, error):
-        self.x.append(x)
-        self.f_x.append(f_x)
-        self.error.append(error)
+    def add_row(self, *values):
+        row = [np.nan if value is None else value for value in values]
+        if self._data is None:
+            self._allocate(row)
+        i = self.n_rows
+        self.n_rows += 1
+
+        match self.mode:
+            case TraceMode.LAST_K | TraceMode.NONE:
+                position = i % len(self._index)
+                self._stored = min(self._stored + 1, len(self._index))
+            case TraceMode.EVERY_M if i % self.size != 0:
+                self._last = (i, row)
+                return
+            case _:
+                if self._stored == len(self._index):
+                    self._grow()
+                position = self._stored
+                self._stored += 1
+
+        self._data[position] = row
+        self._index[position] = i
+        self._last = None
+
+    def _grow(self):
+        capacity = 2 * len(self._index)
+        data = np.empty((capacity, len(self.columns)), dtype=self.dtype)
+        data[: self._stored] = self._data[: self._stored]
+        index = np.empty(capacity, dtype=int)
+        index[: self._stored] = self._index[: self._stored]
+        self._data, self._index = data, index
 
     def as_dataframe(self):
-        return pd.DataFrame.from_dict(asdict(self))
+        if self._data is None:
+            self._allocate([])
+        data = self._data[: self._stored]
+        index = self._index[: self._stored]
+
+        if self.mode in (TraceMode.LAST_K, TraceMode.NONE):
+            order = np.argsort(index)
+            data, index = data[order], index[order]
+        elif self._last is not None:
+            last_index, last_row = self._last
+            data = np.vstack([data, np.asarray([last_row], dtype=self.dtype)])
+            index = np.append(index, last_index)
+
+        if self.mode == TraceMode.FULL:
+            index = pd.RangeIndex(self._stored)
+        return pd.DataFrame(data, columns=self.columns, index=index)
+
+
+@dataclass
+class SolverState:
+    """
+    Where a scalar solver stopped, so that a later call can go on from there.
+
+    `iterates` holds what the method needs for its next step (the last
+    iterates and their function values) and `table` the history so far.
+    Resuming with a tolerance no looser and an iteration limit no lower
+    than those of the run that made the state gives the same result as a
+    fresh run, at the cost of the extra iterations only.
+    """
+
+    method: str
+    tolerance_type: str
+    tol: float
+    iterates: tuple
+    error: Any
+    n_iter: int
+    n_evaluations: int
+    table: Table
+
+    def can_resume(self, tol, niter) -> bool:
+        return tol <= self.tol and niter >= self.n_iter
+
+    def resume(self, method, tolerance_type) -> Table:
+        """Check that the state fits the run and return a copy of its table."""
+        if (method, tolerance_type) != (self.method, self.tolerance_type):
+            raise ValueError("The state comes from another method or tolerance type.")
+        return copy.deepcopy(self.table)
 
 
 def determine_error_type(tolerance_type):
@@ -80,3 +346,22 @@ def calculate_error(x, x_prev, error_type):
             return error / abs(x)
         case _:
             raise ValueError("Not a valid error type.")
+
+
+def calculate_error_array(x, x_prev, error_type):
+    """Vectorized counterpart of `calculate_error` for NumPy arrays."""
+    error = np.abs(x - x_prev)
+    match error_type:
+        case ErrorType.ABSOLUTE:
+            return error
+        case ErrorType.RELATIVE:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return error / np.abs(x)
+        case _:
+            raise ValueError("Not a valid error type.")
+
+
+def evaluate_array(function, x):
+    """Evaluate a lambdified function on an array, always returning x's shape."""
+    # Constant expressions lambdify to scalars; give them the input's shape.
+    return np.broadcast_to(np.asarray(function(x), dtype=float), x.shape).copy()
@@ -2,19 +2,55 @@
 import streamlit as st
 import sympy as sp
 
-from utils.general import nm_lambdify
-from utils.interface_blocks import calculate_tolerance, graph, ui_input_function
-
-from .common import Result, Table, calculate_error, determine_error_type
+from utils.general import nm_lambdify, nm_sympify
+from utils.interface_blocks import (
+    calculate_tolerance,
+    graph,
+    ui_input_function,
+    ui_precision,
+)
+
+from .common import Evaluator, Result, Table, calculate_error, determine_error_type
+from .ladder import show_tolerance_ladder
+from .polynomial import show_polynomial_roots
+from .precision import format_value, precise_solve
 from .report import generate_report
 
-
-def false_position(a, b, niter, tol, tolerance_type, function) -> Result:
+VARIANTS = ("Plain", "Illinois", "Pegasus", "Anderson–Björck")
+
+
+def false_position(
+    a,
+    b,
+    niter,
+    tol,
+    tolerance_type,
+    function,
+    trace="full",
+    variant="Plain",
+    ladder=None,
+) -> Result:
+    """
+    False position (regula falsi).
+
+    `variant` selects one of `VARIANTS`:
+
+    - "Plain": the method as is. On a convex or concave function one
+      endpoint never moves and convergence is only linear.
+    - "Illinois", "Pegasus", "Anderson–Björck": when the same endpoint is
+      kept twice in a row, its function value is scaled down (by 1/2, by
+      f_1 / (f_1 + f_2), or by 1 - f_2 / f_1, falling back to 1/2), which
+      pulls the next intersection towards it. The root stays bracketed and
+      convergence becomes superlinear.
+    """
+    if variant not in VARIANTS:
+        raise ValueError("Not a valid false position variant.")
     result = Result()
     error_type = determine_error_type(tolerance_type)
-    table = Table()
+    table = Table(trace=trace)
     error = 100  # Arbitrary value!
     iteration_counter = 0
+    function = Evaluator(function)
 
     # Calculate initial function values
     f_a = function(a)
@@ -26,6 +62,7 @@ def false_position(a, b, niter, tol, tolerance_type, function) -> Result:
             + " "
             + "The function does not change sign in the interval."
         )
+        result.n_evaluations = function.count
         return result
 
     table.add_row(a, f_a, error)
@@ -36,15 +73,22 @@ def false_position(a, b, niter, tol, tolerance_type, function) -> Result:
     # Store initial iteration
     table.add_row(x_intersect, f_x, error)
     iteration_counter += 1
+    kept = None  # Endpoint kept by the last step, "a" or "b".
 
     # Iterate
     while error > tol != 0 and iteration_counter < niter:
         if f_a * f_x < 0:
+            if kept == "a" and variant != "Plain":
+                f_a *= _scale(variant, f_b, f_x)
             b = x_intersect
             f_b = f_x
+            kept = "a"
         else:
+            if kept == "b" and variant != "Plain":
+                f_b *= _scale(variant, f_a, f_x)
             a = x_intersect
             f_a = f_x
+            kept = "b"
 
         old_intersect = x_intersect
 
@@ -54,8 +98,11 @@ def false_position(a, b, niter, tol, tolerance_type, function) -> Result:
         error = calculate_error(x_intersect, old_intersect, error_type)
         iteration_counter += 1
         table.add_row(x_intersect, f_x, error)
+        if ladder is not None:
+            ladder.record(iteration_counter, x_intersect, error, function.count)
 
     df = table.as_dataframe()
+    result.n_evaluations = function.count
     if f_x == 0 or error < tol:
         result.set_success_status()
         result.table = df
@@ -66,6 +113,19 @@ def false_position(a, b, niter, tol, tolerance_type, function) -> Result:
     return result
 
 
+def _scale(variant, f_previous, f_x):
+    # Factor for the value at the kept endpoint, given the values at the
+    # previous and the new intersection, which lie on the same side.
+    match variant:
+        case "Illinois":
+            return 0.5
+        case "Pegasus":
+            return f_previous / (f_previous + f_x)
+        case "Anderson–Björck":
+            m = 1 - f_x / f_previous
+            return m if m > 0 else 0.5
+
+
 def show_false_position():
     st.header("False Position Method")
     try:
@@ -87,34 +147,55 @@ def show_false_position():
                 step=0.0001,
             )
 
+        variant = st.radio(
+            "Variant",
+            VARIANTS,
+            horizontal=True,
+            help="Illinois, Pegasus and Anderson–Björck scale down the function value at an endpoint that stays fixed, so it stops holding convergence back to a linear rate.",
+        )
+
         tol, niter, tolerance_type = calculate_tolerance()
         st.markdown(f"**Calculated Tolerance:** {tol:.10f}")
+        precise = ui_precision()
 
         x = sp.symbols("x")
-        function_sp = sp.sympify(function_input)
-        first_derivative = sp.diff(function_sp, x)
-        second_derivative = sp.diff(first_derivative, x)
+        function_sp = nm_sympify(function_input)
 
         lambda_function = nm_lambdify(function_sp, x)
 
-        result = false_position(a, b, niter, tol, tolerance_type, lambda_function)
+        if precise:
+            result = precise_solve(
+                "false_position",
+                function_sp,
+                x,
+                tol,
+                tolerance_type,
+                niter,
+                a=a,
+                b=b,
+                variant=variant,
+            )
+        else:
+            result = false_position(
+                a, b, niter, tol, tolerance_type, lambda_function, variant=variant
+            )
 
         if result.has_failed():
             st.error(result.error_message)
             return
 
-        result_display = result.table.style.format("{:.15e}")
+        result_display = result.table.map(format_value)
 
         st.divider()
 
         st.header("Result")
-        mid = result.table.iloc[-1]["x"]
-        if lambda_function(mid) < 0 + tol:
+        mid, f_x = result.table.iloc[-1][["x", "f_x"]]
+        if f_x < 0 + tol:
             st.success(":material/check: Root found.")
 
             col1, col2 = st.columns(2)
-            col1.metric("$x$", f"{mid:.10e}")
-            col2.metric("$f(x)$", f"{lambda_function(mid):.10e}")
+            col1.metric("$x$", format_value(mid, 10))
+            col2.metric("$f(x)$", format_value(f_x, 10))
 
             st.subheader("Table")
             st.table(result_display)
@@ -129,15 +210,24 @@ def show_false_position():
 
         st.divider()
 
-        generate_report(
-            niter,
-            lambda_function,
-            tol,
+        show_tolerance_ladder(
+            lambda tol, ladder: false_position(
+                a,
+                b,
+                niter,
+                tol,
+                tolerance_type,
+                lambda_function,
+                trace="none",
+                variant=variant,
+                ladder=ladder,
+            ),
             tolerance_type,
-            x,
-            first_derivative,
-            second_derivative,
         )
+
+        show_polynomial_roots(function_sp, x, niter, tol, tolerance_type)
+
+        generate_report(niter, function_sp, tol, tolerance_type, x)
     except Exception as ep:
         st.error("Error: Check inputs")
         print(ep)
@@ -1,29 +1,113 @@
+import time
+from dataclasses import dataclass, field
+
 import numpy as np
 import pandas as pd
 import streamlit as st
 import sympy as sp
 
-from utils.general import nm_lambdify
-from utils.interface_blocks import calculate_tolerance, graph, ui_input_function
-
-from .common import Result, Table, calculate_error, determine_error_type
+from utils.general import nm_diff, nm_lambdify, nm_sympify
+from utils.interface_blocks import (
+    calculate_tolerance,
+    graph,
+    run_resumable,
+    ui_input_function,
+    ui_precision,
+)
+
+from .bisection import bisection_batch
+from .common import (
+    ErrorType,
+    Evaluator,
+    MethodTimeout,
+    Result,
+    SolverState,
+    Table,
+    calculate_error,
+    count_evaluations,
+    determine_error_type,
+    evaluate_array,
+)
+from .ladder import show_tolerance_ladder
+from .precision import format_value, precise_solve
 from .report import generate_report
 
+ACCELERATIONS = ("Plain", "Aitken Δ²", "Steffensen")
+
+EPS = np.finfo(float).eps
+
+# Grid size and wall-clock budget of the up-front validation.
+VALIDATION_SAMPLES = 1000
+VALIDATION_TIME_BUDGET = 1.0
+
 
 def fixed_point(
-    x_0, tolerance, type_of_tolerance, niter, f_function, g_function
+    x_0,
+    tolerance,
+    type_of_tolerance,
+    niter,
+    f_function,
+    g_function,
+    trace="full",
+    acceleration="Plain",
+    ladder=None,
+    state=None,
 ) -> Result:
+    """
+    Fixed-point iteration x_{n+1} = g(x_n).
+
+    `acceleration` selects one of `ACCELERATIONS`:
+
+    - "Plain": the iteration as is; linear convergence.
+    - "Aitken Δ²": Aitken's Δ² process applied to the plain iterates. The
+      plain sequence is not changed, only extrapolated.
+    - "Steffensen": restart the iteration from each Aitken extrapolation,
+      which converges quadratically for a simple fixed point.
+
+    With acceleration, the table has an extra column "x_raw" with the plain
+    iterate next to the accelerated one in "x".
+
+    With a `state` from an earlier result, the iteration goes on from where
+    that run stopped instead of from x_0; see `SolverState`.
+    """
+    if acceleration not in ACCELERATIONS:
+        raise ValueError("Not a valid acceleration.")
+    if acceleration != "Plain":
+        return _accelerated_fixed_point(
+            x_0,
+            tolerance,
+            type_of_tolerance,
+            niter,
+            f_function,
+            g_function,
+            trace,
+            acceleration,
+            ladder,
+            state,
+        )
+
     result = Result()
-    table = Table()
     error_type = determine_error_type(type_of_tolerance)
+    f_function = Evaluator(f_function)
+    g_function = Evaluator(g_function)
 
-    # First iteration
-    x = x_prev = x_0
-    f_x = f_function(x)
-    i = 0
-    error = 100  # Arbitrary initial error
+    if state is None:
+        table = Table(trace=trace)
+        spent = 0
 
-    table.add_row(x, f_x, error)
+        # First iteration
+        x = x_prev = x_0
+        f_x = f_function(x)
+        i = 0
+        error = 100  # Arbitrary initial error
+
+        table.add_row(x, f_x, error)
+    else:
+        table = state.resume("fixed_point", type_of_tolerance)
+        spent = state.n_evaluations
+        x_prev, f_x = state.iterates
+        f_function.remember(x_prev, f_x)
+        error, i = state.error, state.n_iter
 
     while error > tolerance and f_x != 0 and i < niter:
         x = g_function(x_prev)
@@ -33,9 +117,27 @@ def fixed_point(
         error = calculate_error(x, x_prev, error_type)
         x_prev = x
         table.add_row(x, f_x, error)
+        if ladder is not None:
+            ladder.record(
+                i,
+                x,
+                0 if f_x == 0 else error,
+                spent + count_evaluations(f_function, g_function),
+            )
 
     df = table.as_dataframe()
     result.table = df
+    result.n_evaluations = spent + count_evaluations(f_function, g_function)
+    result.state = SolverState(
+        "fixed_point",
+        type_of_tolerance,
+        tolerance,
+        (x_prev, f_x),
+        error,
+        i,
+        result.n_evaluations,
+        table,
+    )
     if f_x == 0 or error < tolerance:
         result.set_success_status()
         return result
@@ -43,37 +145,252 @@ def fixed_point(
     return result
 
 
-def validate_fixed_point_function(x_symbol, f_function, g_function):
-    """
-    Validate fixed-point iteration requirements.
+def _accelerated_fixed_point(
+    x_0,
+    tolerance,
+    type_of_tolerance,
+    niter,
+    f_function,
+    g_function,
+    trace,
+    acceleration,
+    ladder=None,
+    state=None,
+) -> Result:
+    result = Result()
+    error_type = determine_error_type(type_of_tolerance)
+    f_function = Evaluator(f_function)
+    g_function = Evaluator(g_function)
+    method = f"fixed_point ({acceleration})"
 
-    Args:
-        x_symbol (sympy.Symbol): Variable symbol
-        f_function (sympy.Expr): Original function f(x)
-        g_function (sympy.Expr): Transformed function g(x)
+    if state is None:
+        table = Table(columns=("x_raw", "x", "f_x", "error"), trace=trace)
+        spent = 0
 
-    Returns:
-        bool: True if validation passes, False otherwise
+        x = x_prev = x_0
+        f_x = f_function(x)
+        i = 0
+        error = 100  # Arbitrary initial error
+
+        table.add_row(x, x, f_x, error)
+
+        # Last three plain iterates, for Aitken's Δ² process.
+        raw = [x_0]
+    else:
+        table = state.resume(method, type_of_tolerance)
+        spent = state.n_evaluations
+        x_prev, f_x, raw = state.iterates
+        f_function.remember(x_prev, f_x)
+        raw = list(raw)
+        error, i = state.error, state.n_iter
+
+    while error > tolerance and f_x != 0 and i < niter:
+        match acceleration:
+            case "Aitken Δ²":
+                raw = raw[-2:] + [g_function(raw[-1])]
+                x_raw = raw[-1]
+                x = _aitken(*raw) if len(raw) == 3 else x_raw
+            case "Steffensen":
+                y_1 = g_function(x_prev)
+                x_raw = g_function(y_1)
+                x = _aitken(x_prev, y_1, x_raw)
+        f_x = f_function(x)
+
+        i += 1
+        error = calculate_error(x, x_prev, error_type)
+        x_prev = x
+        table.add_row(x_raw, x, f_x, error)
+        if ladder is not None:
+            ladder.record(
+                i,
+                x,
+                0 if f_x == 0 else error,
+                spent + count_evaluations(f_function, g_function),
+            )
+
+    df = table.as_dataframe()
+    result.table = df
+    result.n_evaluations = spent + count_evaluations(f_function, g_function)
+    result.state = SolverState(
+        method,
+        type_of_tolerance,
+        tolerance,
+        (x_prev, f_x, tuple(raw)),
+        error,
+        i,
+        result.n_evaluations,
+        table,
+    )
+    if f_x == 0 or error < tolerance:
+        result.set_success_status()
+        return result
+    result.error_message = "**Error**: Took too many iterations."
+    return result
+
+
+def _aitken(x_0, x_1, x_2):
+    denominator = x_2 - 2 * x_1 + x_0
+    if denominator == 0:
+        # The plain iterates are already in arithmetic progression (usually
+        # converged); there is nothing left to extrapolate.
+        return x_2
+    return x_0 - (x_1 - x_0) ** 2 / denominator
+
+
+@dataclass
+class FixedPointValidation:
+    """
+    Numeric check of a fixed-point problem on an interval.
+
+    `roots` has one row per root of f found in the interval, with the
+    residual |g(x) - x|, whether that residual is small enough for g(x) = x
+    to hold there, the local factor |g'(x)| and the number of iterations
+    expected from x_0 if that root attracts the iteration.
+    `contraction` is the largest |g'| on the interval: below 1, g is a
+    contraction there.
     """
-    try:
-        roots = sp.solve(f_function, x_symbol)
-        if not roots:
-            return False
 
-        g_derivative = sp.diff(g_function, x_symbol)
-        for root in roots:
-            if not sp.simplify(g_function.subs(x_symbol, root) - root).is_zero:
-                st.error(f"g(x) ≠ x at x = {root} where f(x) = 0.")
-                return False
+    roots: pd.DataFrame = field(
+        default_factory=lambda: pd.DataFrame(
+            columns=["x", "|g(x) - x|", "g(x) = x", "|g'(x)|", "expected iterations"]
+        )
+    )
+    contraction: float = np.nan
+    maps_into: bool = False
+    timed_out: bool = False
+
+
+def validate_fixed_point_function(
+    f_function,
+    g_function,
+    a,
+    b,
+    x_0,
+    tolerance,
+    type_of_tolerance,
+    niter,
+    n_samples=VALIDATION_SAMPLES,
+    time_budget=VALIDATION_TIME_BUDGET,
+) -> FixedPointValidation:
+    """
+    Check the fixed-point requirements numerically on [a, b].
 
-            derivative_value = g_derivative.subs(x_symbol, root)
-            if abs(derivative_value) >= 1:
-                st.warning(f"|g'(x)| ≥ 1 at x = {root}. Convergence not guaranteed.")
+    f and g are sampled on a grid in one vectorized call each. Roots of f
+    are located by batch bisection on the sign changes, and |g'| comes from
+    finite differences, so nothing is solved or simplified symbolically and
+    the cost is bounded. The check stops after `time_budget` seconds and
+    returns what it has found so far, with `timed_out` set.
+    """
+    validation = FixedPointValidation()
+    deadline = time.perf_counter() + time_budget
+    f = Evaluator(f_function, deadline=deadline)
+    g = Evaluator(g_function, deadline=deadline)
+    error_type = determine_error_type(type_of_tolerance)
 
-        return True
-    except:
-        st.error("Validation failed. Invalid input functions.")
-        return False
+    try:
+        x = np.linspace(a, b, n_samples + 1)
+        with np.errstate(all="ignore"):
+            f_x = evaluate_array(f, x)
+            g_x = evaluate_array(g, x)
+            slope = np.abs(np.diff(g_x) / np.diff(x))
+
+        finite = np.isfinite(g_x)
+        validation.maps_into = bool(finite.all() and g_x.min() >= a and g_x.max() <= b)
+        if np.isfinite(slope).any():
+            validation.contraction = float(np.nanmax(slope[np.isfinite(slope)]))
+
+        change = np.flatnonzero(f_x[:-1] * f_x[1:] < 0)
+        with np.errstate(all="ignore"):
+            batch = bisection_batch(
+                x[change], x[change + 1], niter, tolerance, type_of_tolerance, f
+            )
+        converged = batch.converged()
+        roots = np.concatenate([x[f_x == 0], batch.x_sol[converged]])
+        # How far each root may be from the true one: grid points where f is
+        # exactly 0 are roots, and bisection leaves its root within the
+        # half-width of its last bracket, which is its last error.
+        distance = batch.err[converged]
+        if error_type == ErrorType.RELATIVE:
+            distance = distance * np.abs(batch.x_sol[converged])
+        distance = np.concatenate([np.zeros(np.count_nonzero(f_x == 0)), distance])
+        order = np.argsort(roots)
+        roots, distance = roots[order], distance[order]
+
+        with np.errstate(all="ignore"):
+            residual = np.abs(evaluate_array(g, roots) - roots)
+            h = np.sqrt(EPS) * np.maximum(1.0, np.abs(roots))
+            factor = np.abs(
+                (evaluate_array(g, roots + h) - evaluate_array(g, roots - h)) / (2 * h)
+            )
+            g_0 = g(x_0)
+    except MethodTimeout:
+        validation.timed_out = True
+        return validation
+
+    # With relative errors the tolerance scales with the root.
+    target = tolerance * (np.abs(roots) if error_type == ErrorType.RELATIVE else 1)
+    validation.roots = pd.DataFrame(
+        {
+            "x": roots,
+            "|g(x) - x|": residual,
+            # Off the true root by `distance`, g(x) - x can be up to
+            # (1 + |g'|) times that, plus rounding.
+            "g(x) = x": residual
+            <= 2 * (1 + factor) * distance
+            + np.sqrt(EPS) * np.maximum(1.0, np.abs(roots)),
+            "|g'(x)|": factor,
+            "expected iterations": _expected_iterations(
+                np.abs(x_0 - roots), np.abs(g_0 - roots), factor, target
+            ),
+        }
+    )
+    return validation
+
+
+def _expected_iterations(distance, next_distance, factor, target):
+    # Near a fixed point the error shrinks by |g'| per step, so reaching the
+    # target from `distance` takes log(target / distance) / log(rate) steps.
+    # The first step from x_0 may shrink it less than that (and |g'| = 0
+    # says nothing about the rate), so the slower of the two is used; the
+    # estimate errs on the high side.
+    with np.errstate(all="ignore"):
+        rate = np.maximum(factor, next_distance / distance)
+        n = np.ceil(np.log(target / distance) / np.log(rate))
+    n = np.where(rate < 1, np.maximum(n, 1), np.nan)
+    return np.where(distance <= target, 0, n)
+
+
+def show_validation(validation, time_budget):
+    """Report the outcome of `validate_fixed_point_function` on the page."""
+    st.subheader("Validation")
+    if validation.timed_out:
+        st.warning(
+            f"Validation stopped after {time_budget:g} s; the functions are too slow to check on this interval."
+        )
+        return
+
+    roots = validation.roots
+    if roots.empty:
+        st.warning("f(x) has no roots in the validation interval.")
+    for _, row in roots.iterrows():
+        root = row["x"]
+        if not row["g(x) = x"]:
+            st.error(f"g(x) ≠ x at x = {root:.10g} where f(x) = 0.")
+        elif not row["|g'(x)|"] < 1:
+            st.warning(f"|g'(x)| ≥ 1 at x = {root:.10g}. Convergence not guaranteed.")
+
+    col1, col2 = st.columns(2)
+    col1.metric("Contraction factor on the interval", f"{validation.contraction:.4g}")
+    col2.metric(
+        "g maps the interval into itself", "Yes" if validation.maps_into else "No"
+    )
+    if validation.contraction < 1 and validation.maps_into:
+        st.success(
+            ":material/check: g is a contraction of the interval, so the iteration converges from any $x_0$ in it."
+        )
+
+    if not roots.empty:
+        st.dataframe(roots, use_container_width=True)
 
 
 def show_fixed_point():
@@ -97,7 +414,7 @@ def show_fixed_point():
         # Input for transformed function g(x)
         g_input = st.text_input(
             "Transformation $g(x)$",
-            value="2/x",
+            value="(x + 4/x)/2",
             help="Enter $g(x)$ such that $g(x) = x$ at the root of $f(x)$.",
         )
 
@@ -110,21 +427,40 @@ def show_fixed_point():
         help="Provide the initial guess for the root.",
     )
 
+    acceleration = st.radio(
+        "Acceleration",
+        ACCELERATIONS,
+        horizontal=True,
+        help="Aitken's Δ² process extrapolates the plain iterates; Steffensen's method restarts the iteration from each extrapolation and converges quadratically.",
+    )
+
+    col4, col5 = st.columns(2)
+    with col4:
+        validation_a = st.number_input(
+            "Start of validation interval",
+            format="%.4f",
+            value=1.0,
+            step=0.0001,
+            help="The requirements of the method are checked numerically on this interval.",
+        )
+    with col5:
+        validation_b = st.number_input(
+            "End of validation interval",
+            format="%.4f",
+            value=3.0,
+            step=0.0001,
+        )
+
     # Tolerance and iteration settings
     tol, niter, tolerance_type = calculate_tolerance()
     st.markdown(f"**Calculated Tolerance:** {tol:.10f}")
+    precise = ui_precision()
 
     # Parse functions and variable
     x_symbol = sp.symbols(f"{x}")
 
-    f_function = sp.sympify(f_input)
-    first_derivative = sp.diff(f_function, x)
-    second_derivative = sp.diff(first_derivative, x)
-    g_function = sp.sympify(g_input)
-
-    # Validate the functions
-    # if not validate_fixed_point_function(x_symbol, f_function, g_function):
-    #     return
+    f_function = nm_sympify(f_input)
+    g_function = nm_sympify(g_input)
 
     # Display the functions in LaTeX
     st.subheader("Functions")
@@ -132,7 +468,7 @@ def show_fixed_point():
     st.latex(f"g({x_symbol}) = {sp.latex(g_function)}")
 
     # Check convergence condition
-    g_first_derivative = sp.diff(g_function, x_symbol)
+    g_first_derivative = nm_diff(g_function, x_symbol)
     st.subheader("Derivative of $g(x)$")
     st.latex(g_first_derivative)
 
@@ -140,23 +476,59 @@ def show_fixed_point():
     g = nm_lambdify(g_function, x_symbol)
     f = nm_lambdify(f_function, x_symbol)
 
-    result = fixed_point(x0, tol, tolerance_type, niter, f, g)
+    if validation_b <= validation_a:
+        st.error("The validation interval must have its start before its end.")
+    else:
+        validation = validate_fixed_point_function(
+            f, g, validation_a, validation_b, x0, tol, tolerance_type, niter
+        )
+        show_validation(validation, VALIDATION_TIME_BUDGET)
+
+    if precise:
+        result = precise_solve(
+            "fixed_point",
+            f_function,
+            x_symbol,
+            tol,
+            tolerance_type,
+            niter,
+            x_0=x0,
+            g=g_function,
+            acceleration=acceleration,
+        )
+    else:
+        # Tightening the tolerance or raising niter resumes the last run.
+        result = run_resumable(
+            ("fixed_point", f_input, g_input, x, x0, acceleration, tolerance_type),
+            lambda state: fixed_point(
+                x0,
+                tol,
+                tolerance_type,
+                niter,
+                f,
+                g,
+                acceleration=acceleration,
+                state=state,
+            ),
+            tol,
+            niter,
+        )
     st.subheader("Results")
     if result.has_failed():
         st.error(result.error_message)
 
-    result_display = result.table.style.format("{:.15e}")
+    result_display = result.table.map(format_value)
 
     st.divider()
 
     st.header("Result")
     if not result.has_failed():
-        last_x = result.table.iloc[-1]["x"]
+        last_x, f_x = result.table.iloc[-1][["x", "f_x"]]
         st.success(":material/check: Root found.")
 
         col1, col2 = st.columns(2)
-        col1.metric("$x$", f"{last_x:.10e}")
-        col2.metric("$f(x)$", f"{f(last_x):.10e}")
+        col1.metric("$x$", format_value(last_x, 10))
+        col2.metric("$f(x)$", format_value(f_x, 10))
 
     st.subheader("Table")
     st.table(result_display)
@@ -167,12 +539,19 @@ def show_fixed_point():
 
     st.divider()
 
-    generate_report(
-        niter,
-        f,
-        tol,
+    show_tolerance_ladder(
+        lambda tol, ladder: fixed_point(
+            x0,
+            tol,
+            tolerance_type,
+            niter,
+            f,
+            g,
+            trace="none",
+            acceleration=acceleration,
+            ladder=ladder,
+        ),
         tolerance_type,
-        x,
-        first_derivative,
-        second_derivative,
     )
+
+    generate_report(niter, f_function, tol, tolerance_type, x_symbol)
@@ -0,0 +1,197 @@
+import math
+
+import streamlit as st
+import sympy as sp
+
+from utils.general import nm_lambdify_derivatives, nm_sympify
+from utils.interface_blocks import (
+    calculate_tolerance,
+    graph,
+    ui_differentiation,
+    ui_input_function,
+)
+
+from .common import Evaluator, Result, Table, calculate_error, determine_error_type
+from .ladder import show_tolerance_ladder
+from .polynomial import show_polynomial_roots
+from .precision import format_value
+from .report import generate_report
+
+# Orders offered on the page; order d needs derivatives up to f^(d).
+MAX_ORDER = 6
+
+
+def householder(
+    x_0, niter, tol, tolerance_type, derivatives, order=2, trace="full", ladder=None
+) -> Result:
+    """
+    Householder's method of order `order`.
+
+    x_{n+1} = x_n + d (1/f)^(d-1)(x_n) / (1/f)^(d)(x_n), which converges
+    with order d + 1 to a simple root. Order 1 is Newton's method and
+    order 2 Halley's. `derivatives` maps x to [f(x), f'(x), ..., f^(d)(x)],
+    as built by `nm_lambdify_derivatives`, so every step costs one call.
+
+    The "order" column holds the observed order of convergence,
+    log(e_{n+1} / e_n) / log(e_n / e_{n-1}), from the last three errors.
+    """
+    if order < 1:
+        raise ValueError("The order must be at least 1.")
+    result = Result()
+    table = Table(columns=("x", "f_x", "error", "order"), trace=trace)
+    error_type = determine_error_type(tolerance_type)
+    derivatives = Evaluator(derivatives)
+
+    x = x_0
+    values = derivatives(x)
+    table.add_row(x, values[0], None, None)
+
+    errors = []
+    error = 100
+    iterations = 0
+    while iterations < niter and error > tol and values[0] != 0:
+        step = _householder_step(values, order)
+        if step is None:
+            result.error_message = "**Error:** Division by zero."
+            result.n_evaluations = derivatives.count
+            result.table = table.as_dataframe()
+            return result
+
+        iterations += 1
+        x_prev = x
+        x = x + step
+        values = derivatives(x)
+
+        error = calculate_error(x, x_prev, error_type)
+        errors.append(error)
+        table.add_row(x, values[0], error, _observed_order(errors[-3:]))
+        if ladder is not None:
+            error_met = 0 if values[0] == 0 else error
+            ladder.record(iterations, x, error_met, derivatives.count)
+
+    result.table = table.as_dataframe()
+    result.n_evaluations = derivatives.count
+    if values[0] == 0 or error < tol:
+        result.set_success_status()
+        return result
+    result.error_message = "**Error:** Took too many iterations."
+    return result
+
+
+def halley(x_0, niter, tol, tolerance_type, derivatives, trace="full") -> Result:
+    """Halley's method: Householder's method of order 2, with cubic convergence."""
+    return householder(x_0, niter, tol, tolerance_type, derivatives, 2, trace)
+
+
+def _householder_step(values, order):
+    """
+    Return d (1/f)^(d-1) / (1/f)^(d) from f and its derivatives, or None
+    when it divides by zero.
+
+    The derivatives of g = 1/f follow from differentiating f g = 1:
+    g^(n) = -(1/f) sum_{k=1}^{n} C(n, k) f^(k) g^(n-k).
+    """
+    f = values[0]
+    g = [1 / f]
+    for n in range(1, order + 1):
+        g.append(
+            -sum(math.comb(n, k) * values[k] * g[n - k] for k in range(1, n + 1)) / f
+        )
+    if g[order] == 0:
+        return None
+    return order * g[order - 1] / g[order]
+
+
+def _observed_order(errors):
+    if len(errors) < 3:
+        return None
+    e_0, e_1, e_2 = errors
+    try:
+        return math.log(e_2 / e_1) / math.log(e_1 / e_0)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def show_householder():
+    st.header("Halley and Householder Methods")
+
+    function_input = ui_input_function()
+
+    col1, col2 = st.columns(2)
+    x_0 = col1.number_input(
+        "Initial Point ($x_0$)",
+        format="%.4f",
+        value=1.0,
+        step=0.0001,
+        help="Initial guess for the root.",
+    )
+    order = col2.number_input(
+        "Order $d$",
+        value=2,
+        min_value=1,
+        max_value=MAX_ORDER,
+        step=1,
+        help="Order 1 is Newton's method and order 2 Halley's. Order $d$ converges with order $d + 1$ to a simple root, but needs the derivatives up to $f^{(d)}$.",
+    )
+
+    tol, niter, tolerance_type = calculate_tolerance()
+    st.markdown(f"**Calculated Tolerance:** {tol:.10f}")
+    differentiation = ui_differentiation()
+
+    x = sp.symbols("x")
+    function_sp = nm_sympify(function_input)
+    st.subheader("Function")
+    st.latex(f"f({x}) = {sp.latex(function_sp)}")
+
+    try:
+        derivatives = nm_lambdify_derivatives(
+            function_sp, x, orders=range(order + 1), differentiation=differentiation
+        )
+    except ValueError as e:
+        st.error(f"**Error:** {e}")
+        return
+
+    result = householder(x_0, niter, tol, tolerance_type, derivatives, order)
+
+    st.subheader("Results")
+    if result.has_failed():
+        st.error(result.error_message)
+
+    st.divider()
+
+    st.header("Result")
+    if not result.has_failed():
+        last_x, f_x = result.table.iloc[-1][["x", "f_x"]]
+        st.success(":material/check: Root found.")
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("$x$", format_value(last_x, 10))
+        col2.metric("$f(x)$", format_value(f_x, 10))
+        col3.metric("Iterations", len(result.table) - 1)
+
+    st.subheader("Table")
+    st.table(result.table.map(format_value))
+
+    st.divider()
+
+    graph(function_input)
+
+    st.divider()
+
+    show_tolerance_ladder(
+        lambda tol, ladder: householder(
+            x_0,
+            niter,
+            tol,
+            tolerance_type,
+            derivatives,
+            order,
+            trace="none",
+            ladder=ladder,
+        ),
+        tolerance_type,
+    )
+
+    show_polynomial_roots(function_sp, x, niter, tol, tolerance_type)
+
+    generate_report(niter, function_sp, tol, tolerance_type, x)
@@ -0,0 +1,118 @@
+import pandas as pd
+import plotly.graph_objs as go
+import streamlit as st
+
+from .common import ToleranceLadder
+from .precision import format_value
+
+# Accuracy levels offered by default, in correct decimals or significant figures.
+DEFAULT_LEVELS = "2, 4, 6, 8, 10, 12"
+
+
+def level_tolerance(level, tolerance_type):
+    """Tolerance for `level` correct decimals or significant figures."""
+    # Same conversion as `calculate_tolerance`.
+    match tolerance_type:
+        case "Correct Decimals":
+            return 0.5 * 10 ** (-level)
+        case "Significant Figures":
+            return 5 * 10 ** (-level)
+        case _:
+            raise ValueError("Not a valid tolerance type.")
+
+
+def tolerance_ladder(run, tolerances):
+    """
+    Cost of reaching each of `tolerances`, from a single run of a solver.
+
+    `run(tol, ladder)` must call a solver with that tolerance and ladder,
+    e.g. `lambda tol, ladder: newton(x_0, niter, tol, ..., ladder=ladder)`.
+    It is called once, with the tightest tolerance.
+
+    Returns:
+        tuple: The solver's Result, and a DataFrame with one row per
+        tolerance, loosest first: the iteration, evaluation count, iterate
+        and error at which it was first met, or missing values if the run
+        never met it.
+    """
+    ladder = ToleranceLadder(tolerances)
+    result = run(ladder.tightest, ladder)
+    return result, ladder.as_dataframe()
+
+
+def show_tolerance_ladder(run, tolerance_type):
+    """Offer the cost-versus-accuracy table of a method; see `tolerance_ladder`."""
+    with st.expander("Cost versus accuracy"):
+        unit = tolerance_type.lower()
+        levels_input = st.text_input(
+            f"Levels of {unit}",
+            value=DEFAULT_LEVELS,
+            help=f"One run of the method to the highest level records the iteration and the number of function evaluations at which each level of {unit} was first reached.",
+        )
+        try:
+            levels = sorted(
+                {int(level) for level in levels_input.replace(",", " ").split()}
+            )
+        except ValueError:
+            st.error("**Error:** The levels must be whole numbers.")
+            return
+        if not levels or levels[0] < 1:
+            st.error("**Error:** Enter at least one level, each of them at least 1.")
+            return
+        # The body of a collapsed expander still runs on every rerun, so the
+        # solve waits until it is asked for.
+        if not st.checkbox(
+            "Compute cost versus accuracy",
+            help="Runs the method once more, to the highest level.",
+        ):
+            return
+
+        # Tolerances shrink as levels grow, so rows come out in level order.
+        result, ladder = tolerance_ladder(
+            run, [level_tolerance(level, tolerance_type) for level in levels]
+        )
+        ladder.insert(0, "level", levels)
+        reached = ladder["n_iter"].notna()
+
+        st.table(
+            pd.DataFrame(
+                {
+                    tolerance_type: ladder["level"],
+                    "Tolerance": ladder["tolerance"].map(lambda tol: f"{tol:.1e}"),
+                    "Iterations": _column(ladder["n_iter"], reached, int),
+                    "Evaluations": _column(ladder["n_evaluations"], reached, int),
+                    "x": _column(ladder["x"], reached, format_value),
+                    "Error": _column(ladder["error"], reached, format_value),
+                }
+            )
+        )
+        if not reached.all():
+            message = "Levels with blank cells were not reached."
+            if result.error_message:
+                message += " " + result.error_message
+            st.info(message)
+
+        if reached.any() and st.checkbox("Plot cost versus accuracy"):
+            fig = go.Figure()
+            for column, name in (
+                ("n_evaluations", "Evaluations"),
+                ("n_iter", "Iterations"),
+            ):
+                fig.add_trace(
+                    go.Scatter(
+                        x=ladder["level"][reached],
+                        y=ladder[column][reached],
+                        mode="lines+markers",
+                        name=name,
+                    )
+                )
+            fig.update_layout(
+                xaxis_title=tolerance_type,
+                yaxis_title="Cost",
+                margin=dict(l=0, r=0, t=40, b=0),
+            )
+            st.plotly_chart(fig)
+
+
+def _column(values, reached, formatter):
+    return [formatter(value) if ok else "" for value, ok in zip(values, reached)]
@@ -3,46 +3,84 @@
 import streamlit as st
 import sympy as sp
 
-from utils.general import nm_lambdify
+from utils.general import nm_lambdify_derivatives, nm_sympify
 from utils.interface_blocks import (
     calculate_tolerance,
     graph,
     show_table,
+    ui_differentiation,
     ui_input_function,
+    ui_precision,
 )
 
-from .common import Result, Table, calculate_error, determine_error_type
+from .common import (
+    Evaluator,
+    Result,
+    Table,
+    calculate_error,
+    count_evaluations,
+    determine_error_type,
+)
+from .ladder import show_tolerance_ladder
+from .polynomial import show_polynomial_roots
+from .precision import format_value, precise_solve
 from .report import generate_report
 
 
-def multiple_roots(x_0, n_iter, tol, function, df, d2f, tolerance_type) -> Result:
+def multiple_roots(
+    x_0,
+    n_iter,
+    tol,
+    function,
+    df,
+    d2f,
+    tolerance_type,
+    derivatives=None,
+    trace="full",
+    ladder=None,
+) -> Result:
+    """
+    `derivatives`, if given, is a fused callable returning f, f' and f'' at
+    once (see `nm_lambdify_derivatives`) and replaces the three separate calls.
+    """
     result = Result()
-    table = Table()
+    table = Table(trace=trace)
     error_type = determine_error_type(tolerance_type)
 
+    if derivatives is None:
+        function, df, d2f = Evaluator(function), Evaluator(df), Evaluator(d2f)
+        evaluators = (function, df, d2f)
+        derivatives = lambda x: (function(x), df(x), d2f(x))
+    else:
+        derivatives = Evaluator(derivatives)
+        evaluators = (derivatives,)
+
     x = x_0
-    for _ in range(n_iter):
-        f_x = function(x)
-        d_f_x = df(x)
-        d2_f_x = d2f(x)
+    for iteration in range(1, n_iter + 1):
+        f_x, d_f_x, d2_f_x = derivatives(x)
 
         if d_f_x == 0:
             result.error_message = "**Error**: The first derivative is equal to 0. The method is not applicable."
+            result.n_evaluations = count_evaluations(*evaluators)
             return result
 
         x_next = x - (f_x * d_f_x) / (d_f_x**2 - f_x * d2_f_x)
 
         error = calculate_error(x_next, x, error_type)
         table.add_row(x, f_x, error)
+        if ladder is not None:
+            ladder.record(iteration, x_next, error, count_evaluations(*evaluators))
 
         x = x_next
 
         if error < tol:
             result.table = table.as_dataframe()
+            result.n_evaluations = count_evaluations(*evaluators)
             result.set_success_status()
             return result
 
     result.error_message = "**Error:** Took too many iterations."
+    result.n_evaluations = count_evaluations(*evaluators)
     return result
 
 
@@ -62,56 +100,80 @@ def show_multiple_roots():
     # Calcular tolerancia
     tol, niter, tolerance_type = calculate_tolerance()
     st.markdown(f"**Calculated Tolerance:** {tol:.10f}")
+    precise = ui_precision()
+    differentiation = ui_differentiation()
     st.subheader("Function")
-    function_sp = sp.sympify(original_function_input)
+    function_sp = nm_sympify(original_function_input)
     st.latex(f"f(x) = {sp.latex(function_sp)}")
 
     # Preparar función, derivadas y método
     x = sp.symbols("x")
-    function = nm_lambdify(function_sp, x)
-    first_derivative = sp.diff(function_sp, x)
-    second_derivative = sp.diff(first_derivative, x)
-
-    df_sp = sp.diff(function_sp, x)
-    d2f_sp = sp.diff(df_sp, x)
-
-    df = nm_lambdify(df_sp, x)
-    d2f = nm_lambdify(d2f_sp, x)
-
-    result = multiple_roots(x_0, niter, tol, function, df, d2f, tolerance_type)
+    try:
+        derivatives = nm_lambdify_derivatives(
+            function_sp, x, differentiation=differentiation
+        )
+    except ValueError as e:
+        st.error(f"**Error:** {e}")
+        return
+
+    if precise:
+        result = precise_solve(
+            "multiple_roots", function_sp, x, tol, tolerance_type, niter, x_0=x_0
+        )
+    else:
+        result = multiple_roots(
+            x_0,
+            niter,
+            tol,
+            None,
+            None,
+            None,
+            tolerance_type,
+            derivatives=derivatives,
+        )
 
     st.subheader("Results")
     if result.has_failed():
         st.error(result.error_message)
 
-    result_display = result.table.style.format("{:.15e}")
+    result_display = result.table.map(format_value)
 
     st.divider()
 
     st.header("Result")
     if not result.has_failed():
-        last_x = result.table.iloc[-1]["x"]
+        last_x, f_x = result.table.iloc[-1][["x", "f_x"]]
         st.success(":material/check: Root found.")
 
         col1, col2 = st.columns(2)
-        col1.metric("$x$", f"{last_x:.10e}")
-        col2.metric("$f(x)$", f"{function(last_x):.10e}")
+        col1.metric("$x$", format_value(last_x, 10))
+        col2.metric("$f(x)$", format_value(f_x, 10))
 
     st.subheader("Table")
     st.table(result_display)
 
     st.divider()
 
-    graph(original_function_input)
+    graph(original_function_input, derivatives=derivatives)
 
     st.divider()
 
-    generate_report(
-        niter,
-        function,
-        tol,
+    show_tolerance_ladder(
+        lambda tol, ladder: multiple_roots(
+            x_0,
+            niter,
+            tol,
+            None,
+            None,
+            None,
+            tolerance_type,
+            derivatives=derivatives,
+            trace="none",
+            ladder=ladder,
+        ),
         tolerance_type,
-        x,
-        first_derivative,
-        second_derivative,
     )
+
+    show_polynomial_roots(function_sp, x, niter, tol, tolerance_type)
+
+    generate_report(niter, function_sp, tol, tolerance_type, x)
@@ -2,45 +2,107 @@
 import streamlit as st
 import sympy as sp
 
-from utils.general import nm_lambdify
-from utils.interface_blocks import calculate_tolerance, graph, ui_input_function
-
-from .common import Result, ResultStatus, Table, calculate_error, determine_error_type
+from utils.general import nm_diff, nm_lambdify, nm_lambdify_derivatives, nm_sympify
+from utils.interface_blocks import (
+    calculate_tolerance,
+    graph,
+    run_resumable,
+    ui_differentiation,
+    ui_input_function,
+    ui_precision,
+)
+
+from .common import (
+    Evaluator,
+    Result,
+    ResultStatus,
+    SolverState,
+    Table,
+    calculate_error,
+    count_evaluations,
+    determine_error_type,
+)
+from .ladder import show_tolerance_ladder
+from .polynomial import show_polynomial_roots
+from .precision import format_value, precise_solve
 from .report import generate_report
 
 
 def get_derivative(f):
     x = sp.symbols("x")
-    f_prime = sp.diff(f, x)
+    f_prime = nm_diff(f, x)
     return f_prime
 
 
-def newton(x_0, niter, tol, tolerance_type, function, derivative) -> Result:
+def newton(
+    x_0,
+    niter,
+    tol,
+    tolerance_type,
+    function,
+    derivative,
+    trace="full",
+    ladder=None,
+    state=None,
+) -> Result:
+    """
+    With a `state` from an earlier result, the iteration goes on from where
+    that run stopped instead of from x_0; see `SolverState`.
+    """
     result = Result()
-    table = Table()
     error_type = determine_error_type(tolerance_type)
-
-    if derivative(x_0) == 0:
-        result.error_message = "Derivative cannot be 0."
-        return result
-
-    x_n = x_0 - function(x_0) / derivative(x_0)
-    x_prev = x_0
-    table.add_row(x_0, function(x_0), None)
-
-    error = 100
-    iterations = 0
+    function = Evaluator(function)
+    derivative = Evaluator(derivative)
+
+    if state is None:
+        table = Table(trace=trace)
+        spent = 0
+        d_0 = derivative(x_0)
+        if d_0 == 0:
+            result.error_message = "Derivative cannot be 0."
+            result.n_evaluations = derivative.count
+            return result
+
+        f_0 = function(x_0)
+        x_n = x_0 - f_0 / d_0
+        f_n = function(x_n)
+        table.add_row(x_0, f_0, None)
+
+        error = 100
+        iterations = 0
+    else:
+        table = state.resume("newton", tolerance_type)
+        spent = state.n_evaluations
+        x_n, f_n = state.iterates
+        function.remember(x_n, f_n)
+        error, iterations = state.error, state.n_iter
 
     while iterations < niter and error > tol:
         iterations += 1
         x_prev = x_n
-        x_n = x_n - function(x_n) / derivative(x_n)
+        x_n = x_n - f_n / derivative(x_n)
+        f_n = function(x_n)
 
         error = calculate_error(x_n, x_prev, error_type)
-        table.add_row(x_n, function(x_n), error)
+        table.add_row(x_n, f_n, error)
+        if ladder is not None:
+            ladder.record(
+                iterations, x_n, error, spent + count_evaluations(function, derivative)
+            )
 
     df = table.as_dataframe()
     result.table = df
+    result.n_evaluations = spent + count_evaluations(function, derivative)
+    result.state = SolverState(
+        "newton",
+        tolerance_type,
+        tol,
+        (x_n, f_n),
+        error,
+        iterations,
+        result.n_evaluations,
+        table,
+    )
     if error < tol:
         result.set_success_status()
         return result
@@ -67,38 +129,68 @@ def show_newton():
 
     tol, niter, tolerance_type = calculate_tolerance()
     st.markdown(f"**Calculated Tolerance:** {tol:.10f}")
+    precise = ui_precision()
+    differentiation = ui_differentiation()
 
     x = sp.symbols("x")
-    function = sp.sympify(function_input)
-    first_derivative = sp.diff(function, x)
-    second_derivative = sp.diff(first_derivative, x)
+    function_sp = nm_sympify(function_input)
 
     st.subheader("Function")
-    st.latex(f"f({x}) = {sp.latex(function)}")
-    st.subheader("Derivative")
-    st.latex(f"f({x}) = {sp.latex(first_derivative)}")
-
-    function = nm_lambdify(function, x)
-    derivative_lambda = nm_lambdify(first_derivative, x)
-
-    result = newton(x0, niter, tol, tolerance_type, function, derivative_lambda)
+    st.latex(f"f({x}) = {sp.latex(function_sp)}")
+
+    function = nm_lambdify(function_sp, x)
+    if differentiation == "symbolic":
+        first_derivative = nm_diff(function_sp, x)
+        st.subheader("Derivative")
+        st.latex(f"f({x}) = {sp.latex(first_derivative)}")
+        derivative_lambda = nm_lambdify(first_derivative, x)
+    else:
+        try:
+            ad_derivative = nm_lambdify_derivatives(
+                function_sp, x, orders=(1,), differentiation="automatic"
+            )
+        except ValueError as e:
+            st.error(f"**Error:** {e}")
+            return
+        derivative_lambda = lambda x: ad_derivative(x)[0]
+
+    if precise:
+        result = precise_solve(
+            "newton", function_sp, x, tol, tolerance_type, niter, x_0=x0
+        )
+    else:
+        # Tightening the tolerance or raising niter resumes the last run.
+        result = run_resumable(
+            ("newton", function_input, x0, differentiation, tolerance_type),
+            lambda state: newton(
+                x0,
+                niter,
+                tol,
+                tolerance_type,
+                function,
+                derivative_lambda,
+                state=state,
+            ),
+            tol,
+            niter,
+        )
 
     if result.has_failed():
         st.error(result.error_message)
         return
 
-    result_display = result.table.style.format("{:.15e}")
+    result_display = result.table.map(format_value)
 
     st.divider()
 
     st.header("Result")
-    mid = result.table.iloc[-1]["x"]
-    if function(mid) < 0 + tol:
+    mid, f_x = result.table.iloc[-1][["x", "f_x"]]
+    if f_x < 0 + tol:
         st.success(":material/check: Root found.")
 
         col1, col2 = st.columns(2)
-        col1.metric("$x$", f"{mid:.10e}")
-        col2.metric("$f(x)$", f"{function(mid):.10e}")
+        col1.metric("$x$", format_value(mid, 10))
+        col2.metric("$f(x)$", format_value(f_x, 10))
 
     else:
         st.warning(
@@ -113,12 +205,20 @@ def show_newton():
 
     st.divider()
 
-    generate_report(
-        niter,
-        function,
-        tol,
+    show_tolerance_ladder(
+        lambda tol, ladder: newton(
+            x0,
+            niter,
+            tol,
+            tolerance_type,
+            function,
+            derivative_lambda,
+            trace="none",
+            ladder=ladder,
+        ),
         tolerance_type,
-        x,
-        first_derivative,
-        second_derivative,
     )
+
+    show_polynomial_roots(function_sp, x, niter, tol, tolerance_type)
+
+    generate_report(niter, function_sp, tol, tolerance_type, x)
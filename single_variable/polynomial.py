@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.polynomial import HornerEvaluator, polynomial_form
+
+from .common import Result, calculate_error, determine_error_type
+
+EPS = np.finfo(float).eps
+
+# Eigenvalues of a real root of multiplicity m scatter by about eps**(1/m)
+# around it, so near-real eigenvalues are tried as real roots too. This
+# covers multiplicities up to about 4.
+IMAGINARY_TOLERANCE = 1e-3
+
+
+def polynomial_roots(coefficients, niter, tol, tolerance_type):
+    """
+    Find all roots of a polynomial at once.
+
+    The roots are the eigenvalues of the companion matrix. Real and
+    near-real ones are polished with Newton's method on a Horner evaluator,
+    which brings them to the requested tolerance; a near-real eigenvalue
+    that does not polish to a real root nearby stays complex. Newton
+    converges slowly on a multiple root and stalls short of it, so a root
+    of multiplicity m is instead placed at the centre of its m eigenvalues,
+    and its error is their largest distance from it.
+
+    Parameters:
+        coefficients (array_like): Real coefficients, highest degree first.
+        niter (int): Maximum number of Newton iterations per root.
+        tol (float): Tolerance for the Newton polish.
+        tolerance_type (str): "Correct Decimals" or "Significant Figures".
+
+    Returns:
+        tuple: A Result whose table holds the distinct real roots, sorted,
+        with their multiplicity, and a NumPy array with the non-real roots.
+    """
+    result = Result()
+    coefficients = np.trim_zeros(np.asarray(coefficients, dtype=float), "f")
+    if len(coefficients) < 2:
+        result.error_message = "A constant has no isolated roots."
+        return result, np.array([], dtype=complex)
+
+    eigenvalues = np.linalg.eigvals(_companion_matrix(coefficients))
+    function = HornerEvaluator(coefficients, orders=(0,))
+    derivative = HornerEvaluator(coefficients, orders=(1,))
+
+    noise = lambda x: _rounding_bound(coefficients, x)
+
+    rows = []
+    complex_roots = []
+    for z in eigenvalues:
+        width = IMAGINARY_TOLERANCE * max(1.0, abs(z))
+        row = None
+        if abs(z.imag) <= width:
+            row = _polish(
+                z.real, niter, tol, tolerance_type, function, derivative, noise
+            )
+            f_z = function(z.real)[0]
+            if row is not None and abs(row[0] - z.real) > width:
+                if abs(f_z) <= noise(z.real):
+                    # Newton wandered along the flat part of a multiple
+                    # root, where p is zero up to rounding.
+                    row = (z.real, f_z, np.nan, 0)
+        if row is None or abs(row[0] - z.real) > width:
+            complex_roots.append(z)
+        else:
+            rows.append((*row, z))
+
+    result.table = pd.DataFrame(
+        _merge_repeated(rows, function, noise, determine_error_type(tolerance_type)),
+        columns=["x", "f_x", "error", "n_iter", "multiplicity"],
+    )
+    result.set_success_status()
+    return result, np.array(complex_roots)
+
+
+def _rounding_bound(coefficients, x):
+    # Bound on the rounding error of Horner's scheme at x. Where |p(x)| is
+    # below it, p(x) is indistinguishable from zero.
+    return 10 * EPS * np.polyval(np.abs(coefficients), abs(x))
+
+
+def _polish(x_0, niter, tol, tolerance_type, function, derivative, noise):
+    from single_variable.newton_raphson import newton
+
+    f_0 = function(x_0)[0]
+    try:
+        polished = newton(
+            x_0,
+            niter,
+            tol,
+            tolerance_type,
+            lambda x: function(x)[0],
+            lambda x: derivative(x)[0],
+            trace="none",
+        )
+    except ZeroDivisionError:
+        polished = None
+
+    if polished is None or polished.has_failed():
+        # Newton stalls on the flat part of a multiple root; accept the
+        # starting point only if p vanishes there up to rounding.
+        return (x_0, f_0, np.nan, 0) if abs(f_0) <= noise(x_0) else None
+    last = polished.table.iloc[-1]
+    return (last["x"], last["f_x"], last["error"], polished.table.index[-1])
+
+
+def _merge_repeated(rows, function, noise, error_type):
+    # A root of multiplicity m shows up as m eigenvalues that polish to
+    # nearby points. Neighbours belong to the same root when p is zero up to
+    # rounding between them; report each root once.
+    clusters = []
+    for row in sorted(rows, key=lambda row: row[0]):
+        if clusters:
+            previous, eigenvalues = clusters[-1]
+            middle = (row[0] + previous[0]) / 2
+            if abs(function(middle)[0]) <= noise(middle):
+                best = row if abs(row[1]) < abs(previous[1]) else previous
+                clusters[-1] = (best, eigenvalues + [row[4]])
+                continue
+        clusters.append((row, [row[4]]))
+    return [
+        _cluster_root(row, eigenvalues, function, error_type)
+        for row, eigenvalues in clusters
+    ]
+
+
+def _cluster_root(row, eigenvalues, function, error_type):
+    x, f_x, error, n_iter = row[:4]
+    if len(eigenvalues) > 1:
+        # The eigenvalues scatter by about eps**(1/m) around the root, but
+        # their mean is much closer to it than any one of them, and than the
+        # point where Newton stalls.
+        x = float(np.mean(eigenvalues).real)
+        f_x = function(x)[0]
+        error = max(calculate_error(x, z, error_type) for z in eigenvalues)
+    return (x, f_x, error, n_iter, len(eigenvalues))
+
+
+def _companion_matrix(coefficients):
+    monic = coefficients[1:] / coefficients[0]
+    n = len(monic)
+    matrix = np.zeros((n, n))
+    matrix[0, :] = -monic
+    matrix[1:, :-1] = np.eye(n - 1)
+    return matrix
+
+
+def show_polynomial_roots(function_sp, x, niter, tol, tolerance_type):
+    """Offer the full root set when the function is a polynomial."""
+    coefficients, _ = polynomial_form(function_sp, x)
+    if coefficients is None:
+        return
+
+    with st.expander("All roots of the polynomial"):
+        st.write(
+            "Your function is a polynomial, so all of its roots are the "
+            "eigenvalues of its companion matrix. Real roots are polished "
+            "with the Newton–Raphson method."
+        )
+        if not st.checkbox("Find all roots"):
+            return
+        result, complex_roots = polynomial_roots(
+            coefficients, niter, tol, tolerance_type
+        )
+        if result.has_failed():
+            st.info(result.error_message)
+            return
+
+        if result.table.empty:
+            st.info("The polynomial has no real roots.")
+        else:
+            st.table(
+                result.table.style.format(
+                    {"x": "{:.15e}", "f_x": "{:.15e}", "error": "{:.15e}"}
+                )
+            )
+            if (result.table["multiplicity"] > 1).any():
+                st.caption(
+                    "A root of multiplicity m is only accurate to about the "
+                    "m-th root of machine precision. It is placed at the "
+                    "centre of its m eigenvalues, and its error is their "
+                    "largest distance from it."
+                )
+        if len(complex_roots):
+            st.write("**Non-real roots**")
+            st.write(", ".join(f"{z:.10g}" for z in complex_roots))
@@ -0,0 +1,232 @@
+"""
+Root-finding beyond float64 with mpmath.
+
+A tolerance below what float64 resolves cannot be met by the float methods:
+their iterates stall at machine epsilon until `niter` runs out. Here a
+method runs in stages instead. The first stage is the ordinary float64 run,
+stopped once float64 can do no better; every later stage restarts the
+method where the previous one stopped, at twice the working precision,
+until the requested tolerance is within reach. Most iterations therefore
+stay cheap and only the last few are carried out in high precision.
+"""
+
+import math
+
+import mpmath
+import numpy as np
+import pandas as pd
+import sympy as sp
+
+from utils.general import nm_diff, nm_lambdify, nm_sympify
+
+from .common import ErrorType, Evaluator, Result, determine_error_type
+
+PRECISE_METHODS = (
+    "bisection",
+    "false_position",
+    "brent",
+    "secant",
+    "newton",
+    "multiple_roots",
+    "fixed_point",
+)
+
+FLOAT_DIGITS = 15  # Decimal digits float64 resolves.
+GUARD_DIGITS = 3  # Digits of working precision lost to rounding.
+FIRST_DIGITS = 30  # Working precision of the first mpmath stage.
+WIDENING = 10  # Growth of a bracket rebuilt around the previous estimate.
+
+
+class WorkingPrecision:
+    """
+    A private mpmath context whose precision rises from stage to stage.
+
+    Functions built by `compile` evaluate at the context's current
+    precision, so they are compiled once and shared by every stage. The
+    global `mpmath.mp` is left alone: other sessions use it too.
+    """
+
+    def __init__(self, digits):
+        self.digits = digits
+        self.context = mpmath.MPContext()
+        self._namespace = {
+            name: getattr(self.context, name)
+            for name in dir(mpmath)
+            if not name.startswith("_") and hasattr(self.context, name)
+        }
+
+    def compile(self, expression, symbol):
+        return sp.lambdify(symbol, expression, [self._namespace, "mpmath"])
+
+    def stages(self):
+        """Yield the working precisions in decimal digits, doubling up to the target."""
+        target = self.digits + GUARD_DIGITS
+        dps = FIRST_DIGITS
+        while dps < target:
+            yield dps
+            dps *= 2
+        yield target
+
+
+def required_digits(tol):
+    """Significant digits the arithmetic must keep to resolve `tol`."""
+    if not tol > 0:
+        raise ValueError("The tolerance must be positive.")
+    return max(math.ceil(-math.log10(tol)), 1)
+
+
+def precise_solve(method, expression, symbol, tol, tolerance_type, niter, **inputs):
+    """
+    Run `method`, one of `PRECISE_METHODS`, to `tol` at rising precision.
+
+    `inputs` are the starting values: `a` and `b` for the bracketing
+    methods, `x_0` and `x_1` for the secant method and `x_0` for the
+    others. False position optionally takes its `variant`; fixed point
+    takes `g`, the expression of g(x), and optionally its `acceleration`.
+    The stages
+    share the `niter` budget. Their tables are concatenated, with a
+    "digits" column giving the working precision of each row.
+    """
+    # Imported here: the method modules import this one for their pages.
+    from .bisection import bisection
+    from .brent import brent
+    from .false_position import false_position
+    from .fixed_point import fixed_point
+    from .multiple_roots import multiple_roots
+    from .newton_raphson import newton
+    from .secant import secant
+
+    runs = {
+        "bisection": lambda f, tol, niter, a, b: bisection(
+            a, b, niter, tol, tolerance_type, f
+        ),
+        "false_position": lambda f, tol, niter, a, b: false_position(
+            a, b, niter, tol, tolerance_type, f, variant=variant
+        ),
+        "brent": lambda f, tol, niter, a, b: brent(a, b, niter, tol, tolerance_type, f),
+        "secant": lambda f, tol, niter, x_0, x_1: secant(
+            x_0, x_1, niter, tol, f, tolerance_type
+        ),
+        "newton": lambda f, df, tol, niter, x_0: newton(
+            x_0, niter, tol, tolerance_type, f, df
+        ),
+        "multiple_roots": lambda f, df, d2f, tol, niter, x_0: multiple_roots(
+            x_0, niter, tol, f, df, d2f, tolerance_type
+        ),
+        "fixed_point": lambda f, g, tol, niter, x_0: fixed_point(
+            x_0, tol, tolerance_type, niter, f, g, acceleration=acceleration
+        ),
+    }
+    if method not in runs:
+        raise ValueError("Not a valid method.")
+    error_type = determine_error_type(tolerance_type)
+
+    expression = nm_sympify(expression)
+    expressions = [expression]
+    match method:
+        case "false_position":
+            variant = inputs.pop("variant", "Plain")
+        case "newton":
+            expressions.append(nm_diff(expression, symbol))
+        case "multiple_roots":
+            expressions += [nm_diff(expression, symbol, order) for order in (1, 2)]
+        case "fixed_point":
+            expressions.append(nm_sympify(inputs.pop("g")))
+            acceleration = inputs.pop("acceleration", "Plain")
+
+    precision = WorkingPrecision(required_digits(tol))
+    precise_functions = [precision.compile(e, symbol) for e in expressions]
+    stages = [(FLOAT_DIGITS, [nm_lambdify(e, symbol) for e in expressions], float)]
+    stages += [
+        (dps, precise_functions, precision.context.mpf) for dps in precision.stages()
+    ]
+
+    result = Result()
+    tables = []
+    history = None  # Estimates of the previous stage.
+    scale = max([abs(value) for value in inputs.values()] + [1])
+    iterations = 0
+
+    for digits, functions, number in stages:
+        precision.context.dps = digits
+        floor = number(10) ** (GUARD_DIGITS - digits)
+        if error_type == ErrorType.ABSOLUTE:
+            floor *= scale
+        final = floor <= tol
+        stage_tol = tol if final else floor
+
+        values = {name: number(value) for name, value in inputs.items()}
+        if history is not None:
+            function = Evaluator(functions[0])
+            values = _restart(method, function, history, width, values, number)
+            result.n_evaluations += function.count
+
+        if iterations >= niter:
+            result.error_message = "**Error:** Took too many iterations."
+            break
+        output = runs[method](*functions, stage_tol, niter - iterations, **values)
+        result.n_evaluations += output.n_evaluations
+        if not output.table.empty:
+            tables.append(output.table.assign(digits=digits))
+            iterations += len(output.table)
+        if output.has_failed():
+            result.error_message = output.error_message
+            break
+        if final:
+            result.set_success_status()
+            break
+
+        history = list(output.table["x"].iloc[-2:])
+        scale = max(abs(history[-1]), 1)
+        # The distance to the root the stage has resolved.
+        width = stage_tol if error_type == ErrorType.ABSOLUTE else stage_tol * scale
+
+    precision.context.dps = precision.digits
+    if tables:
+        result.table = pd.concat(tables, ignore_index=True)
+    return result
+
+
+def _restart(method, function, history, width, values, number):
+    # Starting values for the next stage, from the estimates of the last one.
+    x = number(history[-1])
+    width = number(width)
+    match method:
+        case "bisection" | "false_position" | "brent":
+            a, b = _rebracket(function, x, width, values["a"], values["b"])
+            return {"a": a, "b": b}
+        case "secant":
+            previous = number(history[0])
+            if previous == x:
+                previous = x - width
+            return {"x_0": previous, "x_1": x}
+        case _:
+            return {"x_0": x}
+
+
+def _rebracket(function, x, width, a, b):
+    """
+    Find a small bracket around `x`, the estimate of the previous stage.
+
+    The bracket starts `width` wide on each side and grows by `WIDENING`
+    until the function changes sign across it. Falls back to [a, b].
+    """
+    half = width
+    while half < b - a:
+        low, high = max(a, x - half), min(b, x + half)
+        if function(low) * function(high) < 0:
+            return low, high
+        half *= WIDENING
+    return a, b
+
+
+def format_value(value, decimals=15):
+    """
+    Format a table entry: floats in scientific notation with `decimals`
+    decimals, mpmath numbers with all the digits of their context.
+    """
+    if isinstance(value, (int, np.integer)):
+        return str(value)
+    if hasattr(value, "context"):
+        return mpmath.nstr(value, value.context.dps, min_fixed=0, max_fixed=0)
+    return f"{value:.{decimals}e}"
@@ -1,21 +1,37 @@
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
+
+import numpy as np
 import pandas as pd
 import streamlit as st
+import sympy as sp
+
+from utils.autodiff import ad_lambdify_derivatives
+from utils.general import nm_diff, nm_lambdify, nm_lambdify_derivatives
+from utils.interface_blocks import ui_differentiation
+from utils.sandbox import SandboxError, run_sandboxed, safe_diff
+
+from .common import Evaluator, MethodTimeout, Result, ResultStatus
+
+DEFAULT_TIME_BUDGET = 5.0  # Seconds of wall-clock time per method.
+
+# Extra wait for a method that is past its budget but stuck in one evaluation.
+GRACE_PERIOD = 1.0
 
-from utils.general import nm_lambdify
+# Most calls used to time one evaluation of f, f' and f''.
+TIMING_CALLS = 200
 
 
 def generate_report(
     n_iterations,
-    f_function,
+    function_expression,
     tolerance,
     type_of_tolerance,
     symbol,
-    first_derivative,
-    second_derivative,
 ):
     st.subheader("Method comparison report")
-    first_derivative = nm_lambdify(first_derivative, symbol)
-    second_derivative = nm_lambdify(second_derivative, symbol)
+    f_function = nm_lambdify(function_expression, symbol)
 
     try:
         with st.form("Report"):
@@ -49,12 +65,33 @@ def generate_report(
                 value=3.0,
                 step=0.0001,
             )
+            # Used by Newton–Raphson, Multiple roots and Halley.
+            differentiation = ui_differentiation(key="report_differentiation")
+            time_budget = st.number_input(
+                "Time budget per method (seconds)",
+                value=DEFAULT_TIME_BUDGET,
+                min_value=0.1,
+                step=0.5,
+                help="Methods still running after this long are stopped and marked as timed out.",
+            )
             submitted = st.form_submit_button("Generate report")
     except Exception as e:
         st.error(f"Invalid function input: Please check your inputs")
         return
 
     if submitted:
+        try:
+            derivatives = nm_lambdify_derivatives(
+                function_expression, symbol, differentiation=differentiation
+            )
+        except ValueError as e:
+            st.error(f"**Error:** {e}")
+            return
+        if differentiation == "symbolic":
+            first_derivative = nm_lambdify(nm_diff(function_expression, symbol), symbol)
+        else:
+            first_derivative = lambda x: derivatives(x)[1]
+
         results = _run_all_methods(
             x0,
             a,
@@ -65,27 +102,35 @@ def generate_report(
             f_function,
             g_input,
             first_derivative,
-            second_derivative,
+            derivatives,
+            time_budget,
         )
 
         table = {
             "Method": [],
             "$n_\\text{iter}$": [],
+            "$n_\\text{eval}$": [],
             "$x_\\text{sol}$": [],
             "$f(x_\\text{sol})$": [],
             "$E$": [],
         }
         failed_methods = []
+        timed_out_methods = []
 
-        for method_name, output in results.items():
+        # Rows appear as each method finishes.
+        placeholder = st.empty()
+        for method_name, output in results:
+            if output.status == ResultStatus.TIMEOUT:
+                timed_out_methods.append(method_name)
+                continue
             if output.has_failed():
                 failed_methods.append(method_name)
                 continue
 
             table["Method"].append(method_name)
 
-            print(f"{output.table.shape[0] + 1}")
             table["$n_\\text{iter}$"].append(output.table.shape[0] + 1)
+            table["$n_\\text{eval}$"].append(output.n_evaluations)
 
             # Append the last X value of each method.
             x_n = output.table.tail(1)["x"].iloc[0]
@@ -100,8 +145,25 @@ def generate_report(
             formatted_error = f"{error_value:.10e}"
             table["$E$"].append(formatted_error)
 
-        df = pd.DataFrame(table)
-        st.table(df)
+            placeholder.table(pd.DataFrame(table))
+
+        if failed_methods:
+            st.write("The following methods failed to converge:")
+            for method in failed_methods:
+                st.write(method)
+
+        if timed_out_methods:
+            st.write(
+                f"The following methods were stopped after {time_budget:g} seconds:"
+            )
+            for method in timed_out_methods:
+                st.write(method)
+
+        st.write("**Cost of the derivatives**")
+        st.table(_compare_differentiation(function_expression, symbol, x0, time_budget))
+
+        if not table["Method"]:
+            return
 
         # Find the best method
         best_iteration = min(table["$n_\\text{iter}$"])
@@ -112,6 +174,13 @@ def generate_report(
             f'The best method is {table["Method"][best_method_id]}, which took {best_iteration} iterations to converge.'
         )
 
+        # Find the method with the fewest function evaluations
+        fewest_evaluations = min(table["$n_\\text{eval}$"])
+        cheapest_method_id = table["$n_\\text{eval}$"].index(fewest_evaluations)
+        st.write(
+            f'The cheapest method is {table["Method"][cheapest_method_id]}, which needed {fewest_evaluations} function evaluations.'
+        )
+
 
 def _run_all_methods(
     x_0,
@@ -123,41 +192,190 @@ def _run_all_methods(
     f_function,
     g_function,
     first_derivative,
-    second_derivative,
+    derivatives,
+    time_budget=DEFAULT_TIME_BUDGET,
 ):
+    """
+    Run every method on a worker pool and yield (name, Result) pairs as they finish.
+
+    Each method gets `time_budget` seconds of wall-clock time. The functions
+    handed to a method stop it once its budget is spent; a method still
+    running shortly after its budget (e.g. stuck in one slow evaluation) is
+    no longer waited for. Either way it is reported with a TIMEOUT status.
+
+    Threads cannot be killed, so only these cooperative `Evaluator`
+    deadlines stop a method: one stuck in a single evaluation keeps its
+    thread busy until that evaluation returns, and is stopped by its next
+    one. When the caller stops iterating, every method still running is
+    stopped the same way, and the executor is shut down.
+    """
     from single_variable.bisection import bisection
-    from single_variable.false_position import false_position
+    from single_variable.brent import brent
+    from single_variable.false_position import VARIANTS, false_position
     from single_variable.fixed_point import fixed_point
+    from single_variable.householder import halley
     from single_variable.multiple_roots import multiple_roots
     from single_variable.newton_raphson import newton
     from single_variable.secant import secant
 
-    return {
-        "Bisection": bisection(
-            a, b, n_iterations, tolerance, type_of_tolerance, f_function
-        ),
-        "False position": false_position(
-            a, b, n_iterations, tolerance, type_of_tolerance, f_function
+    # Each run receives `limit`, which ties a function to the run's deadline.
+    runs = {
+        "Bisection": lambda limit: bisection(
+            a, b, n_iterations, tolerance, type_of_tolerance, limit(f_function)
         ),
-        "Fixed point": fixed_point(
-            x_0, tolerance, type_of_tolerance, n_iterations, f_function, g_function
+        "Fixed point": lambda limit: fixed_point(
+            x_0,
+            tolerance,
+            type_of_tolerance,
+            n_iterations,
+            limit(f_function),
+            limit(g_function),
         ),
-        "Multiple roots": multiple_roots(
+        "Multiple roots": lambda limit: multiple_roots(
             x_0,
             n_iterations,
             tolerance,
             f_function,
-            first_derivative,
-            second_derivative,
+            None,
+            None,
             type_of_tolerance,
+            derivatives=limit(derivatives),
+        ),
+        "Secant": lambda limit: secant(
+            a, b, n_iterations, tolerance, limit(f_function), type_of_tolerance
         ),
-        "Secant": secant(a, b, n_iterations, tolerance, f_function, type_of_tolerance),
-        "Newton–Raphson": newton(
+        "Newton–Raphson": lambda limit: newton(
             x_0,
             n_iterations,
             tolerance,
             type_of_tolerance,
-            f_function,
-            first_derivative,
+            limit(f_function),
+            limit(first_derivative),
+        ),
+        "Halley": lambda limit: halley(
+            x_0, n_iterations, tolerance, type_of_tolerance, limit(derivatives)
+        ),
+        "Brent": lambda limit: brent(
+            a, b, n_iterations, tolerance, type_of_tolerance, limit(f_function)
+        ),
+    }
+    for variant in VARIANTS:
+        name = "False position" if variant == "Plain" else f"False position ({variant})"
+        runs[name] = lambda limit, variant=variant: false_position(
+            a,
+            b,
+            n_iterations,
+            tolerance,
+            type_of_tolerance,
+            limit(f_function),
+            variant=variant,
+        )
+
+    evaluators = []
+    executor = ThreadPoolExecutor(max_workers=len(runs))
+    futures = {
+        executor.submit(_timed_run, run, time_budget, evaluators): name
+        for name, run in runs.items()
+    }
+    try:
+        for future in as_completed(futures, timeout=time_budget + GRACE_PERIOD):
+            yield futures[future], future.result()
+    except TimeoutError:
+        for future, name in futures.items():
+            if not future.done():
+                yield name, _timed_out_result(time_budget)
+    finally:
+        # Past deadlines make the next evaluation of every method raise.
+        for evaluator in evaluators:
+            evaluator.deadline = -math.inf
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _timed_run(run, time_budget, evaluators):
+    deadline = time.perf_counter() + time_budget
+
+    def limit(function):
+        evaluator = Evaluator(function, deadline=deadline)
+        evaluators.append(evaluator)
+        return evaluator
+
+    try:
+        return run(limit)
+    except MethodTimeout:
+        return _timed_out_result(time_budget)
+    except Exception as e:
+        return Result(error_message=f"**Error:** {e}")
+
+
+def _timed_out_result(time_budget):
+    return Result(
+        status=ResultStatus.TIMEOUT,
+        error_message=f"**Error:** Took longer than {time_budget:g} s.",
+    )
+
+
+def _compare_differentiation(expression, symbol, x_0, time_budget):
+    """
+    Time both ways of getting f, f' and f'' at x_0, bypassing the caches.
+
+    Setup is the time to build the callable: differentiating and searching
+    for common subexpressions (in the sandbox) and compiling for the
+    symbolic mode, compiling f alone for automatic differentiation. The
+    evaluations stop once both modes together have taken `time_budget`
+    seconds, after at least one call each.
+    """
+    builders = {
+        "symbolic": lambda: sp.lambdify(
+            symbol,
+            [expression] + [safe_diff(expression, symbol, order) for order in (1, 2)],
+            cse=_sandboxed_cse,
+        ),
+        "automatic": lambda: ad_lambdify_derivatives(expression, symbol),
+    }
+    try:
+        sizes = run_sandboxed(_count_compiled_operations, expression, symbol)
+    except SandboxError:
+        sizes = {mode: np.nan for mode in builders}
+
+    deadline = time.perf_counter() + time_budget
+    rows = []
+    for mode, build in builders.items():
+        start = time.perf_counter()
+        try:
+            derivatives = build()
+        except ValueError:
+            rows.append((mode, np.nan, np.nan, sizes[mode]))
+            continue
+        setup = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with np.errstate(all="ignore"):
+            for calls in range(1, TIMING_CALLS + 1):
+                derivatives(x_0)
+                if time.perf_counter() > deadline:
+                    break
+        evaluation = (time.perf_counter() - start) / calls
+        rows.append((mode, 1e3 * setup, 1e6 * evaluation, sizes[mode]))
+
+    return pd.DataFrame(
+        rows,
+        columns=[
+            "Derivatives",
+            "Setup (ms)",
+            "Evaluation of f, f', f'' (µs)",
+            "Operations compiled",
+        ],
+    )
+
+
+def _sandboxed_cse(expressions):
+    return run_sandboxed(sp.cse, expressions)
+
+
+def _count_compiled_operations(expression, symbol):
+    return {
+        "symbolic": sum(
+            sp.count_ops(sp.diff(expression, symbol, order)) for order in range(3)
         ),
+        "automatic": sp.count_ops(expression),
     }
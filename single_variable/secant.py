@@ -2,55 +2,111 @@
 import streamlit as st
 import sympy as sp
 
-from utils.general import nm_lambdify
+from utils.general import nm_lambdify, nm_sympify
 from utils.interface_blocks import (
     calculate_tolerance,
     graph,
+    run_resumable,
     show_table,
     ui_input_function,
+    ui_precision,
 )
 
-from .common import Result, ResultStatus, Table, calculate_error, determine_error_type
+from .common import (
+    Evaluator,
+    Result,
+    ResultStatus,
+    SolverState,
+    Table,
+    calculate_error,
+    determine_error_type,
+)
+from .ladder import show_tolerance_ladder
+from .polynomial import show_polynomial_roots
+from .precision import format_value, precise_solve
 from .report import generate_report
 
 
-def secant(x_0, x_1, niter, tol, function, tolerance_type) -> Result:
+def secant(
+    x_0,
+    x_1,
+    niter,
+    tol,
+    function,
+    tolerance_type,
+    trace="full",
+    ladder=None,
+    state=None,
+) -> Result:
+    """
+    With a `state` from an earlier result, the iteration goes on from the
+    last two iterates of that run instead of from x_0 and x_1; see
+    `SolverState`.
+    """
     result = Result()
-    table = Table()
+    function = Evaluator(function)
+    error_type = determine_error_type(tolerance_type)
 
-    # Initial setup
-    try:
-        x_n = x_1 - function(x_1) * (x_1 - x_0) / (function(x_1) - function(x_0))
-    except ZeroDivisionError:
-        result.error_message = "Division by zero."
-        return result
+    if state is None:
+        table = Table(trace=trace)
+        spent = 0
 
-    x_prev = x_1
-    x_prev_2 = x_0
-    err = 100
-    iteration_counter = 0
+        # Initial setup
+        f_0 = function(x_0)
+        f_1 = function(x_1)
+        try:
+            x_n = x_1 - f_1 * (x_1 - x_0) / (f_1 - f_0)
+        except ZeroDivisionError:
+            result.error_message = "Division by zero."
+            result.n_evaluations = function.count
+            return result
 
-    error_type = determine_error_type(tolerance_type)
+        x_prev, f_prev = x_1, f_1
+        x_prev_2, f_prev_2 = x_0, f_0
+        err = 100
+        iteration_counter = 0
 
-    # 0-th iteration
-    table.add_row(x_1, function(x_1), None)
+        # 0-th iteration
+        table.add_row(x_1, f_1, None)
+    else:
+        table = state.resume("secant", tolerance_type)
+        spent = state.n_evaluations
+        x_prev, f_prev, x_prev_2, f_prev_2 = state.iterates
+        function.remember(x_prev_2, f_prev_2)
+        function.remember(x_prev, f_prev)
+        err, iteration_counter = state.error, state.n_iter
 
     # Secant method iterations
     while iteration_counter < niter and err >= tol:
-        denominator = function(x_prev) - function(x_prev_2)
+        denominator = f_prev - f_prev_2
         try:
-            x_n = x_prev - function(x_prev) * (x_prev - x_prev_2) / denominator
+            x_n = x_prev - f_prev * (x_prev - x_prev_2) / denominator
         except ZeroDivisionError:
             result.error_message = "Division by zero."
+            result.n_evaluations = spent + function.count
             return result
+        f_n = function(x_n)
 
         err = calculate_error(x_n, x_prev, error_type)
-        table.add_row(x_n, function(x_n), err)
+        table.add_row(x_n, f_n, err)
         iteration_counter += 1
-        x_prev_2 = x_prev
-        x_prev = x_n
+        if ladder is not None:
+            ladder.record(iteration_counter, x_n, err, spent + function.count)
+        x_prev_2, f_prev_2 = x_prev, f_prev
+        x_prev, f_prev = x_n, f_n
 
     df = table.as_dataframe()
+    result.n_evaluations = spent + function.count
+    result.state = SolverState(
+        "secant",
+        tolerance_type,
+        tol,
+        (x_prev, f_prev, x_prev_2, f_prev_2),
+        err,
+        iteration_counter,
+        result.n_evaluations,
+        table,
+    )
     result.set_success_status()
     result.table = df
     return result
@@ -82,31 +138,43 @@ def show_secant():
 
     tol, niter, tolerance_type = calculate_tolerance()
     st.markdown(f"**Calculated Tolerance:** {tol:.10f}")
-    function = sp.sympify(function_input)
+    precise = ui_precision()
+    function_sp = nm_sympify(function_input)
 
     x = sp.symbols("x")
-    first_derivative = sp.diff(function, x)
-    second_derivative = sp.diff(first_derivative, x)
 
-    function = nm_lambdify(function, x)
-    result = secant(x0, x1, niter, tol, function, tolerance_type)
+    function = nm_lambdify(function_sp, x)
+    if precise:
+        result = precise_solve(
+            "secant", function_sp, x, tol, tolerance_type, niter, x_0=x0, x_1=x1
+        )
+    else:
+        # Tightening the tolerance or raising niter resumes the last run.
+        result = run_resumable(
+            ("secant", function_input, x0, x1, tolerance_type),
+            lambda state: secant(
+                x0, x1, niter, tol, function, tolerance_type, state=state
+            ),
+            tol,
+            niter,
+        )
 
     if result.has_failed():
         st.error(result.error_message)
         return
 
-    result_display = result.table.style.format("{:.15e}")
+    result_display = result.table.map(format_value)
 
     st.divider()
 
     st.header("Result")
-    mid = result.table.iloc[-1]["x"]
-    if function(mid) < 0 + tol:
+    mid, f_x = result.table.iloc[-1][["x", "f_x"]]
+    if f_x < 0 + tol:
         st.success(":material/check: Root found.")
 
         col1, col2 = st.columns(2)
-        col1.metric("$x$", f"{mid:.10e}")
-        col2.metric("$f(x)$", f"{function(mid):.10e}")
+        col1.metric("$x$", format_value(mid, 10))
+        col2.metric("$f(x)$", format_value(f_x, 10))
 
     else:
         st.warning(
@@ -121,12 +189,13 @@ def show_secant():
 
     st.divider()
 
-    generate_report(
-        niter,
-        function,
-        tol,
+    show_tolerance_ladder(
+        lambda tol, ladder: secant(
+            x0, x1, niter, tol, function, tolerance_type, trace="none", ladder=ladder
+        ),
         tolerance_type,
-        x,
-        first_derivative,
-        second_derivative,
     )
+
+    show_polynomial_roots(function_sp, x, niter, tol, tolerance_type)
+
+    generate_report(niter, function_sp, tol, tolerance_type, x)
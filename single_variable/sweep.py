@@ -0,0 +1,271 @@
+from dataclasses import dataclass
+
+import numpy as np
+import plotly.graph_objs as go
+import streamlit as st
+import sympy as sp
+
+from utils.general import nm_diff, nm_lambdify, nm_sympify
+from utils.interface_blocks import calculate_tolerance
+
+from .common import (
+    BatchResult,
+    ResultStatus,
+    calculate_error_array,
+    determine_error_type,
+    evaluate_array,
+)
+
+SWEEP_METHODS = ("Newton-Raphson", "Secant")
+
+
+@dataclass
+class SweepResult(BatchResult):
+    """Roots of f(x; p) for each parameter value p."""
+
+    p: np.ndarray
+
+    def as_dataframe(self):
+        df = super().as_dataframe()
+        df.insert(0, "p", self.p)
+        return df
+
+
+def parameter_sweep(
+    expression,
+    p_values,
+    x_0,
+    niter,
+    tol,
+    tolerance_type,
+    method="Newton-Raphson",
+    lockstep=False,
+    x_symbol=sp.symbols("x"),
+    p_symbol=sp.symbols("p"),
+) -> SweepResult:
+    """
+    Solve f(x; p) = 0 for every value in `p_values`.
+
+    By default this is a continuation: the values of p are solved in order,
+    each starting from the root found for the previous one, so neighbouring
+    problems only need a few iterations. With `lockstep`, every value of p
+    is solved at once with vectorized iterations that all start from `x_0`;
+    this is faster for many values, but gives up the warm start.
+
+    Parameters:
+        expression (str or sympy.Expr): f in terms of `x_symbol` and `p_symbol`.
+        p_values (array_like): Parameter values, in the order to solve them.
+        x_0 (float): Initial guess for the first value of p.
+        niter (int): Maximum number of iterations per value of p.
+        tol (float): Tolerance for the stopping criterion.
+        tolerance_type (str): "Correct Decimals" or "Significant Figures".
+        method (str): One of `SWEEP_METHODS`.
+        lockstep (bool): Solve all values at once instead of by continuation.
+
+    Returns:
+        SweepResult: Roots, iteration counts, errors and statuses per value of p.
+    """
+    from single_variable.newton_raphson import newton
+    from single_variable.secant import secant
+
+    if method not in SWEEP_METHODS:
+        raise ValueError("Not a valid sweep method.")
+
+    p_values = np.asarray(p_values, dtype=float).ravel()
+    symbols = (x_symbol, p_symbol)
+    expression = nm_sympify(expression)
+    function = nm_lambdify(expression, symbols)
+    derivative = nm_lambdify(nm_diff(expression, x_symbol), symbols)
+
+    if lockstep:
+        solve = _newton_lockstep if method == "Newton-Raphson" else _secant_lockstep
+        output = solve(x_0, p_values, niter, tol, tolerance_type, function, derivative)
+        return SweepResult(**vars(output), p=p_values)
+
+    n = len(p_values)
+    x_sol = np.full(n, np.nan)
+    n_iter = np.zeros(n, dtype=int)
+    err = np.full(n, np.nan)
+    status = np.full(n, ResultStatus.FAILURE.value)
+
+    x_guess = x_0
+    for j, p in enumerate(p_values):
+        f = lambda x, p=p: function(x, p)
+        try:
+            if method == "Newton-Raphson":
+                df = lambda x, p=p: derivative(x, p)
+                output = newton(
+                    x_guess, niter, tol, tolerance_type, f, df, trace="none"
+                )
+            else:
+                x_1 = _second_point(x_guess)
+                output = secant(
+                    x_guess, x_1, niter, tol, f, tolerance_type, trace="none"
+                )
+        except ZeroDivisionError:
+            continue
+
+        if output.table.empty:
+            continue
+        last = output.table.iloc[-1]
+        n_iter[j] = output.table.index[-1]
+        err[j] = last["error"]
+        if output.has_failed() or not np.isfinite(last["x"]) or not err[j] <= tol:
+            continue
+
+        x_sol[j] = last["x"]
+        status[j] = ResultStatus.SUCCESS.value
+        x_guess = x_sol[j]  # Warm start for the next value of p.
+
+    return SweepResult(x_sol=x_sol, n_iter=n_iter, err=err, status=status, p=p_values)
+
+
+def _second_point(x):
+    # Second starting point for the secant method, close to the first one.
+    return x + 1e-4 * max(1.0, abs(x))
+
+
+def _newton_lockstep(x_0, p, niter, tol, tolerance_type, function, derivative):
+    def step(x, x_prev, f_x, p):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return x - f_x / evaluate_array(lambda x: derivative(x, p), x)
+
+    return _lockstep(x_0, None, p, niter, tol, tolerance_type, function, step)
+
+
+def _secant_lockstep(x_0, p, niter, tol, tolerance_type, function, derivative):
+    def step(x, x_prev, f_x, f_prev):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return x - f_x * (x - x_prev) / (f_x - f_prev)
+
+    return _lockstep(
+        x_0, _second_point(x_0), p, niter, tol, tolerance_type, function, step
+    )
+
+
+def _lockstep(x_0, x_1, p, niter, tol, tolerance_type, function, step):
+    """
+    Shared loop of the vectorized sweeps.
+
+    `step(x, x_prev, f_x, extra)` returns the next iterates for the active
+    points, where `extra` is f(x_prev) for two-point methods (`x_1` given)
+    and p for one-point methods.
+    """
+    error_type = determine_error_type(tolerance_type)
+    evaluate = lambda x, p: evaluate_array(lambda x: function(x, p), x)
+
+    n = len(p)
+    x_prev = np.full(n, float(x_0))
+    x = np.full(n, float(x_0 if x_1 is None else x_1))
+    f_prev = evaluate(x_prev, p) if x_1 is not None else None
+    n_iter = np.zeros(n, dtype=int)
+    err = np.full(n, np.nan)
+    status = np.full(n, ResultStatus.FAILURE.value)
+    active = np.ones(n, dtype=bool)
+
+    i = 0
+    while i < niter and active.any():
+        idx = np.flatnonzero(active)
+        with np.errstate(all="ignore"):
+            f_x = evaluate(x[idx], p[idx])
+            if x_1 is None:
+                x_next = step(x[idx], None, f_x, p[idx])
+            else:
+                x_next = step(x[idx], x_prev[idx], f_x, f_prev[idx])
+                f_prev[idx] = f_x
+            error = calculate_error_array(x_next, x[idx], error_type)
+
+        i += 1
+        x_prev[idx] = x[idx]
+        x[idx] = x_next
+        err[idx] = error
+        n_iter[idx] = i
+
+        done = error <= tol
+        diverged = ~np.isfinite(x_next)
+        status[idx[done]] = ResultStatus.SUCCESS.value
+        active[idx[done | diverged]] = False
+
+    x[status != ResultStatus.SUCCESS.value] = np.nan
+    return BatchResult(x_sol=x, n_iter=n_iter, err=err, status=status)
+
+
+def show_parameter_sweep():
+    st.header("Parameter Sweep")
+
+    col1, col2 = st.columns(2)
+    expression_input = col1.text_input(
+        "Function $f(x; p)$",
+        value="x**3 - x - p",
+        help="Enter a function in terms of $x$ and the parameter $p$.",
+    )
+    if not expression_input:
+        st.error("**Error:** Please enter a function.")
+        return
+
+    x, p = sp.symbols("x p")
+    expression = nm_sympify(expression_input)
+    col2.latex(f"f({x}; {p}) = {sp.latex(expression)}")
+
+    col3, col4, col5 = st.columns(3)
+    p_start = col3.number_input("First value of $p$", value=0.0, format="%.4f")
+    p_stop = col4.number_input("Last value of $p$", value=10.0, format="%.4f")
+    n_points = col5.number_input(
+        "Number of values of $p$", value=200, min_value=2, step=10
+    )
+
+    col6, col7, col8 = st.columns(3)
+    x_0 = col6.number_input(
+        "Initial guess ($x_0$)",
+        format="%.4f",
+        value=1.0,
+        step=0.0001,
+        help="Initial guess for the first value of $p$. Later values start from the previous root.",
+    )
+    method = col7.selectbox("Method", SWEEP_METHODS)
+    lockstep = col8.checkbox(
+        "Vectorized lockstep",
+        help="Solve every value of $p$ at once, all starting from $x_0$, instead of warm-starting each value from the previous root.",
+    )
+
+    tol, niter, tolerance_type = calculate_tolerance()
+    st.markdown(f"**Calculated Tolerance:** {tol:.10f}")
+
+    p_values = np.linspace(p_start, p_stop, int(n_points))
+    result = parameter_sweep(
+        expression, p_values, x_0, niter, tol, tolerance_type, method, lockstep
+    )
+
+    st.divider()
+
+    st.header("Result")
+    converged = result.converged()
+    if converged.all():
+        st.success(":material/check: Found a root for every value of $p$.")
+    else:
+        st.warning(
+            f"No root was found for {np.count_nonzero(~converged)} of {len(p_values)} values of $p$."
+        )
+
+    col1, col2 = st.columns(2)
+    col1.metric("Total iterations", int(result.n_iter.sum()))
+    col2.metric("Mean iterations per value", f"{result.n_iter.mean():.2f}")
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=result.p, y=result.x_sol, mode="lines", name="Root"))
+    fig.add_trace(
+        go.Bar(x=result.p, y=result.n_iter, name="Iterations", yaxis="y2", opacity=0.3)
+    )
+    fig.update_layout(
+        title="Root versus parameter",
+        xaxis_title=str(p),
+        yaxis_title=str(x),
+        yaxis2=dict(title="Iterations", overlaying="y", side="right"),
+        showlegend=True,
+        margin=dict(l=0, r=0, t=40, b=0),
+        hovermode="closest",
+    )
+    st.plotly_chart(fig)
+
+    st.subheader("Table")
+    st.dataframe(result.as_dataframe(), use_container_width=True)
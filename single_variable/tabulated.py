@@ -0,0 +1,252 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objs as go
+import streamlit as st
+
+from interpolation.interpolant import INTERPOLANTS, build_interpolant
+from utils.interface_blocks import calculate_tolerance
+
+from .bisection import bisection
+from .brent import brent
+from .common import Result, Table
+from .false_position import false_position
+from .newton_raphson import newton
+from .precision import format_value
+
+TABULATED_METHODS = ("Brent", "Bisection", "False Position", "Newton-Raphson")
+
+# Points of the sample table offered on the page: exp(x) - 2 on [0, 2].
+SAMPLE_X = np.linspace(0, 2, 9)
+SAMPLE_Y = np.round(np.exp(SAMPLE_X) - 2, 6)
+
+
+def sign_changes(x, y):
+    """
+    Brackets [x_i, x_{i+1}] of consecutive points where y changes sign.
+
+    A point where y is exactly zero gives the bracket [x_i, x_i].
+    """
+    order = np.argsort(x, kind="stable")
+    x, y = np.asarray(x, dtype=float)[order], np.asarray(y, dtype=float)[order]
+    brackets = [(float(x_i), float(x_i)) for x_i in x[y == 0]]
+    changes = np.flatnonzero(y[:-1] * y[1:] < 0)
+    brackets += [(float(x[i]), float(x[i + 1])) for i in changes]
+    return sorted(brackets)
+
+
+def tabulated_root(
+    x,
+    y,
+    niter,
+    tol,
+    tolerance_type,
+    method="Brent",
+    kind="Cubic",
+    a=None,
+    b=None,
+    x_0=None,
+    trace="full",
+) -> Result:
+    """
+    Find a root of a function known only at the points (x_i, y_i).
+
+    The points are joined by a numeric piecewise interpolant (see
+    `interpolation.interpolant`) and the method runs on it as on any
+    function; each evaluation costs a binary search for its piece.
+
+    Parameters:
+        x, y (array_like): The tabulated data, in any order.
+        niter (int): Maximum number of iterations.
+        tol (float): Tolerance for the stopping criterion.
+        tolerance_type (str): "Correct Decimals" or "Significant Figures".
+        method (str): One of `TABULATED_METHODS`.
+        kind (str): "Linear" or "Cubic" interpolant.
+        a, b (float, optional): Bracket for the bracketing methods; by
+            default the first sign change of the data. A bracket [x_i, x_i]
+            at a point where y is zero gives x_i as the root.
+        x_0 (float, optional): Initial point for Newton-Raphson; by default
+            the middle of the first sign change, or the point of smallest |y|.
+
+    Raises:
+        ValueError: If the data cannot be interpolated.
+    """
+    interpolant = build_interpolant(x, y, kind)
+    brackets = sign_changes(x, y)
+
+    if method == "Newton-Raphson":
+        if x_0 is None:
+            if brackets:
+                x_0 = sum(brackets[0]) / 2
+            else:
+                x_0 = np.asarray(x, dtype=float)[np.argmin(np.abs(y))]
+        return newton(
+            x_0,
+            niter,
+            tol,
+            tolerance_type,
+            interpolant,
+            interpolant.derivative,
+            trace=trace,
+        )
+
+    if a is None or b is None:
+        if not brackets:
+            return Result(error_message="**Error:** The data do not change sign.")
+        a, b = brackets[0]
+    if a == b:
+        # A data point where y is exactly zero. False Position needs a sign
+        # change across the bracket, so the point is returned as it is.
+        return _exact_root(a, interpolant, trace)
+    match method:
+        case "Brent":
+            return brent(a, b, niter, tol, tolerance_type, interpolant, trace=trace)
+        case "Bisection":
+            return bisection(a, b, niter, tol, tolerance_type, interpolant, trace=trace)
+        case "False Position":
+            return false_position(
+                a, b, niter, tol, tolerance_type, interpolant, trace=trace
+            )
+        case _:
+            raise ValueError("Not a valid method for tabulated data.")
+
+
+def _exact_root(x_root, interpolant, trace):
+    f_x = interpolant(x_root)
+    if f_x != 0:
+        return Result(
+            error_message="**Error:** The search interval is a single point, which is not a root.",
+            n_evaluations=1,
+        )
+    table = Table(trace=trace)
+    table.add_row(x_root, f_x, 0)
+    result = Result(table=table.as_dataframe(), n_evaluations=1)
+    result.set_success_status()
+    return result
+
+
+def read_points(uploaded_file):
+    """Read (x, y) from the first two numeric columns of a CSV file."""
+    data = pd.read_csv(uploaded_file).select_dtypes("number").dropna()
+    if data.shape[1] < 2:
+        raise ValueError("The file needs two numeric columns, x and y.")
+    return data.iloc[:, 0].to_numpy(), data.iloc[:, 1].to_numpy()
+
+
+def show_tabulated_roots():
+    st.header("Roots of Tabulated Data")
+
+    source = st.radio("Data", ("Table", "CSV file"), horizontal=True)
+    if source == "CSV file":
+        uploaded_file = st.file_uploader(
+            "CSV file",
+            type="csv",
+            help="The first two numeric columns are taken as x and y.",
+        )
+        if uploaded_file is None:
+            st.info("Upload a file to continue.")
+            return
+        try:
+            x, y = read_points(uploaded_file)
+        except (ValueError, pd.errors.ParserError) as e:
+            st.error(f"**Error:** {e}")
+            return
+    else:
+        points = st.data_editor(
+            pd.DataFrame({"x": SAMPLE_X, "y": SAMPLE_Y}),
+            num_rows="dynamic",
+            use_container_width=True,
+        ).dropna()
+        x, y = points["x"].to_numpy(), points["y"].to_numpy()
+
+    col1, col2 = st.columns(2)
+    kind = col1.radio(
+        "Interpolant",
+        INTERPOLANTS,
+        index=1,
+        horizontal=True,
+        help="Linear joins the points with straight lines. Cubic is the natural cubic spline, which is smooth, so Newton-Raphson converges fast on it.",
+    )
+    method = col2.selectbox("Method", TABULATED_METHODS)
+
+    try:
+        interpolant = build_interpolant(x, y, kind)
+    except ValueError as e:
+        st.error(f"**Error:** {e}")
+        return
+    brackets = sign_changes(x, y)
+
+    a = b = x_0 = None
+    if method == "Newton-Raphson":
+        x_0 = st.number_input(
+            "Initial Point ($x_0$)",
+            format="%.4f",
+            value=float(sum(brackets[0]) / 2) if brackets else float(np.min(x)),
+            step=0.0001,
+        )
+    else:
+        a_default, b_default = brackets[0] if brackets else (np.min(x), np.max(x))
+        col3, col4 = st.columns(2)
+        a = col3.number_input(
+            "Initial point of search interval (a)",
+            format="%.4f",
+            value=float(a_default),
+            step=0.0001,
+            help="By default, the first interval between two points where the data change sign.",
+        )
+        b = col4.number_input(
+            "End point of search interval (b)",
+            format="%.4f",
+            value=float(b_default),
+            step=0.0001,
+        )
+
+    tol, niter, tolerance_type = calculate_tolerance()
+    st.markdown(f"**Calculated Tolerance:** {tol:.10f}")
+
+    result = tabulated_root(
+        x, y, niter, tol, tolerance_type, method, kind, a=a, b=b, x_0=x_0
+    )
+
+    st.divider()
+
+    st.header("Result")
+    if result.has_failed():
+        st.error(result.error_message or "**Error:** The method did not converge.")
+    else:
+        last_x, f_x = result.table.iloc[-1][["x", "f_x"]]
+        st.success(":material/check: Root found.")
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("$x$", format_value(last_x, 10))
+        col2.metric("$f(x)$", format_value(f_x, 10))
+        col3.metric("Evaluations", result.n_evaluations)
+
+    if len(brackets) > 1:
+        st.info(
+            f"The data change sign {len(brackets)} times: "
+            + ", ".join(f"[{lower:g}, {upper:g}]" for lower, upper in brackets)
+            + "."
+        )
+
+    if not result.table.empty:
+        st.subheader("Table")
+        st.table(result.table.map(format_value))
+
+    st.divider()
+
+    grid = np.linspace(interpolant.knots[0], interpolant.knots[-1], 500)
+    fig = go.Figure()
+    fig.add_trace(
+        go.Scatter(x=grid, y=interpolant(grid), mode="lines", name="Interpolant")
+    )
+    fig.add_trace(go.Scatter(x=x, y=y, mode="markers", name="Data"))
+    if not result.has_failed():
+        fig.add_trace(
+            go.Scatter(
+                x=[last_x], y=[f_x], mode="markers", name="Root", marker=dict(size=12)
+            )
+        )
+    fig.update_layout(
+        xaxis_title="x", yaxis_title="y", margin=dict(l=0, r=0, t=40, b=0)
+    )
+    st.plotly_chart(fig)
@@ -0,0 +1,182 @@
+import numpy as np
+import sympy as sp
+
+
+class HyperDual:
+    """
+    A number that carries its first and second derivatives along.
+
+    Arithmetic on HyperDual values applies the chain rule as it goes, so
+    evaluating an expression at HyperDual(x, 1, 0) yields f(x), f'(x) and
+    f''(x) in one pass over the original expression, without building the
+    symbolic derivatives. With the second component ignored this is plain
+    dual-number arithmetic. Components may be floats or NumPy arrays.
+    """
+
+    __slots__ = ("value", "first", "second")
+
+    def __init__(self, value, first=0.0, second=0.0):
+        self.value = value
+        self.first = first
+        self.second = second
+
+    def __repr__(self):
+        return f"HyperDual({self.value!r}, {self.first!r}, {self.second!r})"
+
+    def _chain(self, g, dg, d2g):
+        # Second-order chain rule for g(self), given g, g' and g'' at self.value.
+        return HyperDual(g, dg * self.first, d2g * self.first**2 + dg * self.second)
+
+    def __add__(self, other):
+        if isinstance(other, HyperDual):
+            return HyperDual(
+                self.value + other.value,
+                self.first + other.first,
+                self.second + other.second,
+            )
+        return HyperDual(self.value + other, self.first, self.second)
+
+    __radd__ = __add__
+
+    def __neg__(self):
+        return HyperDual(-self.value, -self.first, -self.second)
+
+    def __pos__(self):
+        return self
+
+    def __sub__(self, other):
+        return self + (-other)
+
+    def __rsub__(self, other):
+        return (-self) + other
+
+    def __mul__(self, other):
+        if isinstance(other, HyperDual):
+            return HyperDual(
+                self.value * other.value,
+                self.first * other.value + self.value * other.first,
+                self.second * other.value
+                + 2 * self.first * other.first
+                + self.value * other.second,
+            )
+        return HyperDual(self.value * other, self.first * other, self.second * other)
+
+    __rmul__ = __mul__
+
+    def _reciprocal(self):
+        inverse = 1 / self.value
+        return self._chain(inverse, -(inverse**2), 2 * inverse**3)
+
+    def __truediv__(self, other):
+        if isinstance(other, HyperDual):
+            return self * other._reciprocal()
+        return HyperDual(self.value / other, self.first / other, self.second / other)
+
+    def __rtruediv__(self, other):
+        return other * self._reciprocal()
+
+    def __pow__(self, other):
+        if isinstance(other, HyperDual):
+            return exp(other * log(self))
+        n = other
+        return self._chain(
+            np.power(self.value, n),
+            n * np.power(self.value, n - 1),
+            n * (n - 1) * np.power(self.value, n - 2),
+        )
+
+    def __rpow__(self, other):
+        return exp(self * np.log(other))
+
+    def __abs__(self):
+        sign = np.sign(self.value)
+        return self._chain(abs(self.value), sign, 0.0)
+
+
+def _unary(g, dg, d2g):
+    def function(u):
+        if not isinstance(u, HyperDual):
+            return g(u)
+        return u._chain(g(u.value), dg(u.value), d2g(u.value))
+
+    return function
+
+
+exp = _unary(np.exp, np.exp, np.exp)
+log = _unary(np.log, lambda u: 1 / u, lambda u: -1 / u**2)
+sqrt = _unary(np.sqrt, lambda u: 0.5 / np.sqrt(u), lambda u: -0.25 / u**1.5)
+sin = _unary(np.sin, np.cos, lambda u: -np.sin(u))
+cos = _unary(np.cos, lambda u: -np.sin(u), lambda u: -np.cos(u))
+tan = _unary(
+    np.tan, lambda u: 1 / np.cos(u) ** 2, lambda u: 2 * np.tan(u) / np.cos(u) ** 2
+)
+asin = _unary(
+    np.arcsin, lambda u: 1 / np.sqrt(1 - u**2), lambda u: u / (1 - u**2) ** 1.5
+)
+acos = _unary(
+    np.arccos, lambda u: -1 / np.sqrt(1 - u**2), lambda u: -u / (1 - u**2) ** 1.5
+)
+atan = _unary(np.arctan, lambda u: 1 / (1 + u**2), lambda u: -2 * u / (1 + u**2) ** 2)
+sinh = _unary(np.sinh, np.cosh, np.sinh)
+cosh = _unary(np.cosh, np.sinh, np.cosh)
+tanh = _unary(
+    np.tanh,
+    lambda u: 1 / np.cosh(u) ** 2,
+    lambda u: -2 * np.tanh(u) / np.cosh(u) ** 2,
+)
+
+# Names the lambdified code calls, keyed by the SymPy function they stand for.
+AD_NAMESPACE = {
+    "exp": exp,
+    "log": log,
+    "sqrt": sqrt,
+    "sin": sin,
+    "cos": cos,
+    "tan": tan,
+    "asin": asin,
+    "acos": acos,
+    "atan": atan,
+    "sinh": sinh,
+    "cosh": cosh,
+    "tanh": tanh,
+    "Abs": abs,
+}
+
+
+def ad_lambdify_derivatives(expression, symbol, orders=(0, 1, 2)):
+    """
+    Build a callable returning [f^(n)(x) for n in orders] by forward-mode AD.
+
+    Only the original expression is compiled; the derivatives come from
+    evaluating it on HyperDual numbers. Raises ValueError if the expression
+    uses a function without a HyperDual rule.
+    """
+    if not set(orders) <= {0, 1, 2}:
+        raise ValueError("Automatic differentiation supports derivative orders 0 to 2.")
+    unsupported = {
+        type(function).__name__
+        for function in expression.atoms(sp.Function)
+        if type(function).__name__ not in AD_NAMESPACE
+    }
+    if unsupported:
+        raise ValueError(
+            "Automatic differentiation does not support "
+            + ", ".join(sorted(unsupported))
+            + "."
+        )
+
+    function = sp.lambdify(symbol, expression, [AD_NAMESPACE, "numpy"])
+    orders = tuple(orders)
+
+    def derivatives(x):
+        y = function(HyperDual(x, 1.0, 0.0))
+        if not isinstance(y, HyperDual):
+            # A constant expression does not depend on x.
+            y = HyperDual(y)
+        components = (y.value, y.first, y.second)
+        if np.ndim(x):
+            # Parts that do not depend on x come out as scalars.
+            components = np.broadcast_arrays(x, *components)[1:]
+        return [components[order] for order in orders]
+
+    return derivatives
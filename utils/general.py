@@ -1,5 +1,184 @@
+import numpy as np
 import sympy as sp
 
+from utils.autodiff import ad_lambdify_derivatives
+from utils.cache import LRUCache
+from utils.polynomial import HornerEvaluator, polynomial_form
+from utils.sandbox import safe_diff, safe_sympify
 
-def nm_lambdify(f, symbol):
-    return sp.lambdify(symbol, sp.sympify(f), "numpy")
+# Process-wide caches shared by every rerun and session.
+expression_cache = LRUCache(maxsize=256)
+lambdify_cache = LRUCache(maxsize=256)
+derivative_cache = LRUCache(maxsize=256)
+
+
+def nm_sympify(f):
+    """
+    Parse `f` into a SymPy expression, reusing earlier parses of the same text.
+
+    Text is parsed in a sandboxed worker (see `utils.sandbox`), so costly or
+    malicious input cannot stall the app; it raises `SandboxError` instead.
+    """
+    if not isinstance(f, str):
+        return sp.sympify(f)
+    key = " ".join(f.split())
+    return expression_cache.get_or_compute(key, lambda: safe_sympify(key))
+
+
+def nm_lambdify(f, symbol, backend="auto"):
+    """
+    Compile `f` into a Python function of `symbol`.
+
+    `backend` is any module accepted by `sp.lambdify`, or "auto" (the
+    default), which picks one per call: plain floats go through `math`,
+    avoiding NumPy's dispatch overhead in scalar loops, while arrays go
+    through NumPy.
+    """
+    expression = nm_sympify(f)
+    key = (_canonical(expression), _canonical(symbol), backend)
+    return lambdify_cache.get_or_compute(
+        key, lambda: _compile(symbol, expression, backend)
+    )
+
+
+def _compile(symbol, expression, backend, **options):
+    if backend != "auto":
+        return sp.lambdify(symbol, expression, backend, **options)
+    vector = sp.lambdify(symbol, expression, "numpy", **options)
+    if _is_arithmetic(expression):
+        # Compiles to plain operators, which need no dispatch.
+        return vector
+    try:
+        scalar = sp.lambdify(symbol, expression, "math", **options)
+    except NotImplementedError:
+        # Some functions have no `math` counterpart.
+        return vector
+    if isinstance(symbol, sp.Symbol):
+        return _dispatch(scalar, vector)
+    return _dispatch_many(scalar, vector)
+
+
+def _is_arithmetic(expression):
+    expression = sp.Tuple(*expression) if isinstance(expression, list) else expression
+    return not expression.atoms(sp.Function) and all(
+        power.exp.is_Integer for power in expression.atoms(sp.Pow)
+    )
+
+
+# Argument types that take the `math` path; anything else goes to NumPy.
+_SCALAR_TYPES = frozenset({float, int, np.float64, np.int64})
+
+# Where `math` raises, NumPy returns inf or nan with a warning instead.
+_MATH_ERRORS = (ArithmeticError, ValueError)
+
+
+def _dispatch(scalar, vector):
+    """
+    Combine a `math` version of a function of one variable, for scalars,
+    with a NumPy one, for everything else.
+
+    Scalars the `math` version rejects (log(0), overflow, ...) are retried
+    with NumPy, so callers get the NumPy values there. This runs on every
+    evaluation, so it is kept to a bare closure.
+    """
+
+    def function(x):
+        if type(x) in _SCALAR_TYPES:
+            try:
+                return scalar(x)
+            except _MATH_ERRORS:
+                pass
+        return vector(x)
+
+    return function
+
+
+def _dispatch_many(scalar, vector):
+    # Same as `_dispatch`, for functions of several variables.
+    def function(*args):
+        for arg in args:
+            if type(arg) not in _SCALAR_TYPES:
+                return vector(*args)
+        try:
+            return scalar(*args)
+        except _MATH_ERRORS:
+            return vector(*args)
+
+    return function
+
+
+def _canonical(obj):
+    if isinstance(obj, (list, tuple)):
+        return tuple(_canonical(item) for item in obj)
+    return sp.srepr(obj)
+
+
+def nm_diff(f, symbol, order=1):
+    """Return the `order`-th derivative of `f`, reusing lower orders already computed."""
+    expression = nm_sympify(f)
+    if order == 0:
+        return expression
+    key = (_canonical(expression), _canonical(symbol), order)
+    return derivative_cache.get_or_compute(
+        key, lambda: safe_diff(nm_diff(expression, symbol, order - 1), symbol)
+    )
+
+
+# Ways to obtain derivatives: differentiate the expression symbolically, or
+# propagate them through an evaluation of f itself with dual numbers.
+DIFFERENTIATION_MODES = ("symbolic", "automatic")
+
+
+def nm_lambdify_derivatives(
+    f, symbol, orders=(0, 1, 2), backend="auto", differentiation="symbolic"
+):
+    """
+    Compile the requested derivatives of `f` into a single callable.
+
+    The returned function maps x to the list [f^(n)(x) for n in orders].
+    Subexpressions shared between the derivatives are computed once
+    (`sp.cse`), so evaluating f, f' and f'' together costs little more than
+    evaluating f'' alone. Polynomials written as a sum of monomials get a
+    Horner evaluator instead, which needs no symbolic differentiation.
+
+    With `differentiation="automatic"` only f itself is compiled and the
+    derivatives are carried along by forward-mode automatic differentiation
+    (see `utils.autodiff`). This avoids the symbolic derivatives, which can
+    grow much larger than f for deeply nested expressions.
+    """
+    if differentiation not in DIFFERENTIATION_MODES:
+        raise ValueError("Not a valid differentiation mode.")
+    expression = nm_sympify(f)
+    orders = tuple(orders)
+    key = (
+        "derivatives",
+        _canonical(expression),
+        _canonical(symbol),
+        orders,
+        backend,
+        differentiation,
+    )
+    if differentiation == "automatic":
+        return lambdify_cache.get_or_compute(
+            key, lambda: ad_lambdify_derivatives(expression, symbol, orders)
+        )
+    return lambdify_cache.get_or_compute(
+        key, lambda: _compile_derivatives(expression, symbol, orders, backend)
+    )
+
+
+def _compile_derivatives(expression, symbol, orders, backend):
+    if (
+        backend in ("numpy", "auto")
+        and isinstance(symbol, sp.Symbol)
+        and set(orders) <= {0, 1, 2}
+    ):
+        coefficients, expanded = polynomial_form(expression, symbol)
+        if expanded:
+            return HornerEvaluator(coefficients, orders)
+    return _compile(
+        symbol,
+        [nm_diff(expression, symbol, order) for order in orders],
+        backend,
+        cse=True,
+    )
@@ -1,6 +1,7 @@
 import streamlit as st
 import sympy as sp
 
+from utils.general import nm_sympify
 from utils.interface_blocks import graph
 
 
@@ -55,7 +56,7 @@ def show_graph():
 
         # Display the parsed function in LaTeX
         st.subheader("Your Function")
-        st.latex(sp.sympify(function_input))  # Render the function in LaTeX
+        st.latex(nm_sympify(function_input))  # Render the function in LaTeX
 
         # Pass the validated range to the graph function
         graph(function_input, min_value, max_value)
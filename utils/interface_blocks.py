@@ -1,10 +1,13 @@
+from collections import OrderedDict
+
 import numpy as np
 import pandas as pd
 import plotly.graph_objs as go
 import streamlit as st
 import sympy as sp
 
-from utils.general import nm_lambdify
+from utils.general import DIFFERENTIATION_MODES, nm_lambdify, nm_sympify
+from utils.sandbox import SandboxError
 
 
 def ui_input_function(placeholder_function="sin(x)"):
@@ -21,7 +24,11 @@ def ui_input_function(placeholder_function="sin(x)"):
         return None
 
     x = sp.symbols("x")
-    function_sp = sp.sympify(function_input)
+    try:
+        function_sp = nm_sympify(function_input)
+    except SandboxError as e:
+        st.error(f"**Error:** {e}")
+        st.stop()
     col2.latex(f"f({x}) = {sp.latex(function_sp)}")
     return function_input
 
@@ -71,34 +78,100 @@ def calculate_tolerance():
     return tol, niter, tolerance_type
 
 
-def graph(function_input, min_value=-10, max_value=10):
-    x = sp.symbols("x")
+def ui_differentiation(key=None):
+    labels = {"symbolic": "Symbolic", "automatic": "Automatic differentiation"}
+    return st.radio(
+        "Derivatives",
+        DIFFERENTIATION_MODES,
+        format_func=labels.get,
+        horizontal=True,
+        key=key,
+        help="Symbolic differentiates the expression with SymPy. Automatic differentiation evaluates $f$ on dual numbers, which carries the derivatives along without building them; it is faster to set up for deeply nested functions.",
+    )
+
+
+def ui_precision(key=None):
+    return st.checkbox(
+        "Arbitrary precision",
+        key=key,
+        help="Finish the iterations with mpmath at rising precision, for tolerances finer than the about 15 significant figures of floating point. The cheap floating-point iterations still run first.",
+    )
+
+
+# Solver states kept per session; the oldest ones go first.
+MAX_SOLVER_STATES = 16
+
 
-    # Create a symbolic function
-    function_sp = sp.sympify(function_input)
-    function = nm_lambdify(function_sp, x)
+def run_resumable(key, run, tol, niter):
+    """
+    Run a resumable solver, going on from the state cached under `key`.
 
+    `run(state)` must call the solver with `state=state`. The state of the
+    last run of each `key` is kept in the session, so that rerunning with
+    a tighter tolerance or more iterations only computes the new
+    iterations. `key` must cover every input that changes the iterates.
+    """
+    states = st.session_state.setdefault("solver_states", OrderedDict())
+    state = states.pop(key, None)
+    if state is not None and not state.can_resume(tol, niter):
+        state = None
+
+    result = run(state)
+    if result.state is not None:
+        states[key] = result.state
+    elif state is not None:
+        states[key] = state
+    while len(states) > MAX_SOLVER_STATES:
+        states.popitem(last=False)
+    return result
+
+
+def graph(function_input, min_value=-10, max_value=10, derivatives=None):
+    """
+    Plot `function_input` on [min_value, max_value].
+
+    `derivatives`, if given, is a callable returning f, f' and f'' on an
+    array of points, like those of `nm_lambdify_derivatives`; the three of
+    them are plotted from it instead of compiling `function_input` again.
+    """
+    x = sp.symbols("x")
     x_vals = np.linspace(min_value, max_value, 1000)
-    y_vals = function(x_vals)
 
-    # Mask large values (possible infinity)
-    with np.errstate(divide="ignore", invalid="ignore"):
-        large_values = np.abs(y_vals) > 1 / 0.0000000001
-        y_vals[large_values] = None
+    if derivatives is None:
+        # Create a symbolic function
+        function_sp = nm_sympify(function_input)
+        function = nm_lambdify(function_sp, x)
+        curves = [(function_input, function(x_vals))]
+        title = f"Graph of {function_input}"
+        key = f"plotly_chart_{function_input}"
+    else:
+        with np.errstate(all="ignore"):
+            curves = list(zip(("f(x)", "f'(x)", "f''(x)"), derivatives(x_vals)))
+        title = f"Graph of {function_input} and its derivatives"
+        key = f"plotly_chart_derivatives_{function_input}"
 
     fig = go.Figure()
-    fig.add_trace(go.Scatter(x=x_vals, y=y_vals, mode="lines", name=function_input))
+    for name, y_vals in curves:
+        # Constants come back as scalars.
+        y_vals = np.broadcast_to(np.asarray(y_vals, dtype=float), x_vals.shape).copy()
+
+        # Mask large values (possible infinity)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            large_values = np.abs(y_vals) > 1 / 0.0000000001
+            y_vals[large_values] = None
+
+        fig.add_trace(go.Scatter(x=x_vals, y=y_vals, mode="lines", name=name))
 
     fig.update_layout(
-        title=f"Graph of {function_input}",
+        title=title,
         xaxis_title=str(x),
-        yaxis_title=f"f({str(x)})",
+        yaxis_title=f"f({str(x)})" if derivatives is None else None,
         showlegend=True,
         margin=dict(l=0, r=0, t=40, b=0),
         hovermode="closest",
     )
 
-    st.plotly_chart(fig, key=f"plotly_chart_{function_input}")
+    st.plotly_chart(fig, key=key)
 
 
 def definite_matrix_interface():
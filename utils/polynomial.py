@@ -0,0 +1,98 @@
+import numpy as np
+import sympy as sp
+
+from utils.cache import LRUCache
+from utils.sandbox import SandboxError, run_sandboxed
+
+# Highest degree handled as a polynomial. `sp.Poly` stores every
+# coefficient, so x**(10**10) would need memory for ten billion of them.
+MAX_POLYNOMIAL_DEGREE = 200
+
+# Process-wide, like the caches of `utils.general`.
+polynomial_cache = LRUCache(maxsize=256)
+
+
+def polynomial_coefficients(expression, symbol):
+    """
+    Return the real coefficients of `expression` in `symbol`, highest degree first.
+
+    Returns None unless `expression` is a polynomial in `symbol` of degree
+    at most `MAX_POLYNOMIAL_DEGREE`, with numeric, real coefficients. This
+    runs SymPy in the current process; for user input use `polynomial_form`.
+    """
+    if not expression.is_polynomial(symbol):
+        return None
+    # Cheap check on the written powers first, before `sp.Poly` expands them.
+    if any(
+        power.exp.is_Integer and power.exp > MAX_POLYNOMIAL_DEGREE
+        for power in expression.atoms(sp.Pow)
+    ):
+        return None
+    try:
+        poly = sp.Poly(expression, symbol)
+    except sp.PolynomialError:
+        return None
+    if poly.degree() > MAX_POLYNOMIAL_DEGREE:
+        return None
+    coefficients = poly.all_coeffs()
+    if not all(c.is_number and c.is_real for c in coefficients):
+        return None
+    return np.array([float(c) for c in coefficients])
+
+
+def polynomial_form(expression, symbol):
+    """
+    Return (coefficients, expanded) for `expression` in `symbol`.
+
+    `coefficients` is as in `polynomial_coefficients`. `expanded` is True
+    for a polynomial already written as a sum of monomials. Evaluating
+    that term by term is no more accurate than Horner's scheme, so it can
+    be swapped for a Horner evaluator. Factored inputs like (x - 1)**20
+    are left alone, because expanding them cancels badly near the roots.
+
+    The SymPy work runs in the sandbox (see `utils.sandbox`) and its result
+    is cached. Input the sandbox stops counts as not a polynomial.
+    """
+    key = (sp.srepr(expression), sp.srepr(symbol))
+    return polynomial_cache.get_or_compute(
+        key, lambda: _sandboxed_polynomial_form(expression, symbol)
+    )
+
+
+def _sandboxed_polynomial_form(expression, symbol):
+    try:
+        return run_sandboxed(_polynomial_form, expression, symbol)
+    except SandboxError:
+        return None, False
+
+
+def _polynomial_form(expression, symbol):
+    coefficients = polynomial_coefficients(expression, symbol)
+    expanded = coefficients is not None and sp.expand(expression) == expression
+    return coefficients, expanded
+
+
+class HornerEvaluator:
+    """
+    Evaluate a polynomial and its first two derivatives in one pass.
+
+    Calling the evaluator returns the list [p^(n)(x) for n in orders],
+    matching the callables built by `nm_lambdify_derivatives`. Works on
+    scalars and NumPy arrays alike.
+    """
+
+    def __init__(self, coefficients, orders=(0, 1, 2)):
+        if not set(orders) <= {0, 1, 2}:
+            raise ValueError("Horner evaluation supports derivative orders 0 to 2.")
+        self.coefficients = [float(c) for c in coefficients]
+        self.orders = tuple(orders)
+
+    def __call__(self, x):
+        p = self.coefficients[0]
+        dp = d2p = 0.0
+        for c in self.coefficients[1:]:
+            d2p = d2p * x + 2 * dp
+            dp = dp * x + p
+            p = p * x + c
+        values = (p, dp, d2p)
+        return [values[order] for order in self.orders]
@@ -0,0 +1,275 @@
+"""
+Isolated worker processes for the expensive symbolic work done on user input.
+
+SymPy evaluates what it parses, so text like `factorial(10**9)` or
+`2**(10**10)` can keep a CPU busy or fill the memory for as long as it
+takes. Doing that in the Streamlit process would stall every session on the
+server. Parsing and differentiation therefore run in a small pool
+of worker processes, each limited in CPU time and memory, and only the
+resulting expressions come back. A worker that hits a limit is killed and
+replaced, and the caller gets a `SandboxError`.
+"""
+
+import keyword
+import multiprocessing
+import threading
+import tokenize
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from io import StringIO
+
+import sympy as sp
+from sympy.parsing.sympy_parser import (
+    convert_xor,
+    parse_expr,
+    standard_transformations,
+)
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; the workers run unlimited there.
+    resource = None
+
+SANDBOX_WORKERS = 2
+SANDBOX_CPU_SECONDS = 5  # CPU time per task.
+# Address space a worker may add on top of its start-up size.
+SANDBOX_MEMORY_BYTES = 1 << 30
+SANDBOX_TIMEOUT = 10.0  # Wall-clock seconds the caller waits for a task.
+
+# Names the parser knows; any other name becomes a symbol, or an undefined
+# function when called.
+ALLOWED_NAMES = {
+    name: getattr(sp, name)
+    for name in (
+        "sin",
+        "cos",
+        "tan",
+        "cot",
+        "sec",
+        "csc",
+        "asin",
+        "acos",
+        "atan",
+        "atan2",
+        "acot",
+        "sinh",
+        "cosh",
+        "tanh",
+        "asinh",
+        "acosh",
+        "atanh",
+        "exp",
+        "log",
+        "sqrt",
+        "cbrt",
+        "root",
+        "Abs",
+        "sign",
+        "floor",
+        "ceiling",
+        "Min",
+        "Max",
+        "factorial",
+        "gamma",
+        "erf",
+        "pi",
+        "E",
+        "I",
+        "oo",
+    )
+}
+ALLOWED_NAMES.update({"ln": sp.log, "abs": sp.Abs})
+
+# What the code generated by `parse_expr` needs, and nothing else: in
+# particular no builtins.
+_PARSER_GLOBALS = {
+    "__builtins__": {},
+    "Symbol": sp.Symbol,
+    "Integer": sp.Integer,
+    "Float": sp.Float,
+    "Rational": sp.Rational,
+    "Function": sp.Function,
+}
+
+_FORBIDDEN_OPERATORS = {".", "[", "]", "{", "}", ":", ";", "=", "@", "~"}
+
+
+class SandboxError(ValueError):
+    """Raised when user input is rejected or its processing is stopped."""
+
+
+def check_expression(text):
+    """
+    Reject text that is not a plain mathematical expression.
+
+    Only numbers, names, arithmetic operators, parentheses and commas are
+    allowed. Attribute access, indexing, keywords and names starting with
+    an underscore are refused before anything is evaluated.
+    """
+    try:
+        tokens = list(tokenize.generate_tokens(StringIO(text).readline))
+    except (tokenize.TokenError, SyntaxError, IndentationError) as e:
+        raise SandboxError(f"Invalid expression: {text}") from e
+
+    for token in tokens:
+        if token.type == tokenize.NAME and (
+            token.string.startswith("_") or keyword.iskeyword(token.string)
+        ):
+            raise SandboxError(f"Name not allowed in an expression: {token.string}")
+        if token.type == tokenize.OP and token.string in _FORBIDDEN_OPERATORS:
+            raise SandboxError(f"Operator not allowed in an expression: {token.string}")
+        if token.type == tokenize.STRING:
+            raise SandboxError("Strings are not allowed in an expression.")
+
+
+def parse_expression(text):
+    """Parse `text` with the restricted parser, in the current process."""
+    check_expression(text)
+    return parse_expr(
+        text,
+        local_dict=dict(ALLOWED_NAMES),
+        global_dict=dict(_PARSER_GLOBALS),
+        # Like `sp.sympify`, read ^ as a power.
+        transformations=standard_transformations + (convert_xor,),
+    )
+
+
+def parse_symbols(text):
+    """
+    Symbols named in `text`, separated by spaces or commas.
+
+    Unlike `sp.symbols`, only plain names are accepted, so range syntax
+    such as `x0:99999999` cannot ask for millions of symbols. Names of the
+    functions and constants the parser knows are refused as well.
+    """
+    names = text.replace(",", " ").split()
+    for name in names:
+        if (
+            not name.isidentifier()
+            or name.startswith("_")
+            or keyword.iskeyword(name)
+            or name in ALLOWED_NAMES
+        ):
+            raise SandboxError(f"Not a valid name for an unknown: {name}")
+    if len(set(names)) != len(names):
+        raise SandboxError("Each unknown needs a different name.")
+    return [sp.Symbol(name) for name in names]
+
+
+def safe_sympify(text):
+    """Parse user text into a SymPy expression in a sandboxed worker."""
+    return run_sandboxed(parse_expression, text)
+
+
+def safe_diff(expression, symbol, order=1):
+    """Differentiate `expression` in a sandboxed worker."""
+    return run_sandboxed(sp.diff, expression, symbol, order)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_FORK_CONTEXT = (
+    multiprocessing.get_context("fork")
+    if "fork" in multiprocessing.get_all_start_methods()
+    else None
+)
+
+
+def run_sandboxed(task, *args, timeout=SANDBOX_TIMEOUT):
+    """
+    Run `task(*args)` in a sandboxed worker and return its result.
+
+    `task` must be a module-level function, and its arguments and result
+    picklable. Errors raised by the task, and tasks stopped for using too
+    much time or memory, surface as `SandboxError`. Outside the UI process
+    (in a worker pool of its own) the task runs directly: it is already
+    isolated there, and nesting pools would only add start-up cost.
+    """
+    if multiprocessing.parent_process() is not None:
+        return task(*args)
+
+    executor = _get_executor()
+    future = executor.submit(_run_limited, task, args)
+    try:
+        ok, value = future.result(timeout=timeout)
+    except TimeoutError:
+        _discard_executor(executor)
+        raise SandboxError(f"Stopped after {timeout:g} s; the input is too costly.")
+    except BrokenProcessPool:
+        _discard_executor(executor)
+        raise SandboxError("Stopped for using too much CPU time or memory.")
+    if not ok:
+        raise SandboxError(value)
+    return value
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Workers are forked where the platform allows it. A forked
+            # worker starts at once with SymPy already imported, whereas
+            # "spawn" and "forkserver" start a fresh interpreter that must
+            # import it again (over half a second), for every worker and for
+            # every replacement of a killed one. Forking from Streamlit's
+            # threaded server is safe here: the child gets only the thread
+            # that forked, CPython holds the import lock across the fork, and
+            # a worker only runs `_run_limited` on the SymPy objects it is
+            # sent, never touching the server's threads, event loop or locks.
+            # Without fork (Windows) the platform default, spawn, is used.
+            _executor = ProcessPoolExecutor(
+                max_workers=SANDBOX_WORKERS,
+                mp_context=_FORK_CONTEXT,
+                initializer=_limit_memory,
+                initargs=(SANDBOX_MEMORY_BYTES,),
+            )
+        return _executor
+
+
+def _discard_executor(executor):
+    # A worker may be stuck in C code that never checks for interruptions,
+    # so the processes are killed rather than asked to stop.
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    for process in list((executor._processes or {}).values()):
+        process.kill()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _limit_memory(limit):
+    if resource is None:
+        return
+    try:
+        with open("/proc/self/statm") as statm:
+            baseline = int(statm.read().split()[0]) * resource.getpagesize()
+    except OSError:
+        baseline = 0
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    soft = baseline + limit
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+
+
+def _run_limited(task, args):
+    # Runs in the worker. The CPU limit counts from the time used so far, so
+    # each task gets the same allowance; going over it kills the worker.
+    if resource is not None:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        used = int(usage.ru_utime + usage.ru_stime) + 1
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        soft = used + SANDBOX_CPU_SECONDS
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    try:
+        return True, task(*args)
+    except SandboxError as e:
+        return False, str(e)
+    except MemoryError:
+        return False, "Stopped for using too much memory."
+    except Exception as e:
+        # Exceptions are sent back as text: not all of them can be pickled.
+        return False, f"Invalid expression: {e}"